@@ -4,11 +4,24 @@ from stressmon.cpufreq import CPUFreq
 from stressmon.cpuinfo import CPUInfo
 from stressmon.cputemp import CPUTemp
 from stressmon.drivetemp import DriveTemp
+from stressmon.diskio import DiskIO
+from stressmon.smarthealth import SMARTHealth
 from stressmon.sysfan import SysFan
+from stressmon.hwmon import HWMon
 from stressmon.gpudata import GPUData
+from stressmon.gpubackend import GPUBackend, FakeGPUBackend
+from stressmon.intelgputop import IntelGPUTop
+from stressmon.gpubench import GPUBench
 from stressmon.updatepool import UpdatePool
 from stressmon.hwsensors import HWSensorBase
 from stressmon.stressmon import StressMon
+from stressmon.stressng import StressNG
 from stressmon.cpuwatts import CPUWatts
 from stressmon.cpuusage import CPUUsage
+from stressmon.cputhrottle import CPUThrottle
+from stressmon.cpuresidency import CPUResidency
+from stressmon.schedstat import SchedStat
 from stressmon.memusage import MemUsage
+from stressmon.edac import EDAC
+from stressmon.netio import NetIO
+from stressmon.pressure import Pressure
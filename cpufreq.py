@@ -12,7 +12,6 @@ class CPUFreq(HWSensorBase):
     headings = ['Core', 'Current(MHz)', 'Min(MHz)', 'Max(MHz)', 'Mean(MHz)']
 
     def __init__(self) -> None:
-        self.iteration = 1
         self.cpuinfo = CPUInfo()
         self.p_cores = None
         if self.cpuinfo.has_intel_pe_cores():
@@ -40,10 +39,6 @@ class CPUFreq(HWSensorBase):
             self.labels.insert(1, 'E Cores')
             self.labels.insert(1, 'P Cores')
         self.mhz = dict.fromkeys(self.labels, 0)
-        self.mmm = dict.fromkeys(['min', 'max', 'mean'])
-        self.mmm['min'] = dict.fromkeys(self.labels, 9999)
-        self.mmm['max'] = dict.fromkeys(self.labels, 0)
-        self.mmm['mean'] = dict.fromkeys(self.labels, 0)
         self._iter = None
 
     def __iter__(self):
@@ -66,17 +61,6 @@ class CPUFreq(HWSensorBase):
             e_core_freq = [sum(per_cpu_freqs[self.p_cores:]) / (self.corecount - self.p_cores)]
         mhz = main_cpu_freq + p_core_freq + e_core_freq + per_cpu_freqs
         self.mhz = dict(zip(self.labels, mhz))
-        lmin = [min(cur_min, ele)
-                for cur_min, ele in zip(self.mmm['min'].values(), mhz)]
-        lmax = [max(cur_max, ele)
-                for cur_max, ele in zip(self.mmm['max'].values(), mhz)]
-        mean_values = zip(self.mmm['mean'].values(), mhz)
-        mean = [cur_mean + (ele - cur_mean) /
-                self.iteration for cur_mean, ele in mean_values]
-        self.mmm['min'] = dict(zip(self.labels, lmin))
-        self.mmm['max'] = dict(zip(self.labels, lmax))
-        self.mmm['mean'] = dict(zip(self.labels, mean))
-        self.iteration += 1
 
     def get_section(self, _) -> str:
         """Get section"""
@@ -102,23 +86,11 @@ class CPUFreq(HWSensorBase):
             return None
         return round(self.mhz[params[0]])
 
-    def get_min(self, params: list) -> int | None:
-        """Get minimum cpu clock speed for index."""
+    def get_raw(self, params: list) -> float | None:
+        """Get current clock speed unrounded, for the shadow Stats"""
         if len(params) != 1:
             return None
-        return round(self.mmm['min'][params[0]])
-
-    def get_max(self, params: list) -> int | None:
-        """Get maximum cpu clock speed for index."""
-        if len(params) != 1:
-            return None
-        return round(self.mmm['max'][params[0]])
-
-    def get_mean(self, params: list) -> int | None:
-        """Get mean cpu clock speed for index rounded to nearest integer."""
-        if len(params) != 1:
-            return None
-        return round(self.mmm['mean'][params[0]])
+        return self.mhz[params[0]]
 
     def get_csv_data(self) -> list:
         """Return list of current clock speed
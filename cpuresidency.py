@@ -0,0 +1,195 @@
+"""CPU idle state and frequency residency
+"""
+
+from glob import glob
+from os.path import basename, join
+from time import monotonic_ns
+from stressmon.cpuinfo import CPUInfo
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.sysfs import open_sysfs, read_sysfs
+
+
+class CPUResidency(HWSensorBase):
+    """Fraction of time each CPU spends in each C-state and its average frequency
+
+    C-state residency comes from the cumulative cpuidle state*/time counters and the
+    average frequency from the cpufreq/stats/time_in_state histogram, so unlike
+    sampling scaling_cur_freq nothing between two samples is missed. Per tick
+    deltas are kept in a 2-D rows x columns list with a CPU row, P/E core rows on
+    hybrid CPUs and one row per logical CPU. A CPU whose counters can't be read has
+    no residency for that tick.
+    """
+
+    headings = ['Residency', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, cpu_root: str = '/sys/devices/system/cpu') -> None:
+        self._iter = None
+        self.cpuinfo = CPUInfo()
+        cpus = sorted(int(basename(cpu)[3:]) for cpu in glob(join(cpu_root, 'cpu[0-9]*')))
+        self.states = []
+        self.idle_files = []
+        self.freq_files = []
+        for cpu in cpus:
+            idle_files = {}
+            for state in sorted(glob(join(cpu_root, f"cpu{cpu}", 'cpuidle', 'state[0-9]*')),
+                                key=lambda path: int(basename(path)[5:])):
+                name = read_sysfs(join(state, 'name'))
+                time_file = open_sysfs(join(state, 'time'))
+                if name is None or time_file is None:
+                    continue
+                if name not in self.states:
+                    self.states.append(name)
+                idle_files[name] = time_file
+            self.idle_files.append(idle_files)
+            self.freq_files.append(
+                open_sysfs(join(cpu_root, f"cpu{cpu}", 'cpufreq', 'stats', 'time_in_state')))
+        self.columns = [f"{state}(%)" for state in self.states]
+        if any(self.freq_files):
+            self.columns.append('Avg(MHz)')
+        self.cpus = cpus
+        self.rows = ['CPU']
+        # member cpu positions of each aggregate row
+        self.groups = [list(range(len(cpus)))]
+        p_cores = None
+        if self.cpuinfo.has_intel_pe_cores():
+            p_cores = self.cpuinfo.get_p_cores()
+            self.rows += ['P Cores', 'E Cores']
+            self.groups.append([i for i, cpu in enumerate(cpus) if cpu < p_cores])
+            self.groups.append([i for i, cpu in enumerate(cpus) if cpu >= p_cores])
+        for cpu in cpus:
+            pe_str = ""
+            if p_cores is not None:
+                pe_str = "P " if cpu < p_cores else "E "
+            self.rows.append(f"{pe_str}Core {cpu}")
+        if not self.columns:
+            self.rows = []
+        self.labels = [[row, column] for row in self.rows for column in self.columns]
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.residency = [[None] * len(self.columns) for _ in self.rows]
+        self.pstates = [{} for _ in cpus]
+        self.stats = Stats(len(self.labels))
+        self.time = monotonic_ns()
+        self.idle_times = [self._read_idle(cpu) for cpu in range(len(cpus))]
+        self.freq_times = [self._read_freq(cpu) for cpu in range(len(cpus))]
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def _read_idle(self, cpu: int) -> dict | None:
+        try:
+            return {name: time_file.read_int()
+                    for name, time_file in self.idle_files[cpu].items()}
+        except (OSError, ValueError):
+            return None
+
+    def _read_freq(self, cpu: int) -> dict | None:
+        if self.freq_files[cpu] is None:
+            return {}
+        times = {}
+        try:
+            for line in self.freq_files[cpu].read().splitlines():
+                freq, time_10ms = line.split()
+                times[int(freq)] = int(time_10ms)
+        except (OSError, ValueError):
+            return None
+        return times
+
+    def update(self) -> None:
+        """Update residency
+        """
+        start_time = self.time
+        self.time = monotonic_ns()
+        wall_us = (self.time - start_time) / 1000
+        if wall_us <= 0 or not self.labels:
+            return
+        first = len(self.groups)
+        freq_column = len(self.states)
+        for cpu in range(len(self.cpus)):
+            row = self.residency[first + cpu]
+            idle_times = self._read_idle(cpu)
+            previous = self.idle_times[cpu]
+            for column, state in enumerate(self.states):
+                if idle_times is None or previous is None:
+                    row[column] = None
+                elif state in idle_times:
+                    delta = idle_times[state] - previous[state]
+                    row[column] = min(delta / wall_us * 100, 100.0)
+            self.idle_times[cpu] = idle_times
+            if self.freq_files[cpu] is None:
+                continue
+            freq_times = self._read_freq(cpu)
+            previous = self.freq_times[cpu]
+            self.freq_times[cpu] = freq_times
+            if freq_times is None or previous is None:
+                row[freq_column] = None
+                continue
+            deltas = {freq: time - previous.get(freq, 0) for freq, time in freq_times.items()}
+            total = sum(deltas.values())
+            if total > 0:
+                self.pstates[cpu] = {freq // 1000: delta / total * 100
+                                     for freq, delta in deltas.items() if delta}
+                row[freq_column] = sum(freq * delta for freq, delta in deltas.items()) \
+                    / total / 1000
+        for group, members in enumerate(self.groups):
+            for column in range(len(self.columns)):
+                values = [self.residency[first + cpu][column] for cpu in members]
+                values = [value for value in values if value is not None]
+                self.residency[group][column] = sum(values) / len(values) if values else None
+        self.stats.update([value for row in self.residency for value in row])
+
+    def get_pstate_residency(self, cpu: int) -> dict:
+        """Get the share of the last tick cpu spent at each frequency
+
+        Args:
+            cpu (int): logical cpu number
+
+        Returns:
+            dict: percentage of time keyed by frequency in MHz
+        """
+        if cpu not in self.cpus:
+            return {}
+        return dict(self.pstates[self.cpus.index(cpu)])
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) != 2:
+            return None
+        return params[1]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 2:
+            return None
+        return f"{params[0]} Residency"
+
+    def get_subsection(self, _) -> str | None:
+        """Get subsection"""
+        return None
+
+    def get_current(self, params: list) -> int | None:
+        """Get current residency for index
+        """
+        index = self.index.get(tuple(params))
+        if index is None:
+            return None
+        ret = self.residency[index // len(self.columns)][index % len(self.columns)]
+        if ret is None:
+            return ret
+        return round(ret)
+
+    def get_csv_data(self) -> list:
+        """Return list of current residency
+        """
+        return [None if value is None else round(value, 4)
+                for row in self.residency for value in row]
+
+    def is_empty(self) -> bool:
+        """Is residency data available?
+        """
+        return not self.labels
@@ -1,6 +1,5 @@
 """Logging CPU Core temperatures"""
 
-from copy import deepcopy
 from re import findall
 from psutil import sensors_temperatures
 from stressmon.hwsensors import HWSensorBase
@@ -22,7 +21,6 @@ class CPUTemp(HWSensorBase):
     headings = ['Core', 'Current(C)', 'Min(C)', 'Max(C)', 'Mean(C)']
 
     def __init__(self) -> None:
-        self.iteration = 1
         self.sensor = None
         self.temps = {}
         sensors_temps = sensors_temperatures()
@@ -46,13 +44,6 @@ class CPUTemp(HWSensorBase):
                 for cpu_sensor, sensor_temps in self.temps.items():
                     sorted_keys = sorted(sensor_temps.keys(), key=extract_number)
                     self.temps[cpu_sensor] = {k: sensor_temps[k] for k in sorted_keys}
-                self.mmm = dict.fromkeys(['min', 'max', 'mean'])
-                self.mmm['min'] = deepcopy(self.temps)
-                self.mmm['max'] = deepcopy(self.temps)
-                self.mmm['mean'] = deepcopy(self.temps)
-                for cpu in self.mmm['min']:
-                    for temp in self.mmm['min'][cpu]:
-                        self.mmm['min'][cpu][temp] = 9999
         self.cpu_iter = None
         self.current_cpu = None
         self.core_iter = None
@@ -98,16 +89,6 @@ class CPUTemp(HWSensorBase):
                     cpu_core = cpu_sensor
                 cpu_num += 1
             self.temps[cpu_sensor][cpu_core] = temp_sensor[1]
-        for cpu in self.mmm['min']:
-            for temp in self.mmm['min'][cpu]:
-                self.mmm['min'][cpu][temp] = min(
-                    self.mmm['min'][cpu][temp], self.temps[cpu][temp])
-                self.mmm['max'][cpu][temp] = max(
-                    self.mmm['max'][cpu][temp], self.temps[cpu][temp])
-                self.mmm['mean'][cpu][temp] = self.mmm['mean'][cpu][temp] + \
-                    (self.temps[cpu][temp] - self.mmm['mean']
-                     [cpu][temp]) / self.iteration
-        self.iteration += 1
 
     def get_label(self, params: list) -> str | None:
         """Get label for current core"""
@@ -130,26 +111,12 @@ class CPUTemp(HWSensorBase):
             return None
         return round(self.temps[params[0]][params[1]])
 
-    def get_min(self, params: list) -> int | None:
-        """get minimum cpu temperature for index
+    def get_raw(self, params: list) -> float | None:
+        """Get current temperature unrounded, for the shadow Stats
         """
         if len(params) != 2:
             return None
-        return round(self.mmm['min'][params[0]][params[1]])
-
-    def get_max(self, params: list) -> int | None:
-        """get maximum cpu temperature for index
-        """
-        if len(params) != 2:
-            return None
-        return round(self.mmm['max'][params[0]][params[1]])
-
-    def get_mean(self, params: list) -> int | None:
-        """get mean cpu temperature for index rounded to nearest integer
-        """
-        if len(params) != 2:
-            return None
-        return round(self.mmm['mean'][params[0]][params[1]])
+        return self.temps[params[0]][params[1]]
 
     def get_csv_data(self) -> list:
         """Return list of current cpu temps
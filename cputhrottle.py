@@ -0,0 +1,142 @@
+"""CPU thermal and power limit throttle events
+"""
+
+from glob import glob
+from os.path import basename, join
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.sysfs import open_sysfs, read_sysfs
+
+# thermal_throttle counters, the power limit ones only exist on older kernels
+THROTTLE_COUNTERS = [('Thermal Throttles', 'throttle_count'),
+                     ('Thermal Throttle(ms)', 'throttle_total_time_ms'),
+                     ('Power Limits', 'power_limit_count')]
+
+
+class CPUThrottle(HWSensorBase):
+    """Per-core and per-package throttle event and time deltas
+
+    Counters are read from each CPU's thermal_throttle directory through cached file
+    descriptors. SMT siblings share their core counters, so every core and package
+    is only read once, through its first logical CPU. Each package also reports the
+    sum of its cores' deltas as All Cores.
+    """
+
+    headings = ['Throttle', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, cpu_root: str = '/sys/devices/system/cpu') -> None:
+        self._iter = None
+        cores = {}
+        packages = {}
+        cpus = sorted(glob(join(cpu_root, 'cpu[0-9]*')),
+                      key=lambda path: int(basename(path)[3:]))
+        for cpu in cpus:
+            throttle = join(cpu, 'thermal_throttle')
+            package = read_sysfs(join(cpu, 'topology', 'physical_package_id'))
+            core = read_sysfs(join(cpu, 'topology', 'core_id'))
+            if package is None or core is None:
+                continue
+            if package not in packages:
+                packages[package] = (f"Package {package}", throttle)
+            if (package, core) not in cores:
+                cores[(package, core)] = (f"Core {basename(cpu)[3:]}", throttle)
+        self.labels = []
+        self.files = []
+        # (core total slot, slots of the core counters it sums)
+        self.totals = []
+        for package, (package_name, package_throttle) in packages.items():
+            self._add_row(package_name, 'Package', package_throttle, 'package_')
+            core_rows = [self._add_row(package_name, name, throttle, 'core_')
+                         for (core_package, _), (name, throttle) in cores.items()
+                         if core_package == package]
+            for data, _ in THROTTLE_COUNTERS:
+                core_slots = [row[data] for row in core_rows if data in row]
+                if core_slots:
+                    self.totals.append((len(self.labels), core_slots))
+                    self.files.append(None)
+                    self.labels.append([package_name, 'All Cores', data])
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.counts = [None] * len(self.labels)
+        self.values = [None] * len(self.labels)
+        self.stats = Stats(len(self.labels))
+        self.read_counters()
+
+    def _add_row(self, package: str, unit: str, throttle: str, prefix: str) -> dict:
+        slots = {}
+        for data, counter in THROTTLE_COUNTERS:
+            counter_file = open_sysfs(join(throttle, prefix + counter))
+            if counter_file is None:
+                continue
+            slots[data] = len(self.labels)
+            self.files.append(counter_file)
+            self.labels.append([package, unit, data])
+        return slots
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def read_counters(self) -> list:
+        """Read every throttle counter
+
+        Returns:
+            list: previous counters, None for the core total slots and for counters
+                that can't be read, e.g. of a CPU that was taken offline
+        """
+        previous = self.counts
+        counts = []
+        for counter_file in self.files:
+            try:
+                counts.append(None if counter_file is None else counter_file.read_int())
+            except (OSError, ValueError):
+                counts.append(None)
+        self.counts = counts
+        return previous
+
+    def update(self) -> None:
+        """Update throttle deltas
+        """
+        previous = self.read_counters()
+        values = self.values
+        for slot, count in enumerate(self.counts):
+            if count is None or previous[slot] is None:
+                values[slot] = None
+            else:
+                values[slot] = count - previous[slot]
+        for slot, core_slots in self.totals:
+            deltas = [values[core_slot] for core_slot in core_slots
+                      if values[core_slot] is not None]
+            values[slot] = sum(deltas) if deltas else None
+        self.stats.update(values)
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) != 3:
+            return None
+        return params[2]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 3:
+            return None
+        return f"{params[0]} Throttling"
+
+    def get_subsection(self, params: list) -> str | None:
+        """Get subsection"""
+        if len(params) != 3:
+            return None
+        return params[1]
+
+    def get_csv_data(self) -> list:
+        """Return list of current throttle deltas
+        """
+        return list(self.values)
+
+    def is_empty(self) -> bool:
+        """Does the CPU report throttling?
+        """
+        return not self.labels
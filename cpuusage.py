@@ -12,7 +12,6 @@ class CPUUsage(HWSensorBase):
     headings = ['Core', 'Current(%)', 'Min(%)', 'Max(%)', 'Mean(%)']
 
     def __init__(self) -> None:
-        self.iteration = 1
         self.cpuinfo = CPUInfo()
         self.cpucount = cpu_count(logical=True) + 1
         self.corecount = cpu_count(logical=True)
@@ -36,10 +35,6 @@ class CPUUsage(HWSensorBase):
             self.labels.insert(1, 'E Cores')
             self.labels.insert(1, 'P Cores')
         self.usage = dict.fromkeys(self.labels, 0)
-        self.mmm = dict.fromkeys(['min', 'max', 'mean'])
-        self.mmm['min'] = dict.fromkeys(self.labels, 9999)
-        self.mmm['max'] = dict.fromkeys(self.labels, 0)
-        self.mmm['mean'] = dict.fromkeys(self.labels, 0)
         self._iter = None
 
     def __iter__(self):
@@ -61,17 +56,6 @@ class CPUUsage(HWSensorBase):
             e_core_usage = [sum(per_cpu_usage[self.p_cores:]) / (self.corecount - self.p_cores)]
         usage = main_cpu_usage + p_core_usage + e_core_usage + per_cpu_usage
         self.usage = dict(zip(self.labels, usage))
-        lmin = [min(cur_min, ele)
-                for cur_min, ele in zip(self.mmm['min'].values(), usage)]
-        lmax = [max(cur_max, ele)
-                for cur_max, ele in zip(self.mmm['max'].values(), usage)]
-        mean_values = zip(self.mmm['mean'].values(), usage)
-        mean = [cur_mean + (ele - cur_mean) /
-                self.iteration for cur_mean, ele in mean_values]
-        self.mmm['min'] = dict(zip(self.labels, lmin))
-        self.mmm['max'] = dict(zip(self.labels, lmax))
-        self.mmm['mean'] = dict(zip(self.labels, mean))
-        self.iteration += 1
 
     def get_section(self, _) -> str:
         """Get section"""
@@ -97,23 +81,11 @@ class CPUUsage(HWSensorBase):
             return None
         return round(self.usage[params[0]])
 
-    def get_min(self, params: list) -> int | None:
-        """Get minimum cpu usage for index."""
+    def get_raw(self, params: list) -> float | None:
+        """Get current usage unrounded, for the shadow Stats"""
         if len(params) != 1:
             return None
-        return round(self.mmm['min'][params[0]])
-
-    def get_max(self, params: list) -> int | None:
-        """Get maximum cpu usage for index."""
-        if len(params) != 1:
-            return None
-        return round(self.mmm['max'][params[0]])
-
-    def get_mean(self, params: list) -> int | None:
-        """Get mean cpu usage for index rounded to nearest integer."""
-        if len(params) != 1:
-            return None
-        return round(self.mmm['mean'][params[0]])
+        return self.usage[params[0]]
 
     def get_csv_data(self) -> list:
         """Return list of current usage
@@ -17,8 +17,6 @@ class CPUWatts(HWSensorBase):
         self.watts = {}
         self.file_time = {}
         self.cpu_joules = {}
-        self.mmm = {'min': {}, 'max': {}, 'mean': {}}
-        self.iteration = 1
         self.labels = []
         self._iter = None
         if not exists('/sys/class/powercap/intel-rapl:0/energy_uj'):
@@ -35,9 +33,6 @@ class CPUWatts(HWSensorBase):
                 self.file_time[index] = time_ns()
             self.cpu_joules[index] = int(self.cpu_joules[index])
             self.watts[index] = 0
-            self.mmm['min'][index] = 9999
-            self.mmm['max'][index] = 0
-            self.mmm['mean'][index] = 0
 
     def __iter__(self):
         """Make class an iterator."""
@@ -50,6 +45,7 @@ class CPUWatts(HWSensorBase):
     def update(self):
         """Calculate CPU Watts
         """
+        stats = self.get_stats()
         for i in range(self.cpu_count):
             index = f"CPU{i}"
             start_joule = self.cpu_joules[index]
@@ -62,15 +58,9 @@ class CPUWatts(HWSensorBase):
             joule_diff = self.cpu_joules[index] - start_joule
             duration = self.file_time[index] - start_time
             watts = joule_diff / (duration / 1000)
-            if watts > 0 and (watts < (self.mmm['mean'][index] * 2.5) or self.mmm['mean'][index] == 0):
+            mean = stats.get_mean(self.stat_index([index])) or 0
+            if watts > 0 and (watts < mean * 2.5 or mean == 0):
                 self.watts[index] = watts
-            self.mmm['min'][index] = min(
-                self.mmm['min'][index], self.watts[index])
-            self.mmm['max'][index] = max(
-                self.mmm['max'][index], self.watts[index])
-            self.mmm['mean'][index] = self.mmm['mean'][index] + \
-                (self.watts[index] - self.mmm['mean'][index]) / self.iteration
-        self.iteration += 1
 
     def get_label(self, params: list) -> str | None:
         """Get label for current core"""
@@ -93,26 +83,12 @@ class CPUWatts(HWSensorBase):
             return None
         return round(self.watts[params[0]])
 
-    def get_min(self, params: list) -> int | None:
-        """Get minimum value for sensor data
+    def get_raw(self, params: list) -> float | None:
+        """Get current power unrounded, for the shadow Stats
         """
         if len(params) != 1:
             return None
-        return round(self.mmm['min'][params[0]])
-
-    def get_max(self, params: list) -> int | None:
-        """Get maximum value for sensor data
-        """
-        if len(params) != 1:
-            return None
-        return round(self.mmm['max'][params[0]])
-
-    def get_mean(self, params: list) -> int | None:
-        """Get average value for sensor data
-        """
-        if len(params) != 1:
-            return None
-        return round(self.mmm['mean'][params[0]])
+        return self.watts[params[0]]
 
     def get_csv_headings(self) -> list:
         """Return headings for csv file for sensor
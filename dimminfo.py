@@ -0,0 +1,104 @@
+"""DIMM info class
+"""
+
+from glob import glob
+from os.path import join
+from struct import unpack_from
+
+# part numbers reported for empty or unidentified slots
+UNKNOWN_PART_NUMBERS = ['', 'Not Specified', 'Unknown', 'NO DIMM']
+
+
+def parse_memory_device(raw: bytes) -> dict | None:
+    """Parse an SMBIOS type 17 (Memory Device) structure
+
+    Args:
+        raw (bytes): raw structure including its string set
+
+    Returns:
+        dict | None: DIMM info or None if the slot is empty
+    """
+    length = raw[1]
+    strings = raw[length:].split(b'\0')
+
+    def string(offset: int) -> str:
+        if offset >= length or raw[offset] == 0 or raw[offset] > len(strings):
+            return ''
+        return strings[raw[offset] - 1].decode('utf-8', 'replace').strip()
+
+    def word(offset: int) -> int | None:
+        if offset + 2 > length:
+            return None
+        return unpack_from('<H', raw, offset)[0]
+
+    def dword(offset: int) -> int | None:
+        if offset + 4 > length:
+            return None
+        return unpack_from('<I', raw, offset)[0]
+
+    size = word(0x0C)
+    if not size:
+        return None
+    if size == 0xFFFF:
+        size = None
+    elif size == 0x7FFF and dword(0x1C) is not None:
+        size = dword(0x1C) & 0x7FFFFFFF
+    elif size & 0x8000:
+        size = (size & 0x7FFF) // 1024
+    speed = word(0x15)
+    if speed == 0xFFFF:
+        speed = dword(0x54)
+    if speed == 0:
+        speed = None
+    rank = raw[0x1B] & 0x0F if length > 0x1B else 0
+    return {'Locator': string(0x10),
+            'Bank': string(0x11),
+            'Size': size,
+            'Speed': speed,
+            'Manufacturer': string(0x17),
+            'Serial': string(0x18),
+            'Part Number': string(0x1A),
+            'Rank': rank or None}
+
+
+class DIMMInfo:
+    """Class to store DIMM Info
+
+    The inventory is read in-process from the SMBIOS type 17 entries in sysfs the
+    first time it is needed and cached afterwards.
+    """
+
+    def __init__(self, entries: str = '/sys/firmware/dmi/entries') -> None:
+        self.entries = entries
+        self.dimms = None
+
+    def get_dimms(self) -> list:
+        """get installed DIMMs
+
+        Returns:
+            list: DIMM info dicts with Locator, Bank, Size (MB), Speed (MT/s),
+                Manufacturer, Serial, Part Number and Rank
+        """
+        if self.dimms is None:
+            dimms = []
+            paths = sorted(glob(join(self.entries, '17-*', 'raw')),
+                           key=lambda path: int(path.split('17-')[-1].split('/')[0]))
+            for path in paths:
+                try:
+                    with open(path, 'rb') as raw_file:
+                        dimm = parse_memory_device(raw_file.read())
+                except (OSError, IndexError):
+                    continue
+                if dimm is not None:
+                    dimms.append(dimm)
+            self.dimms = dimms
+        return self.dimms
+
+    def get_part_numbers(self) -> list:
+        """get part numbers of installed DIMMs
+
+        Returns:
+            list: part numbers, skipping unknown ones
+        """
+        return [dimm['Part Number'] for dimm in self.get_dimms()
+                if dimm['Part Number'] not in UNKNOWN_PART_NUMBERS]
@@ -0,0 +1,134 @@
+"""Disk I/O throughput and latency sensor
+"""
+
+from os import listdir
+from time import monotonic_ns
+from stressmon.drivetemp import DriveTemp, drive_key
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.sysfs import SysfsFile
+
+DISKIO_DATA = ['IOPS', 'Read(MB/s)', 'Write(MB/s)', 'Await(ms)', 'Queue Depth', 'Util(%)']
+IGNORED_DEVICES = ('loop', 'ram', 'zram', 'sr', 'fd')
+
+
+class DiskIO(HWSensorBase):
+    """Per-drive IOPS, throughput, latency, queue depth and utilization
+
+    /proc/diskstats is read once per tick and the counters of every tracked device
+    are turned into per-second rates from their deltas. Drives are labelled with
+    DriveTemp's drive names (e.g. nvme0 for nvme0n1) so throughput and temperature
+    columns can be correlated. A controller with several namespaces is labelled by
+    block device (e.g. nvme0n1 and nvme0n2) so every namespace keeps its own slots.
+    """
+
+    headings = ['Data', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, drivetemp: DriveTemp | None = None,
+                 diskstats: str = '/proc/diskstats', block_root: str = '/sys/block') -> None:
+        """
+        Args:
+            drivetemp (DriveTemp | None, optional): only track the drives of this
+                sensor. Defaults to every block device except loop, ram and optical.
+            diskstats (str, optional): diskstats file. Defaults to '/proc/diskstats'.
+            block_root (str, optional): block class directory. Defaults to '/sys/block'.
+        """
+        self._iter = None
+        block_devices = sorted(name for name in listdir(block_root)
+                               if not name.startswith(IGNORED_DEVICES))
+        keys = [drive_key(name) for name in block_devices]
+        drive_names = None
+        if drivetemp is not None:
+            drive_names = {drive_key(name): name for name in drivetemp.get_drive_names()}
+        self.drives = []
+        self.slots = {}
+        for name, key in zip(block_devices, keys):
+            if drive_names is not None and key not in drive_names:
+                continue
+            self.slots[name.encode()] = len(self.drives)
+            if keys.count(key) == 1:
+                name = drive_names[key] if drive_names is not None else key
+            self.drives.append(name)
+        self.labels = [[drive, data] for drive in self.drives for data in DISKIO_DATA]
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.diskstats = SysfsFile(diskstats)
+        self.counters = [None] * len(self.drives)
+        self.time = monotonic_ns()
+        self.values = [None] * len(self.labels)
+        self.stats = Stats(len(self.labels))
+        self.read_counters()
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def read_counters(self) -> list:
+        """Read /proc/diskstats
+
+        Returns:
+            list: previous counters of every tracked drive
+        """
+        previous = self.counters
+        self.counters = [None] * len(self.drives)
+        self.time = monotonic_ns()
+        slots = self.slots
+        for line in self.diskstats.read().splitlines():
+            fields = line.split(None, 14)
+            slot = slots.get(fields[2])
+            if slot is not None:
+                self.counters[slot] = [int(field) for field in fields[3:14]]
+        return previous
+
+    def update(self) -> None:
+        """Update disk I/O rates
+        """
+        start_time = self.time
+        previous = self.read_counters()
+        seconds = (self.time - start_time) / 1000000000
+        values = self.values
+        for slot, counters in enumerate(self.counters):
+            start = previous[slot]
+            base = slot * len(DISKIO_DATA)
+            if counters is None or start is None or seconds <= 0:
+                values[base:base + len(DISKIO_DATA)] = [None] * len(DISKIO_DATA)
+                continue
+            (reads, _, read_sectors, read_ms, writes, _, write_sectors, write_ms,
+             _, io_ms, weighted_ms) = [end - begin for end, begin in zip(counters, start)]
+            ios = reads + writes
+            values[base] = ios / seconds
+            values[base + 1] = read_sectors * 512 / 1000000 / seconds
+            values[base + 2] = write_sectors * 512 / 1000000 / seconds
+            values[base + 3] = (read_ms + write_ms) / ios if ios else 0.0
+            values[base + 4] = weighted_ms / 1000 / seconds
+            values[base + 5] = min(io_ms / 10 / seconds, 100.0)
+        self.stats.update(values)
+
+    def get_drive_names(self) -> list:
+        """get list of drive names
+        """
+        return list(self.drives)
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) != 2:
+            return None
+        return params[1]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 2:
+            return None
+        return f"{params[0]} I/O"
+
+    def get_subsection(self, _) -> str | None:
+        """Get subsection"""
+        return None
+
+    def is_empty(self) -> bool:
+        """Are there drives?
+        """
+        return not self.drives
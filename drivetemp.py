@@ -1,38 +1,195 @@
 """Drive temp sensor monitor class
 """
 
-from copy import deepcopy
-from pySMART import DeviceList
+from glob import glob
+from logging import getLogger
+from os.path import basename, exists, join, realpath
+from re import match, sub
+from threading import Lock
+from pySMART import Device
 from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.sysfs import open_sysfs, read_sysfs
+from stressmon.updatepool import PeriodicUpdater
+
+logger = getLogger(__name__)
+
+# block devices that are never physical drives
+VIRTUAL_BLOCK = r'(loop|ram|zram|dm-|md|sr|nbd)'
+
+
+def drive_key(name: str) -> str:
+    """Normalize a drive name so NVMe namespaces match their controller
+
+    Args:
+        name (str): drive name, e.g. sda, nvme0 or nvme0n1
+
+    Returns:
+        str: normalized drive name
+    """
+    if name.startswith('nvme'):
+        return sub(r'n\d+$', '', name)
+    return name
+
+
+def find_hwmon_drives(hwmon_root: str = '/sys/class/hwmon') -> dict:
+    """Find the nvme and drivetemp hwmon temperature inputs of every drive
+
+    Args:
+        hwmon_root (str, optional): hwmon class directory. Defaults to '/sys/class/hwmon'.
+
+    Returns:
+        dict: {sensor name: temp*_input path} keyed by drive name
+    """
+    drives = {}
+    for hwmon in sorted(glob(join(hwmon_root, 'hwmon*'))):
+        driver = read_sysfs(join(hwmon, 'name'))
+        if driver == 'nvme':
+            name = basename(realpath(join(hwmon, 'device')))
+        elif driver == 'drivetemp':
+            block = glob(join(hwmon, 'device', 'block', '*'))
+            if not block:
+                continue
+            name = basename(block[0])
+        else:
+            continue
+        inputs = sorted(glob(join(hwmon, 'temp*_input')),
+                        key=lambda path: int(basename(path)[4:-6]))
+        sensors = {}
+        for temp_input in inputs:
+            label = read_sysfs(temp_input.replace('_input', '_label'))
+            if not label:
+                label = 'Composite' if not sensors else f"Sensor {len(sensors)}"
+            sensors[label] = temp_input
+        if sensors:
+            drives[name] = sensors
+    return drives
+
+
+def find_block_drives(block_root: str = '/sys/block') -> list:
+    """Find the physical drives in sysfs, NVMe namespaces reduced to their controller
+
+    Args:
+        block_root (str, optional): block class directory. Defaults to '/sys/block'.
+
+    Returns:
+        list: drive names, e.g. sda and nvme0
+    """
+    drives = []
+    for block in sorted(glob(join(block_root, '*'))):
+        name = basename(block)
+        if match(VIRTUAL_BLOCK, name) or not exists(join(block, 'device')):
+            continue
+        name = drive_key(name)
+        if name not in drives:
+            drives.append(name)
+    return drives
 
 
 class DriveTemp(HWSensorBase):
     """NVMe Temperature class
+
+    Drives are found in sysfs and their temperatures are read from the kernel nvme
+    and drivetemp hwmon sensors through cached file descriptors, so construction
+    and update() never run smartctl. Drives without a hwmon sensor report their
+    SMART composite temperature, which a background thread queries every
+    smart_interval seconds, and update() only takes the cached value.
     """
 
-    sensors = ['Composite', 'Sensor 1', 'Sensor 2']
     headings = ['Data', 'Current(C)', 'Min(C)', 'Max(C)', 'Mean(C)']
 
-    def __init__(self) -> None:
-        self.iteration = 1
-        device_list = DeviceList()
-        self.drive_count = len(device_list.devices)
+    def __init__(self, smart_interval: float = 60.0, hwmon_root: str = '/sys/class/hwmon',
+                 block_root: str = '/sys/block') -> None:
+        """
+        Args:
+            smart_interval (float, optional): seconds between SMART queries of the
+                drives without a hwmon sensor. Defaults to 60.0.
+            hwmon_root (str, optional): hwmon class directory.
+                Defaults to '/sys/class/hwmon'.
+            block_root (str, optional): block class directory. Defaults to '/sys/block'.
+        """
         self.drives = {}
-        self.lines = self.drive_count * 2
+        self.hwmon = {}
+        self.smart_devices = {}
+        self.smart_temps = {}
+        self.lock = Lock()
+        hwmon_drives = find_hwmon_drives(hwmon_root)
+        hwmon_keys = {drive_key(name): name for name in hwmon_drives}
+        for name in find_block_drives(block_root):
+            if name in hwmon_keys:
+                continue
+            self.drives[name] = {'Model': self._read_model(name), 'Composite': None}
+            self.smart_devices[name] = None
+        for name in hwmon_keys.values():
+            self.drives[name] = {'Model': self._read_model(name)}
+            self._add_hwmon_drive(name, hwmon_drives[name])
+        self.drive_count = len(self.drives)
+        self.lines = 0
         if self.drive_count > 0:
-            for device in device_list.devices:
-                self.drives[device.name] = {}
-                self.drives[device.name]['Model'] = device.model
-                self.drives[device.name]['Composite'] = None
-                self.lines += 1
-                for sensor in device.temperatures.keys():
-                    self.drives[device.name][f"Sensor {sensor}"] = None
-                    self.lines += 1
-            self.lines += 1
-        self.mmm = deepcopy(self.drives)
-        for drive in self.mmm.keys():
-            for sensor in self.mmm[drive].keys():
-                self.mmm[drive][sensor] = [9999, 0, 0]
+            self.lines = sum(len(drive) + 2 for drive in self.drives.values()) + 1
+        self.index = {}
+        for drive, sensors in self.drives.items():
+            for sensor in sensors:
+                if sensor != 'Model':
+                    self.index[(drive, sensor)] = len(self.index)
+        self.stats = Stats(len(self.index))
+        self.smart_updater = None
+        if self.smart_devices:
+            self.smart_updater = PeriodicUpdater(self.poll_smart, smart_interval,
+                                                 immediate=True)
+            self.smart_updater.start()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the SMART polling thread and close the hwmon files
+        """
+        if getattr(self, 'smart_updater', None) is not None:
+            self.smart_updater.stop()
+            self.smart_updater = None
+        for sensors in getattr(self, 'hwmon', {}).values():
+            for sysfs_file in sensors.values():
+                sysfs_file.close()
+        self.hwmon = {}
+
+    def _add_hwmon_drive(self, name: str, sensors: dict) -> None:
+        self.hwmon[name] = {}
+        for sensor, temp_input in sensors.items():
+            sysfs_file = open_sysfs(temp_input)
+            if sysfs_file is not None:
+                self.hwmon[name][sensor] = sysfs_file
+                self.drives[name][sensor] = None
+
+    @staticmethod
+    def _read_model(name: str) -> str:
+        for path in (f"/sys/class/nvme/{name}/model", f"/sys/block/{name}/device/model"):
+            if exists(path):
+                return read_sysfs(path) or ''
+        return ''
+
+    def poll_smart(self) -> None:
+        """Query SMART for the drives without a hwmon sensor
+
+        Each drive's pySMART Device is created on its first poll and updated after.
+        A drive whose query fails keeps its previous temperature.
+        """
+        for name, device in self.smart_devices.items():
+            try:
+                if device is None:
+                    device = Device(f"/dev/{name}")
+                    self.smart_devices[name] = device
+                    if getattr(device, 'model', None):
+                        with self.lock:
+                            self.drives[name]['Model'] = device.model
+                else:
+                    device.update()
+                temperature = getattr(device, 'temperature', None)
+            except Exception:
+                logger.exception("SMART query of %s failed", name)
+                continue
+            with self.lock:
+                self.smart_temps[name] = temperature
 
     def __iter__(self):
         for drive, sensors in self.drives.items():
@@ -45,27 +202,18 @@ class DriveTemp(HWSensorBase):
     def update(self) -> None:
         """update NVMe temps
         """
-        if self.drive_count > 0:
-            for device in DeviceList().devices:
-                temp = device.temperature
-                self.drives[device.name]['Composite'] = temp
-                minimum = min([self.mmm[device.name]['Composite'][0], temp])
-                maximum = max([self.mmm[device.name]['Composite'][1], temp])
-                mean = self.mmm[device.name]['Composite'][2]
-                mean = mean + (temp - mean) / self.iteration
-                self.mmm[device.name]['Composite'] = [minimum, maximum, mean]
-                for sensor in device.temperatures.keys():
-                    temp = device.temperatures[sensor]
-                    self.drives[device.name][f"Sensor {sensor}"] = temp
-                    minimum = min(
-                        [self.mmm[device.name][f"Sensor {sensor}"][0], temp])
-                    maximum = max(
-                        [self.mmm[device.name][f"Sensor {sensor}"][1], temp])
-                    mean = self.mmm[device.name][f"Sensor {sensor}"][2]
-                    mean = mean + (temp - mean) / self.iteration
-                    self.mmm[device.name][f"Sensor {sensor}"] = [
-                        minimum, maximum, mean]
-        self.iteration += 1
+        drives = self.drives
+        for drive, sensors in self.hwmon.items():
+            for sensor, sysfs_file in sensors.items():
+                try:
+                    drives[drive][sensor] = sysfs_file.read_int() / 1000
+                except (OSError, ValueError):
+                    drives[drive][sensor] = None
+        with self.lock:
+            smart_temps = dict(self.smart_temps)
+        for drive, temp in smart_temps.items():
+            drives[drive]['Composite'] = temp
+        self.stats.update([drives[drive][sensor] for drive, sensor in self.index])
 
     def get_label(self, params: list) -> str | None:
         """Get label for current sensor"""
@@ -108,36 +256,15 @@ class DriveTemp(HWSensorBase):
         Returns:
             str: drive model name
         """
-        drive = self.drives.get(drive, {})
-        return drive.get('Model', '')
+        with self.lock:
+            return self.drives.get(drive, {}).get('Model', '')
 
     def get_current(self, params: list) -> int | None:
         """Get current NVMe temperature for sensor for drive
         """
         if len(params) != 2:
             return None
-        return self.drives.get(params[0], {}).get(params[1], None)
-
-    def get_min(self, params: list) -> int | None:
-        """get minimum NVMe temperature for sensor for drive
-        """
-        if len(params) != 2:
-            return None
-        return self.mmm.get(params[0], {}).get(params[1], [None, None, None])[0]
-
-    def get_max(self, params: list) -> int | None:
-        """get maximum NVMe temperature for sensor for drive
-        """
-        if len(params) != 2:
-            return None
-        return self.mmm.get(params[0], {}).get(params[1], [None, None, None])[1]
-
-    def get_mean(self, params: list) -> int | None:
-        """get mean NVMe temperature for sensor for drive
-        """
-        if len(params) != 2:
-            return None
-        ret = self.mmm.get(params[0], {}).get(params[1], [None, None, None])[2]
+        ret = self.drives.get(params[0], {}).get(params[1], None)
         if ret is None:
             return ret
         return round(ret)
@@ -148,12 +275,8 @@ class DriveTemp(HWSensorBase):
         Returns:
             list: list of current NVMe clock speeds
         """
-        return [
-            round(value, 4)
-            for _, drive_info in self.drives.items()
-            for key, value in drive_info.items()
-            if key != 'Model' and value is not None
-        ]
+        values = [self.drives[drive][sensor] for drive, sensor in self.index]
+        return [None if value is None else round(value, 4) for value in values]
 
     def get_csv_headings(self) -> list:
         """Generate Headings list for CSV file of current values
@@ -161,14 +284,7 @@ class DriveTemp(HWSensorBase):
         Returns:
             list: List of CSV heading names
         """
-        if self.drive_count == 0:
-            return []
-        return [
-            f"{drive} {sensor}"
-            for drive, drive_info in self.drives.items()
-            for sensor in drive_info.keys()
-            if sensor != 'Model'
-        ]
+        return [f"{drive} {sensor}" for drive, sensor in self.index]
 
     def get_win_lines(self) -> int:
         """return number of lines needed for this data's curses window
@@ -0,0 +1,198 @@
+"""EDAC memory error counter sensor
+"""
+
+from glob import glob
+from os.path import basename, join
+from stressmon.dimminfo import DIMMInfo
+from stressmon.hwsensors import HWSensorBase
+from stressmon.memusage import MemUsage
+from stressmon.stats import Stats
+from stressmon.sysfs import open_sysfs, read_sysfs
+
+EDAC_DATA = ['Correctable', 'Uncorrectable']
+
+
+def find_edac_dimms(mc: str) -> list:
+    """Find the DIMMs of a memory controller
+
+    Newer kernels expose dimm* directories, older ones only csrow* directories.
+
+    Args:
+        mc (str): memory controller directory
+
+    Returns:
+        list: (sysfs label, counter directory, counter file prefix) tuples
+    """
+    dimms = []
+    paths = sorted(glob(join(mc, 'dimm[0-9]*')), key=lambda path: int(basename(path)[4:]))
+    for path in paths:
+        dimms.append((read_sysfs(join(path, 'dimm_label')) or basename(path), path, 'dimm_'))
+    if dimms:
+        return dimms
+    paths = sorted(glob(join(mc, 'csrow[0-9]*')), key=lambda path: int(basename(path)[5:]))
+    for path in paths:
+        dimms.append((read_sysfs(join(path, 'ch0_dimm_label')) or basename(path), path, ''))
+    return dimms
+
+
+def match_locator(label: str, locators: list) -> int | None:
+    """Find the SMBIOS locator an EDAC DIMM label refers to
+
+    Args:
+        label (str): EDAC dimm_label, e.g. "DIMM_A1" or "NODE 0 DIMM_A1"
+        locators (list): SMBIOS locators of the installed DIMMs
+
+    Returns:
+        int | None: position of the matching locator or None
+    """
+    for position, locator in enumerate(locators):
+        if locator and (label == locator or label.endswith(f" {locator}")):
+            return position
+    return None
+
+
+class EDAC(HWSensorBase):
+    """Correctable and uncorrectable memory error counts
+
+    Only the two per-controller counters are read each tick; the per-DIMM counters
+    are read when a controller count changes. DIMMs are matched to the SMBIOS
+    inventory by their EDAC label, or by position when no label matches and the
+    DIMM counts agree, so errors can be tied to part numbers. CSV data only holds
+    the counters that changed in the last update, and get_changes() reports them.
+    """
+
+    headings = ['Errors', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, memusage: MemUsage | None = None,
+                 edac_root: str = '/sys/devices/system/edac/mc') -> None:
+        """
+        Args:
+            memusage (MemUsage | None, optional): memory sensor to take the DIMM
+                inventory from. Defaults to reading it directly.
+            edac_root (str, optional): EDAC memory controller directory.
+        """
+        self._iter = None
+        dimminfo = memusage.dimminfo if memusage is not None else DIMMInfo()
+        controllers = sorted(glob(join(edac_root, 'mc[0-9]*')),
+                             key=lambda path: int(basename(path)[2:]))
+        edac_dimms = [(basename(mc), find_edac_dimms(mc)) for mc in controllers]
+        installed = dimminfo.get_dimms() if any(dimms for _, dimms in edac_dimms) else []
+        locators = [dimm['Locator'] for dimm in installed]
+        by_position = len(installed) == sum(len(dimms) for _, dimms in edac_dimms) and \
+            not any(match_locator(label, locators) is not None
+                    for _, dimms in edac_dimms for label, _, _ in dimms)
+        self.labels = []
+        self.files = []
+        self.parts = {}
+        # (controller slots, slots of its DIMM counters)
+        self.controllers = []
+        position = 0
+        for mc, dimms in edac_dimms:
+            mc_slots = self._add_row(mc, join(edac_root, mc), '')
+            if not mc_slots:
+                position += len(dimms)
+                continue
+            dimm_slots = []
+            for label, path, prefix in dimms:
+                match = position if by_position else match_locator(label, locators)
+                position += 1
+                unit = f"{mc} {label}"
+                if match is not None:
+                    unit = f"{mc} {installed[match]['Locator']}"
+                    self.parts[unit] = installed[match]['Part Number']
+                dimm_slots += self._add_row(unit, path, prefix)
+            self.controllers.append((mc_slots, dimm_slots))
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.values = [None] * len(self.labels)
+        self.changed = []
+        self.stats = Stats(len(self.labels))
+
+    def _add_row(self, unit: str, path: str, prefix: str) -> list:
+        slots = []
+        for data, counter in zip(EDAC_DATA, ['ce_count', 'ue_count']):
+            counter_file = open_sysfs(join(path, prefix + counter))
+            if counter_file is None:
+                continue
+            slots.append(len(self.labels))
+            self.files.append(counter_file)
+            self.labels.append([unit, data])
+        return slots
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def _read(self, slots: list) -> list:
+        changed = []
+        for slot in slots:
+            try:
+                count = self.files[slot].read_int()
+            except (OSError, ValueError):
+                continue
+            previous = self.values[slot]
+            self.values[slot] = count
+            # errors logged before monitoring started are reported once
+            if count != previous and (previous is not None or count):
+                changed.append(slot)
+        return changed
+
+    def update(self) -> None:
+        """Update error counts
+        """
+        self.changed = []
+        for mc_slots, dimm_slots in self.controllers:
+            first = self.values[mc_slots[0]] is None
+            mc_changed = self._read(mc_slots)
+            if mc_changed or first:
+                self.changed += mc_changed + self._read(dimm_slots)
+        self.stats.update(self.values)
+
+    def get_changes(self) -> dict:
+        """Get the error counts that changed in the last update
+
+        Returns:
+            dict: new error counts keyed by "unit data"
+        """
+        return {f"{self.labels[slot][0]} {self.labels[slot][1]}": self.values[slot]
+                for slot in self.changed}
+
+    def get_part_number(self, unit: str) -> str | None:
+        """get part number of the DIMM a unit was matched to
+        """
+        return self.parts.get(unit)
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) != 2:
+            return None
+        return params[1]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 2:
+            return None
+        part = self.get_part_number(params[0])
+        if part is None:
+            return params[0]
+        return f"{params[0]} - {part}"
+
+    def get_subsection(self, _) -> str | None:
+        """Get subsection"""
+        return None
+
+    def get_csv_data(self) -> list:
+        """Return list of error counts that changed in the last update
+        """
+        data = [None] * len(self.labels)
+        for slot in self.changed:
+            data[slot] = self.values[slot]
+        return data
+
+    def is_empty(self) -> bool:
+        """Does the system report memory errors?
+        """
+        return not self.labels
@@ -0,0 +1,421 @@
+"""GPU vendor backends and the shared GPU table they update
+"""
+
+from abc import ABC, abstractmethod
+from glob import glob
+from os.path import basename, join, realpath
+from random import Random
+from shutil import which
+from subprocess import CalledProcessError
+from threading import Lock
+from time import monotonic_ns
+from psutil import sensors_fans
+from pyamdgpuinfo import detect_gpus, get_gpu
+from pynvml import nvmlInit, NVMLError, nvmlDeviceGetCount, nvmlDeviceGetHandleByIndex,   \
+    nvmlDeviceGetName, nvmlDeviceGetPowerManagementLimit, nvmlShutdown,    \
+    nvmlDeviceGetFanSpeed, nvmlDeviceGetTemperature, NVML_TEMPERATURE_GPU, \
+    nvmlDeviceGetPowerUsage, nvmlDeviceGetUtilizationRates,                \
+    nvmlSystemGetDriverVersion, nvmlDeviceGetClock, NVML_CLOCK_GRAPHICS,   \
+    NVML_CLOCK_ID_CURRENT, nvmlDeviceGetMemoryInfo
+from stressmon.intelgputop import IntelGPUTop
+from stressmon.pciids import get_pci_ids, lookup_pci_name
+from stressmon.sysfs import SysfsFile, open_sysfs, read_sysfs
+
+GPU_DATA = ['temp', 'clock', 'fan_speed', 'power', 'memory', 'utilization']
+
+
+class GPUBackend(ABC):
+    """Base class for GPU vendor backends
+
+    A backend discovers the GPUs of one vendor once and then returns a batch of
+    readings for all of them each time read() is called. GPUData polls every
+    backend from its own thread, so a slow backend never delays the others.
+    """
+
+    vendor = None
+
+    def __init__(self, interval: float = 1.0) -> None:
+        self.interval = interval
+
+    @abstractmethod
+    def discover(self) -> dict:
+        """Discover GPUs
+
+        Returns:
+            dict: static info (power_limit, mem_limit, subsysven) keyed by gpu name
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def read(self) -> dict:
+        """Read current data for all discovered GPUs
+
+        Returns:
+            dict: dict of GPU_DATA values keyed by gpu name
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release backend resources
+        """
+
+    def get_driver_version(self) -> str | None:
+        """Get driver version if the backend knows it
+        """
+        return None
+
+
+class NVMLBackend(GPUBackend):
+    """NVIDIA GPUs through NVML
+    """
+
+    vendor = 'nvidia'
+
+    def __init__(self, interval: float = 1.0) -> None:
+        super().__init__(interval)
+        self.handles = {}
+        self.initialized = False
+
+    def discover(self) -> dict:
+        """Discover NVIDIA GPUs"""
+        try:
+            nvmlInit()
+        except NVMLError:
+            return {}
+        self.initialized = True
+        pci_ids = get_pci_ids('NVIDIA')
+        info = {}
+        for i in range(nvmlDeviceGetCount()):
+            handle = nvmlDeviceGetHandleByIndex(i)
+            name = f"{nvmlDeviceGetName(handle)}-{i}"
+            try:
+                power_limit = nvmlDeviceGetPowerManagementLimit(handle) / 1000
+            except NVMLError:
+                power_limit = None
+            subven = pci_ids[i][1] if i < len(pci_ids) else None
+            subven = lookup_pci_name('venids', subven) or subven
+            mem_limit = round((nvmlDeviceGetMemoryInfo(handle).total / 1024 / 1024), 2)
+            self.handles[name] = handle
+            info[name] = {'power_limit': power_limit, 'mem_limit': mem_limit,
+                          'subsysven': subven}
+        return info
+
+    def read(self) -> dict:
+        """Read NVIDIA GPU data"""
+        batch = {}
+        for name, handle in self.handles.items():
+            fan_speed = None
+            try:
+                fan_speed = nvmlDeviceGetFanSpeed(handle)
+            except NVMLError:
+                pass
+            try:
+                batch[name] = {
+                    'temp': nvmlDeviceGetTemperature(handle, NVML_TEMPERATURE_GPU),
+                    'clock': nvmlDeviceGetClock(handle,
+                                                NVML_CLOCK_GRAPHICS,
+                                                NVML_CLOCK_ID_CURRENT),
+                    'fan_speed': fan_speed,
+                    'power': nvmlDeviceGetPowerUsage(handle) / 1000,
+                    'memory': round((nvmlDeviceGetMemoryInfo(handle).used / 1024 / 1024), 2),
+                    'utilization': nvmlDeviceGetUtilizationRates(handle).gpu}
+            except NVMLError:
+                pass
+        return batch
+
+    def close(self) -> None:
+        """Shut down NVML"""
+        if self.initialized:
+            nvmlShutdown()
+            self.initialized = False
+
+    def get_driver_version(self) -> str | None:
+        """Get NVIDIA driver version"""
+        if self.initialized:
+            return nvmlSystemGetDriverVersion()
+        return None
+
+
+class AMDGPUBackend(GPUBackend):
+    """AMD GPUs through libdrm_amdgpu
+    """
+
+    vendor = 'amdgpu'
+
+    def __init__(self, interval: float = 1.0) -> None:
+        super().__init__(interval)
+        self.gpuinfos = {}
+
+    def discover(self) -> dict:
+        """Discover AMD GPUs"""
+        amd_gpu_count = detect_gpus()
+        if amd_gpu_count == 0:
+            return {}
+        pci_ids = get_pci_ids('AMD')
+        info = {}
+        for i in range(amd_gpu_count):
+            gpuinfo = get_gpu(i)
+            device, subven = pci_ids[i] if i < len(pci_ids) else (None, None)
+            name = f"Device_{str(device)}-{i}"
+            if gpuinfo.name:
+                name = f"{gpuinfo.name}-{i}"
+            else:
+                device_name = lookup_pci_name('amddevids', device)
+                if device_name:
+                    name = f"{device_name}-{i}"
+            subven = lookup_pci_name('venids', subven) or subven
+            mem_limit = round((gpuinfo.memory_info['vram_size'] / 1024 / 1024), 2)
+            self.gpuinfos[name] = gpuinfo
+            info[name] = {'power_limit': None, 'mem_limit': mem_limit,
+                          'subsysven': subven}
+        return info
+
+    def read(self) -> dict:
+        """Read AMD GPU data"""
+        batch = {}
+        fans = sensors_fans().get('amdgpu', [])
+        for name, gpuinfo in self.gpuinfos.items():
+            fan_speed = None
+            try:
+                fan_speed = fans[gpuinfo.gpu_id][1]
+            except IndexError:
+                pass
+            batch[name] = {'temp': gpuinfo.query_temperature(),
+                           'fan_speed': fan_speed,
+                           'power': gpuinfo.query_power(),
+                           'memory': round((gpuinfo.query_vram_usage() / 1024 / 1024), 2),
+                           'utilization': gpuinfo.query_load() * 100}
+        return batch
+
+
+class IntelGPUTopBackend(GPUBackend):
+    """Intel GPUs through the intel_gpu_top JSON stream
+    """
+
+    vendor = 'intel'
+
+    def __init__(self, interval: float = 1.0) -> None:
+        super().__init__(interval)
+        self.top = None
+
+    def discover(self) -> dict:
+        """Discover Intel GPUs"""
+        try:
+            self.top = IntelGPUTop(period_ms=round(self.interval * 1000))
+        except (CalledProcessError, FileNotFoundError):
+            return {}
+        return {name: {'power_limit': None, 'mem_limit': None, 'subsysven': None}
+                for name in self.top.get_gpu_names()}
+
+    def read(self) -> dict:
+        """Read the latest intel_gpu_top sample of each Intel GPU"""
+        self.top.update()
+        return {name: {'clock': gpu['freq_actual'],
+                       'power': gpu['power_gpu'],
+                       'utilization': gpu['render_busy']}
+                for name, gpu in self.top.gpus.items()}
+
+    def close(self) -> None:
+        """Stop intel_gpu_top"""
+        if self.top is not None:
+            self.top.stop_monitoring()
+            self.top = None
+
+
+class IntelSysfsBackend(GPUBackend):
+    """Intel GPUs through i915 and xe sysfs files
+
+    Frequency, RC6 residency and hwmon energy counters are read from cached file
+    descriptors and power and RC6 percentage are computed from the counter deltas
+    between reads, so no intel_gpu_top process or root access is needed.
+    """
+
+    vendor = 'intel'
+    drm = '/sys/class/drm'
+    # sysfs paths relative to the card directory, in order of preference
+    freq_paths = {'i915': ['gt_act_freq_mhz', 'gt_cur_freq_mhz'],
+                  'xe': ['device/tile0/gt0/freq0/act_freq', 'device/tile0/gt0/freq0/cur_freq']}
+    rc6_paths = {'i915': ['power/rc6_residency_ms', 'gt/gt0/rc6_residency_ms'],
+                 'xe': ['device/tile0/gt0/gtidle/idle_residency_ms']}
+
+    def __init__(self, interval: float = 1.0) -> None:
+        super().__init__(interval)
+        self.gpus = {}
+
+    @staticmethod
+    def _open_first(card: str, paths: list) -> SysfsFile | None:
+        for path in paths:
+            sysfs_file = open_sysfs(join(card, path))
+            if sysfs_file is not None:
+                return sysfs_file
+        return None
+
+    def discover(self) -> dict:
+        """Discover Intel GPUs"""
+        info = {}
+        cards = [card for card in glob(join(self.drm, 'card[0-9]*')) if '-' not in basename(card)]
+        cards.sort(key=lambda card: int(basename(card)[4:]))
+        for card in cards:
+            if read_sysfs(join(card, 'device/vendor')) != '0x8086':
+                continue
+            driver = basename(realpath(join(card, 'device/driver')))
+            if driver not in self.freq_paths:
+                continue
+            i = len(info)
+            device = (read_sysfs(join(card, 'device/device')) or '0x0000')[2:]
+            name = f"Device_{device}-{i}"
+            device_name = lookup_pci_name('inteldevids', device)
+            if device_name:
+                name = f"{device_name}-{i}"
+            subven = (read_sysfs(join(card, 'device/subsystem_vendor')) or '0x')[2:]
+            subven = lookup_pci_name('venids', subven) or subven or None
+            hwmon = sorted(glob(join(card, 'device/hwmon/hwmon*')))
+            hwmon = hwmon[0] if hwmon else ''
+            gpu = {'freq': self._open_first(card, self.freq_paths[driver]),
+                   'rc6': self._open_first(card, self.rc6_paths[driver]),
+                   'energy': open_sysfs(join(hwmon, 'energy1_input')) if hwmon else None,
+                   'temp': None, 'time': monotonic_ns(), 'rc6_ms': None, 'energy_uj': None}
+            if hwmon:
+                temps = sorted(glob(join(hwmon, 'temp*_input')))
+                gpu['temp'] = open_sysfs(temps[0]) if temps else None
+            try:
+                self._read_counters(gpu)
+            except (OSError, ValueError):
+                pass
+            self.gpus[name] = gpu
+            info[name] = {'power_limit': None, 'mem_limit': None, 'subsysven': subven}
+        return info
+
+    @staticmethod
+    def _read_counters(gpu: dict) -> None:
+        gpu['time'] = monotonic_ns()
+        if gpu['rc6'] is not None:
+            gpu['rc6_ms'] = gpu['rc6'].read_int()
+        if gpu['energy'] is not None:
+            gpu['energy_uj'] = gpu['energy'].read_int()
+
+    def read(self) -> dict:
+        """Read Intel GPU data"""
+        batch = {}
+        for name, gpu in self.gpus.items():
+            start_time = gpu['time']
+            start_rc6 = gpu['rc6_ms']
+            start_energy = gpu['energy_uj']
+            try:
+                self._read_counters(gpu)
+                data = {}
+                if gpu['freq'] is not None:
+                    data['clock'] = gpu['freq'].read_int()
+                if gpu['temp'] is not None:
+                    data['temp'] = gpu['temp'].read_int() / 1000
+            except (OSError, ValueError):
+                continue
+            duration = gpu['time'] - start_time
+            if duration > 0 and start_rc6 is not None:
+                rc6 = (gpu['rc6_ms'] - start_rc6) * 1000000 / duration * 100
+                data['utilization'] = min(max(100 - rc6, 0), 100)
+            if duration > 0 and start_energy is not None and gpu['energy_uj'] >= start_energy:
+                data['power'] = (gpu['energy_uj'] - start_energy) / (duration / 1000)
+            batch[name] = data
+        return batch
+
+    def close(self) -> None:
+        """Close the sysfs files"""
+        for gpu in self.gpus.values():
+            for data in ('freq', 'rc6', 'energy', 'temp'):
+                if gpu[data] is not None:
+                    gpu[data].close()
+        self.gpus = {}
+
+
+class FakeGPUBackend(GPUBackend):
+    """Synthetic GPUs for running the pipeline on machines without a GPU
+    """
+
+    vendor = 'fake'
+
+    def __init__(self, interval: float = 1.0, count: int = 1, seed: int = 0) -> None:
+        super().__init__(interval)
+        self.count = count
+        self.random = Random(seed)
+        self.gpus = {}
+
+    def discover(self) -> dict:
+        """Create fake GPUs"""
+        for i in range(self.count):
+            self.gpus[f"Fake GPU-{i}"] = {'temp': 40.0, 'clock': 1500.0, 'fan_speed': 30.0,
+                                          'power': 100.0, 'memory': 1024.0,
+                                          'utilization': 50.0}
+        return {name: {'power_limit': 300, 'mem_limit': 8192.0, 'subsysven': 'Fake'}
+                for name in self.gpus}
+
+    def read(self) -> dict:
+        """Random walk every fake GPU reading"""
+        batch = {}
+        for name, gpu in self.gpus.items():
+            for data, value in gpu.items():
+                gpu[data] = max(0.0, value + self.random.uniform(-1.0, 1.0))
+            batch[name] = dict(gpu)
+        return batch
+
+
+class GPUTable:
+    """Latest readings of every GPU, shared between the backend threads and GPUData
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.gpus = {}
+
+    def add_vendor(self, vendor: str, info: dict) -> None:
+        """Add the GPUs discovered by a backend
+
+        Args:
+            vendor (str): backend vendor name
+            info (dict): static gpu info keyed by gpu name
+        """
+        with self.lock:
+            self.gpus[vendor] = {'names': list(info.keys())}
+            for name, static in info.items():
+                self.gpus[vendor][name] = dict.fromkeys(GPU_DATA)
+                self.gpus[vendor][name].update(static)
+
+    def publish(self, vendor: str, batch: dict) -> None:
+        """Store a batch of readings from a backend
+        """
+        with self.lock:
+            for name, data in batch.items():
+                self.gpus[vendor][name].update(data)
+
+    def poll(self, backend: GPUBackend) -> None:
+        """Read a batch from backend and store it
+        """
+        self.publish(backend.vendor, backend.read())
+
+    def snapshot(self) -> dict:
+        """Get a consistent copy of the table
+
+        Returns:
+            dict: gpu data keyed by vendor then gpu name
+        """
+        with self.lock:
+            ret = {}
+            for vendor, gpus in self.gpus.items():
+                ret[vendor] = {'names': list(gpus['names'])}
+                for name in gpus['names']:
+                    ret[vendor][name] = dict(gpus[name])
+            return ret
+
+
+def default_backends(interval: float = 1.0) -> list:
+    """Get the backends for every supported GPU vendor
+
+    Intel GPUs use the intel_gpu_top stream when intel_gpu_top is installed and
+    fall back to sysfs otherwise. GPUData only uses the first backend of a vendor
+    that discovers any GPUs.
+    """
+    backends = [NVMLBackend(interval), AMDGPUBackend(interval)]
+    if which('intel_gpu_top'):
+        backends.append(IntelGPUTopBackend(interval))
+    backends.append(IntelSysfsBackend(interval))
+    return backends
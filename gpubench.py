@@ -0,0 +1,190 @@
+"""gpu_burn and glmark2 benchmark output sensor
+"""
+
+from re import compile as re_compile
+from stressmon.gpudata import GPUData
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.streamtail import StreamTail
+
+GPU_BURN_DATA = ['Gflop/s', 'Errors', 'Gflop/s/W']
+GLMARK2_DATA = ['FPS', 'Score', 'FPS/W']
+
+GPU_BURN_GFLOPS = re_compile(r'\((\d+) Gflop/s\)')
+GLMARK2_FPS = re_compile(r'\[(\w+)\].*FPS:\s*(\d+)')
+GLMARK2_SCORE = re_compile(r'glmark2 Score:\s*(\d+)')
+
+
+def parse_gpu_burn(line: str) -> list | None:
+    """Parse a gpu_burn progress line
+
+    e.g. "50.0%  proc'd: 1463 (16512 Gflop/s) - 1440 (16398 Gflop/s)   errors: 0 - 0
+    temps: 75 C - 73 C"
+
+    Args:
+        line (str): output line
+
+    Returns:
+        list | None: (Gflop/s, errors) per GPU in gpu_burn's device order, or None
+    """
+    if "proc'd:" not in line or 'errors:' not in line:
+        return None
+    progress, _, errors = line.partition('errors:')
+    gflops = [int(value) for value in GPU_BURN_GFLOPS.findall(progress)]
+    errors = errors.partition('temps:')[0].split(' - ')
+    counts = []
+    for error in errors:
+        fields = error.split()
+        counts.append(int(fields[0]) if fields and fields[0].isdigit() else None)
+    if len(counts) != len(gflops):
+        counts = [None] * len(gflops)
+    return list(zip(gflops, counts))
+
+
+def parse_glmark2(line: str) -> tuple | None:
+    """Parse a glmark2 scene result or the final score
+
+    Args:
+        line (str): output line
+
+    Returns:
+        tuple | None: (scene, FPS) for scene results, ('Score', score) for the final
+            score, or None
+    """
+    match = GLMARK2_FPS.search(line)
+    if match is not None:
+        return match.group(1), int(match.group(2))
+    match = GLMARK2_SCORE.search(line)
+    if match is not None:
+        return 'Score', int(match.group(1))
+    return None
+
+
+class GPUBench(HWSensorBase):
+    """gpu_burn Gflop/s and errors and glmark2 FPS per GPU
+
+    The tools' output is tailed without blocking from their stdout pipes or log
+    files. Rows are named after GPUData's GPUs, gpu_burn's device N being the Nth
+    GPU of the vendor, so throughput lines up with GPUData's temperature and power
+    columns, and drops caused by throttling show as soon as they happen. Work per
+    watt uses GPUData's power reading of the same tick.
+    """
+
+    headings = ['Benchmark', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, gpu_burn=None, glmark2=None, gpudata: GPUData | None = None,
+                 vendor: str = 'nvidia', gpu_count: int = 1, glmark2_gpu: int = 0) -> None:
+        """
+        Args:
+            gpu_burn (optional): gpu_burn log path or stdout pipe, see StreamTail.
+                Defaults to None.
+            glmark2 (optional): glmark2 log path or stdout pipe. Defaults to None.
+            gpudata (GPUData | None, optional): GPU sensor to name GPUs and take
+                power readings from. Defaults to None.
+            vendor (str, optional): GPUData vendor of the benchmarked GPUs.
+                Defaults to 'nvidia'.
+            gpu_count (int, optional): number of GPUs when there is no GPUData.
+                Defaults to 1.
+            glmark2_gpu (int, optional): GPU glmark2 renders on. Defaults to 0.
+        """
+        self._iter = None
+        self.gpudata = gpudata
+        self.vendor = vendor
+        self.names = []
+        if gpudata is not None:
+            self.names = list(gpudata.get_gpu_names(vendor))
+        if not self.names:
+            self.names = [f"GPU {i}" for i in range(gpu_count)]
+        self.labels = []
+        self.gpu_burn = None
+        self.glmark2 = None
+        if gpu_burn is not None:
+            self.gpu_burn = StreamTail(gpu_burn)
+            self.labels += [[name, 'gpu_burn', data] for name in self.names
+                            for data in GPU_BURN_DATA]
+        self.glmark2_slot = len(self.labels)
+        self.glmark2_name = None
+        if glmark2 is not None and glmark2_gpu < len(self.names):
+            self.glmark2 = StreamTail(glmark2)
+            self.glmark2_name = self.names[glmark2_gpu]
+            self.labels += [[self.glmark2_name, 'glmark2', data] for data in GLMARK2_DATA]
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.scene = None
+        self.values = [None] * len(self.labels)
+        self.stats = Stats(len(self.labels))
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def _power(self, name: str) -> float | None:
+        if self.gpudata is None:
+            return None
+        return self.gpudata.gpus.get(self.vendor, {}).get(name, {}).get('power')
+
+    def update(self) -> None:
+        """Update benchmark results from the output since the last tick
+        """
+        # only results reported during this tick count towards the statistics
+        samples = [None] * len(self.labels)
+        values = self.values
+        if self.gpu_burn is not None:
+            progress = None
+            for line in self.gpu_burn.readlines():
+                progress = parse_gpu_burn(line) or progress
+            for gpu, (gflops, errors) in enumerate((progress or [])[:len(self.names)]):
+                base = gpu * len(GPU_BURN_DATA)
+                power = self._power(self.names[gpu])
+                values[base] = gflops
+                values[base + 1] = errors
+                values[base + 2] = gflops / power if power else None
+                samples[base:base + len(GPU_BURN_DATA)] = values[base:base + len(GPU_BURN_DATA)]
+        if self.glmark2 is not None:
+            base = self.glmark2_slot
+            for line in self.glmark2.readlines():
+                result = parse_glmark2(line)
+                if result is None:
+                    continue
+                scene, value = result
+                if scene == 'Score':
+                    values[base + 1] = samples[base + 1] = value
+                    continue
+                power = self._power(self.glmark2_name)
+                self.scene = scene
+                values[base] = samples[base] = value
+                values[base + 2] = samples[base + 2] = value / power if power else None
+        self.stats.update(samples)
+
+    def get_scene(self) -> str | None:
+        """get the glmark2 scene of the current FPS
+        """
+        return self.scene
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) != 3:
+            return None
+        return params[2]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 3:
+            return None
+        return params[0]
+
+    def get_subsection(self, params: list) -> str | None:
+        """Get subsection"""
+        if len(params) != 3:
+            return None
+        if params[1] == 'glmark2' and self.scene is not None:
+            return f"glmark2 [{self.scene}]"
+        return params[1]
+
+    def is_empty(self) -> bool:
+        """Is a benchmark being followed?
+        """
+        return not self.labels
@@ -0,0 +1,219 @@
+"""Bounded multi-resolution sample history
+"""
+
+from array import array
+from math import isnan, nan
+from time import monotonic
+
+# (bucket width in seconds, buckets kept) of each roll-up tier
+DEFAULT_TIERS = ((10, 720), (60, 4320))
+
+
+class HistoryTier:
+    """Ring of timestamped samples or buckets for a fixed number of slots
+
+    Values live in preallocated arrays, one entry per slot and position, with NaN
+    marking missing values, so memory use is fixed when the tier is created.
+    """
+
+    def __init__(self, size: int, capacity: int, width: float, typecode: str) -> None:
+        self.size = size
+        self.capacity = capacity
+        self.width = width
+        self.times = array('d', [nan]) * capacity
+        self.means = array(typecode, [nan]) * (size * capacity)
+        self.mins = None
+        self.maxs = None
+        if width:
+            self.mins = array(typecode, [nan]) * (size * capacity)
+            self.maxs = array(typecode, [nan]) * (size * capacity)
+        self.head = 0
+        self.count = 0
+
+    def nbytes(self) -> int:
+        """get the memory used by the tier's arrays
+        """
+        arrays = [self.times, self.means, self.mins, self.maxs]
+        return sum(len(values) * values.itemsize for values in arrays if values is not None)
+
+    def append(self, timestamp: float, means: list, mins: list | None = None,
+               maxs: list | None = None) -> None:
+        """Store a sample or bucket for every slot, overwriting the oldest one
+        """
+        position = self.head
+        self.times[position] = timestamp
+        capacity = self.capacity
+        for i, mean in enumerate(means):
+            self.means[i * capacity + position] = nan if mean is None else mean
+        if self.mins is not None:
+            for i, (minimum, maximum) in enumerate(zip(mins, maxs)):
+                self.mins[i * capacity + position] = nan if minimum is None else minimum
+                self.maxs[i * capacity + position] = nan if maximum is None else maximum
+        self.head = (position + 1) % capacity
+        self.count = min(self.count + 1, capacity)
+
+    def _position(self, i: int) -> int:
+        return (self.head - self.count + i) % self.capacity
+
+    def newest(self) -> float | None:
+        """get timestamp of the newest sample or bucket
+        """
+        if not self.count:
+            return None
+        return self.times[self._position(self.count - 1)]
+
+    def oldest(self) -> float | None:
+        """get timestamp of the oldest sample or bucket
+        """
+        if not self.count:
+            return None
+        return self.times[self._position(0)]
+
+    def query(self, index: int, start: float, end: float) -> list:
+        """Get the samples or buckets of slot index between start and end
+
+        Returns:
+            list: (timestamp, min, max, mean) tuples, None for missing values
+        """
+        low = 0
+        high = self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.times[self._position(middle)] < start:
+                low = middle + 1
+            else:
+                high = middle
+        ret = []
+        base = index * self.capacity
+        for i in range(low, self.count):
+            position = self._position(i)
+            timestamp = self.times[position]
+            if timestamp > end:
+                break
+            mean = self.means[base + position]
+            if isnan(mean):
+                ret.append((timestamp, None, None, None))
+            elif self.mins is None:
+                ret.append((timestamp, mean, mean, mean))
+            else:
+                ret.append((timestamp, self.mins[base + position],
+                            self.maxs[base + position], mean))
+        return ret
+
+
+class History:
+    """Raw samples of the last minutes, then min/max/mean buckets further back
+
+    Samples go to a raw tier and into the open bucket of the first roll-up tier.
+    When a bucket's time is over it is stored and rolled up into the open bucket of
+    the next tier, so with the defaults a 72 hour burn-in is kept as 10 minutes of
+    raw samples, 2 hours of 10 s buckets and 72 hours of 1 min buckets. Every tier
+    is preallocated, memory per slot is fixed, see nbytes(), and a query picks the
+    finest tier reaching back far enough and binary searches it. Timestamps are
+    time.monotonic() seconds unless given to update(), so the history isn't bent
+    by wall clock steps.
+    """
+
+    def __init__(self, size: int, raw: int = 600, tiers: tuple = DEFAULT_TIERS,
+                 typecode: str = 'f') -> None:
+        """
+        Args:
+            size (int): number of slots
+            raw (int, optional): raw samples kept. Defaults to 600.
+            tiers (tuple, optional): (bucket width in seconds, buckets kept) per
+                roll-up tier, finest first. Defaults to DEFAULT_TIERS.
+            typecode (str, optional): array typecode of stored values, 'f' for
+                single or 'd' for double precision. Defaults to 'f'.
+        """
+        self.size = size
+        self.tiers = [HistoryTier(size, raw, 0, typecode)]
+        self.tiers += [HistoryTier(size, capacity, width, typecode) for width, capacity in tiers]
+        # open bucket of each roll-up tier: [start, mins, maxs, sums, counts]
+        self.buckets = [[None, None, None, None, None] for _ in tiers]
+
+    def nbytes(self) -> int:
+        """get the memory used by every tier
+        """
+        return sum(tier.nbytes() for tier in self.tiers)
+
+    def update(self, values: list, timestamp: float | None = None) -> None:
+        """Add one sample for every slot
+
+        Args:
+            values (list): one value per slot, None if there is no value
+            timestamp (float | None, optional): sample time. Defaults to now, from
+                time.monotonic().
+        """
+        if timestamp is None:
+            timestamp = monotonic()
+        self.tiers[0].append(timestamp, values)
+        if self.buckets:
+            counts = [0 if value is None else 1 for value in values]
+            self._add(0, timestamp, values, values, values, counts)
+
+    def _add(self, tier: int, timestamp: float, mins: list, maxs: list, sums: list,
+             counts: list) -> None:
+        width = self.tiers[tier + 1].width
+        start = timestamp - timestamp % width
+        bucket = self.buckets[tier]
+        if bucket[0] is not None and bucket[0] != start:
+            self._close(tier)
+        if bucket[0] is None:
+            bucket[:] = [start, list(mins), list(maxs), list(sums), list(counts)]
+            return
+        _, bucket_mins, bucket_maxs, bucket_sums, bucket_counts = bucket
+        for i, count in enumerate(counts):
+            if not count:
+                continue
+            if not bucket_counts[i]:
+                bucket_mins[i] = mins[i]
+                bucket_maxs[i] = maxs[i]
+                bucket_sums[i] = sums[i]
+            else:
+                bucket_mins[i] = min(bucket_mins[i], mins[i])
+                bucket_maxs[i] = max(bucket_maxs[i], maxs[i])
+                bucket_sums[i] += sums[i]
+            bucket_counts[i] += count
+
+    def _close(self, tier: int) -> None:
+        bucket = self.buckets[tier]
+        start, mins, maxs, sums, counts = bucket
+        bucket[:] = [None, None, None, None, None]
+        means = [total / count if count else None for total, count in zip(sums, counts)]
+        self.tiers[tier + 1].append(start, means, mins, maxs)
+        if tier + 1 < len(self.buckets):
+            self._add(tier + 1, start, mins, maxs, sums, counts)
+
+    def query(self, index: int, start: float | None = None, end: float | None = None) -> list:
+        """Get the history of slot index between start and end
+
+        Args:
+            index (int): slot
+            start (float | None, optional): first timestamp. Defaults to the oldest.
+            end (float | None, optional): last timestamp. Defaults to now.
+
+        Returns:
+            list: (timestamp, min, max, mean) tuples from the finest tier reaching
+                back to start, followed by the finer tiers' entries that are newer
+                than its last bucket, None for missing values
+        """
+        if start is None:
+            start = float('-inf')
+        if end is None:
+            end = float('inf')
+        chosen = 0
+        for position, tier in enumerate(self.tiers):
+            oldest = tier.oldest()
+            if oldest is None:
+                continue
+            chosen = position
+            if oldest <= start:
+                break
+        ret = []
+        # finer tiers hold what the coarser tier's buckets don't cover yet
+        for tier in reversed(self.tiers[:chosen + 1]):
+            ret += tier.query(index, start, end)
+            newest = tier.newest()
+            if newest is not None:
+                start = max(start, newest + tier.width)
+        return ret
@@ -0,0 +1,187 @@
+"""Generic hwmon voltage, current, power and temperature sensor
+"""
+
+from fnmatch import fnmatch
+from glob import glob
+from os.path import basename, join
+from re import match
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.sysfs import open_sysfs, read_sysfs
+
+# hwmon channel type: (unit, divisor to convert the sysfs value to the unit)
+HWMON_CHANNELS = {'in': ('V', 1000), 'curr': ('A', 1000), 'power': ('W', 1000000),
+                  'temp': ('C', 1000)}
+# chips that already have a dedicated sensor
+HWMON_EXCLUDE = ['coretemp *', 'k10temp *', 'nvme *', 'drivetemp *', 'amdgpu *']
+
+
+def find_hwmon_channels(hwmon_root: str = '/sys/class/hwmon') -> list:
+    """Find every voltage, current, power and temperature channel
+
+    Args:
+        hwmon_root (str, optional): hwmon class directory. Defaults to '/sys/class/hwmon'.
+
+    Chips sharing a name are numbered, e.g. nvme, nvme-1, and channels sharing a
+    label within a chip get their channel name appended, so every (chip, label)
+    pair is unique.
+
+    Returns:
+        list: (chip name, chip, channel label, unit, divisor, input path) tuples
+            grouped by chip
+    """
+    channels = []
+    chips = set()
+    hwmons = sorted(glob(join(hwmon_root, 'hwmon*')),
+                    key=lambda path: int(basename(path)[5:]))
+    for hwmon in hwmons:
+        name = read_sysfs(join(hwmon, 'name'))
+        if name is None:
+            continue
+        chip = name
+        number = 0
+        while chip in chips:
+            number += 1
+            chip = f"{name}-{number}"
+        chips.add(chip)
+        inputs = {}
+        for path in glob(join(hwmon, '*_average')) + glob(join(hwmon, '*_input')):
+            channel = match(r'(in|curr|power|temp)(\d+)_(input|average)$', basename(path))
+            if channel is not None:
+                # an _input file replaces the _average one of the same channel
+                inputs[(channel.group(1), int(channel.group(2)))] = path
+        labels = set()
+        for (channel_type, number), path in sorted(inputs.items()):
+            unit, divisor = HWMON_CHANNELS[channel_type]
+            label = read_sysfs(join(hwmon, f"{channel_type}{number}_label"))
+            if not label:
+                label = f"{channel_type}{number}"
+            if label in labels:
+                label = f"{label} {channel_type}{number}"
+            labels.add(label)
+            channels.append((name, chip, f"{label}({unit})", unit, divisor, path))
+    return channels
+
+
+class HWMon(HWSensorBase):
+    """Every hwmon voltage, current, power and temperature channel
+
+    Channels are discovered once, grouped by chip, and read each tick through a
+    precomputed list of open file descriptors. Channels are selected with fnmatch
+    include/exclude patterns matched against "chip label", e.g. "nct6798 in*" or
+    "*VRM*", where chip is either the hwmon name or its numbered form (nvme-1), so
+    "nvme *" covers every NVMe drive. Chips with a dedicated sensor are excluded by
+    default.
+    """
+
+    headings = ['Sensor', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, include: list | None = None, exclude: list | None = None,
+                 hwmon_root: str = '/sys/class/hwmon') -> None:
+        """
+        Args:
+            include (list | None, optional): patterns of channels to read.
+                Defaults to every channel.
+            exclude (list | None, optional): patterns of channels to skip.
+                Defaults to HWMON_EXCLUDE.
+            hwmon_root (str, optional): hwmon class directory.
+        """
+        self._iter = None
+        if include is None:
+            include = ['*']
+        if exclude is None:
+            exclude = HWMON_EXCLUDE
+        self.labels = []
+        self.files = []
+        self.divisors = []
+        for name, chip, label, _, divisor, path in find_hwmon_channels(hwmon_root):
+            names = [f"{name} {label}", f"{chip} {label}"]
+            if not any(fnmatch(channel, pattern) for channel in names for pattern in include) \
+                    or any(fnmatch(channel, pattern) for channel in names for pattern in exclude):
+                continue
+            channel_file = open_sysfs(path)
+            if channel_file is None:
+                continue
+            self.labels.append([chip, label])
+            self.files.append(channel_file)
+            self.divisors.append(divisor)
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.values = [None] * len(self.labels)
+        self.stats = Stats(len(self.labels))
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def update(self) -> None:
+        """Update hwmon channels
+        """
+        values = self.values
+        for slot, (channel_file, divisor) in enumerate(zip(self.files, self.divisors)):
+            try:
+                values[slot] = channel_file.read_int() / divisor
+            except (OSError, ValueError):
+                values[slot] = None
+        self.stats.update(values)
+
+    def get_chips(self) -> list:
+        """get list of chips with selected channels
+        """
+        return list(dict.fromkeys(chip for chip, _ in self.labels))
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) != 2:
+            return None
+        return params[1]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 2:
+            return None
+        return params[0]
+
+    def get_subsection(self, _) -> str | None:
+        """Get subsection"""
+        return None
+
+    def get_current(self, params: list) -> float | None:
+        """Get current value of channel
+        """
+        index = self.index.get(tuple(params))
+        if index is None or self.values[index] is None:
+            return None
+        return round(self.values[index], 2)
+
+    def get_min(self, params: list) -> float | None:
+        """Get minimum value of channel
+        """
+        index = self.index.get(tuple(params))
+        if index is None or self.stats.get_min(index) is None:
+            return None
+        return round(self.stats.get_min(index), 2)
+
+    def get_max(self, params: list) -> float | None:
+        """Get maximum value of channel
+        """
+        index = self.index.get(tuple(params))
+        if index is None or self.stats.get_max(index) is None:
+            return None
+        return round(self.stats.get_max(index), 2)
+
+    def get_mean(self, params: list) -> float | None:
+        """Get mean value of channel
+        """
+        index = self.index.get(tuple(params))
+        if index is None or self.stats.get_mean(index) is None:
+            return None
+        return round(self.stats.get_mean(index), 2)
+
+    def is_empty(self) -> bool:
+        """Are there hwmon channels?
+        """
+        return not self.labels
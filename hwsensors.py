@@ -2,13 +2,24 @@
 """
 
 from abc import ABC, abstractmethod
+from threading import Lock
+from stressmon.stats import Stats
 
 
 class HWSensorBase(ABC):
     """Base class for system hardware monitoring sensors
+
+    Sensors that keep a Stats accumulator in self.stats, with self.index mapping
+    label tuples to its slots, update it themselves and get get_current() and the
+    CSV methods from here, reading self.values and self.labels. For the others a
+    shadow Stats over their iteration keys is fed from get_raw() by record(), which
+    UpdatePool calls after every update. Either way min, max and mean come from
+    the one Stats, and epochs work for every sensor. The shadow Stats is created
+    when the sensor is added to an UpdatePool, before any update runs.
     """
 
     headings = []
+    stats = None
 
     @abstractmethod
     def get_label(self, params: list) -> str | None:
@@ -25,6 +36,148 @@ class HWSensorBase(ABC):
         """Get list of headings"""
         return self.headings
 
+    def get_stats(self) -> Stats:
+        """Get the sensor's Stats, creating the shadow Stats on first use
+        """
+        if self.stats is None:
+            # setdefault is atomic, so threads racing here share one lock
+            with vars(self).setdefault('stats_lock', Lock()):
+                if self.stats is None:
+                    self.stat_keys = {tuple(params): i for i, params in enumerate(self)}
+                    self.stats = Stats(len(self.stat_keys))
+        return self.stats
+
+    def stat_index(self, params: list) -> int | None:
+        """Get the Stats slot of params
+        """
+        keys = getattr(self, 'stat_keys', None)
+        if keys is None:
+            keys = getattr(self, 'index', {})
+        return keys.get(tuple(params))
+
+    def get_raw(self, params: list) -> float | None:
+        """Get current sensor data unrounded, for the shadow Stats
+
+        Defaults to get_current(), sensors that round it override this.
+        """
+        return self.get_current(params)
+
+    def record(self) -> None:
+        """Add the current values to the shadow Stats after an update
+
+        Sensors with their own Stats already did so in update().
+        """
+        stats = self.get_stats()
+        keys = getattr(self, 'stat_keys', None)
+        if keys is not None:
+            stats.update([self.get_raw(list(params)) for params in keys])
+
+    def get_percentile(self, params: list, quantile: float) -> float | None:
+        """Get the estimated quantile (0-1) of sensor data, e.g. 0.95 for p95
+
+        p50, p95 and p99 are tracked, other quantiles are interpolated between the
+        estimator's markers.
+        """
+        index = self.stat_index(params)
+        if index is None:
+            return None
+        return self.get_stats().get_percentile(index, quantile)
+
+    def enable_windows(self, windows: dict | None = None) -> None:
+        """Start keeping rolling window statistics, see Stats.enable_windows()
+        """
+        self.get_stats().enable_windows(windows)
+
+    def get_window(self, params: list, name: str) -> dict | None:
+        """Get min, max, mean and sample count of sensor data over window name
+        """
+        index = self.stat_index(params)
+        if index is None:
+            return None
+        return self.get_stats().get_window(index, name)
+
+    def enable_history(self, **kwargs) -> None:
+        """Start keeping a bounded history, see Stats.enable_history()
+        """
+        self.get_stats().enable_history(**kwargs)
+
+    def get_history(self, params: list, start: float | None = None,
+                    end: float | None = None) -> list:
+        """Get (timestamp, min, max, mean) history of sensor data between start and end
+
+        Timestamps are time.monotonic() seconds.
+        """
+        index = self.stat_index(params)
+        if index is None:
+            return []
+        return self.get_stats().get_history(index, start, end)
+
+    def enable_steady_state(self, **kwargs) -> None:
+        """Start detecting steady state, see Stats.enable_steady_state()
+        """
+        self.get_stats().enable_steady_state(**kwargs)
+
+    def get_steady_state(self, params: list) -> dict | None:
+        """Get steady flag, settle timestamp and plateau value of sensor data
+        """
+        index = self.stat_index(params)
+        if index is None:
+            return None
+        return self.get_stats().get_steady_state(index)
+
+    def _stat_params(self) -> list:
+        keys = getattr(self, 'stat_keys', None)
+        if keys is None:
+            keys = getattr(self, 'index', {})
+        return sorted(keys, key=keys.get)
+
+    def get_window_csv_headings(self) -> list:
+        """Return headings for the rolling window csv columns of the sensor
+        """
+        windows = self.get_stats().windows
+        if windows is None:
+            return []
+        return [f"{' '.join(str(param) for param in params)} {name} {data}"
+                for params in self._stat_params()
+                for name in windows.names
+                for data in ['Mean', 'Min', 'Max']]
+
+    def get_window_csv_data(self) -> list:
+        """Return the rolling window mean, min and max of the sensor data
+        """
+        stats = self.get_stats()
+        if stats.windows is None:
+            return []
+        data = []
+        for index in range(len(self._stat_params())):
+            for name in stats.windows.names:
+                window = stats.get_window(index, name)
+                if window is None:
+                    data += [None, None, None]
+                else:
+                    data += [round(window['mean'], 4), round(window['min'], 4),
+                             round(window['max'], 4)]
+        return data
+
+    def open_epoch(self, name: str) -> None:
+        """Start a named stats epoch, e.g. "cpu-burn"
+        """
+        self.get_stats().open_epoch(name)
+
+    def close_epoch(self, name: str) -> None:
+        """End a named stats epoch, keeping its statistics
+        """
+        self.get_stats().close_epoch(name)
+
+    def get_epoch_summary(self, params: list, name: str) -> dict | None:
+        """Get min, max, mean and sample count of params during epoch name
+        """
+        epoch = self.get_stats().get_epoch(name)
+        index = self.stat_index(params)
+        if epoch is None or index is None:
+            return None
+        return epoch.get_summary(index)
+
     @abstractmethod
     def get_section(self, params: list) -> str | None:
         """Get section"""
@@ -35,41 +188,66 @@ class HWSensorBase(ABC):
         """Get section"""
         raise NotImplementedError
 
-    @abstractmethod
+    def _require(self, method: str, *attributes: str) -> None:
+        missing = [attribute for attribute in attributes if not hasattr(self, attribute)]
+        if missing:
+            raise NotImplementedError(
+                f"{type(self).__name__} must implement {method}() or set "
+                f"{', '.join('self.' + attribute for attribute in missing)}")
+
     def get_current(self, params: list) -> int | None:
         """Get current sensor data
+
+        Sensors without self.index and self.values implement it themselves.
         """
-        raise NotImplementedError
+        self._require('get_current', 'index', 'values')
+        index = self.index.get(tuple(params))
+        if index is None or self.values[index] is None:
+            return None
+        return round(self.values[index])
 
-    @abstractmethod
     def get_min(self, params: list) -> int | None:
         """Get minimum value for sensor data
         """
-        raise NotImplementedError
+        stats = self.get_stats()
+        index = self.stat_index(params)
+        if index is None or stats.get_min(index) is None:
+            return None
+        return round(stats.get_min(index))
 
-    @abstractmethod
     def get_max(self, params: list) -> int | None:
         """Get maximum value for sensor data
         """
-        raise NotImplementedError
+        stats = self.get_stats()
+        index = self.stat_index(params)
+        if index is None or stats.get_max(index) is None:
+            return None
+        return round(stats.get_max(index))
 
-    @abstractmethod
     def get_mean(self, params: list) -> int | None:
         """Get average value for sensor data
         """
-        raise NotImplementedError
+        stats = self.get_stats()
+        index = self.stat_index(params)
+        if index is None or stats.get_mean(index) is None:
+            return None
+        return round(stats.get_mean(index))
 
-    @abstractmethod
     def get_csv_headings(self) -> list:
         """Return headings for csv file for sensor
+
+        Sensors without self.labels implement it themselves.
         """
-        raise NotImplementedError
+        self._require('get_csv_headings', 'labels')
+        return [" ".join(str(param) for param in label) for label in self.labels]
 
-    @abstractmethod
     def get_csv_data(self) -> list:
         """Return list of sensor data for sensor
+
+        Sensors without self.values implement it themselves.
         """
-        raise NotImplementedError
+        self._require('get_csv_data', 'values')
+        return [None if value is None else round(value, 4) for value in self.values]
 
     # @abstractmethod
     # def get_win_lines(self) -> int:
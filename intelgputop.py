@@ -1,179 +1,361 @@
 """ IntelGPUTop class, encapsulates data from intel_gpu_top utility
 """
 
-from subprocess import Popen, run, PIPE, CalledProcessError
-from re import findall
+from copy import deepcopy
+from io import StringIO
+from re import compile as re_compile, findall
+from subprocess import Popen, run, PIPE, DEVNULL
 import json
 from threading import Thread, Lock
+from stressmon.hwsensors import HWSensorBase
+from stressmon.pciids import lookup_pci_name
+from stressmon.stats import Stats
 
-class IntelGPUTop:
-    def __init__(self):
-        self.lock = Lock()
-        self.count = 0
-        command = r'lspci -vvnn | grep -A 2 "\[0300\]" | grep -A 2 Intel'
-        intel_gpu_data = run([command], shell=True, check=True, stdout=PIPE, stderr=PIPE)
-        intel_gpu_data = intel_gpu_data.stdout
-        intel_gpu_data = intel_gpu_data.decode('utf-8').split("\n--\n")
-        self.count = len(intel_gpu_data)
-        pattern = r"\[(\w{4}:\w{4})\]"
-        intel_devs = []
-        intel_subvens = []
-        for intel_gpu in intel_gpu_data:
-            vendev, subvendev = findall(pattern=pattern, string=intel_gpu)
-            intel_devs.append(vendev.split(":")[1])
-            intel_subvens.append(subvendev.split(":")[0])
-        command = "sudo intel_gpu_top -L | grep 8086 | awk '{print $3}'"
-        intel_pci_strs = run([command], shell=True, check=True, stdout=PIPE, stderr=PIPE)
-        intel_pci_strs = intel_pci_strs.stdout.decode('utf-8').split("\n")
-        intel_pci_strs = [x for x in intel_pci_strs if x]
-        self.data = {}
-        for i in range(self.count):
-            name = f"Device_{str(intel_devs[i])}-{i}"
-            command = f"cat inteldevids | grep -i \"{intel_devs[i]},\""
-            try:
-                output = run([command],
-                             shell=True,
-                             check=True,
-                             stdout=PIPE,
-                             stderr=PIPE).stdout.decode('utf-8')
-                output = output.replace("\n", "")
-                name = f"{output[5:]}-{i}"
-            except CalledProcessError:
-                pass
-
-            subven = str(intel_subvens[i])
-            command = f"cat venids | grep -i \"{subven},\""
-            try:
-                output = run([command],
-                             shell=True,
-                             check=True,
-                             stdout=PIPE,
-                             stderr=PIPE).stdout.decode('utf-8')
-                subven = output[5:]
-            except CalledProcessError:
-                pass
-            self.data[name] = {}
+INTEL_GPU_DATA = ['freq_actual', 'freq_requested', 'rc6', 'power_gpu', 'power_package',
+                  'interrupts', 'render_busy', 'blitter_busy', 'video_busy',
+                  'videoenhance_busy', 'compute_busy']
+
+ENGINE_CLASSES = {'Render/3D': 'render_busy', 'Blitter': 'blitter_busy',
+                  'Video': 'video_busy', 'VideoEnhance': 'videoenhance_busy',
+                  'Compute': 'compute_busy'}
+
+
+def flatten_sample(sample: dict) -> dict:
+    """Flatten an intel_gpu_top sample into INTEL_GPU_DATA values
+
+    Engine instances of the same class (e.g. Video/0 and Video/1) are reduced to the
+    busiest one.
+
+    Args:
+        sample (dict): decoded intel_gpu_top sample
+
+    Returns:
+        dict: INTEL_GPU_DATA values, None where the sample has no data
+    """
+    values = dict.fromkeys(INTEL_GPU_DATA)
+    values['freq_actual'] = sample.get('frequency', {}).get('actual')
+    values['freq_requested'] = sample.get('frequency', {}).get('requested')
+    values['rc6'] = sample.get('rc6', {}).get('value')
+    values['power_gpu'] = sample.get('power', {}).get('GPU')
+    values['power_package'] = sample.get('power', {}).get('Package')
+    values['interrupts'] = sample.get('interrupts', {}).get('count')
+    for engine, engine_data in sample.get('engines', {}).items():
+        engine_class = engine.rstrip('0123456789').rstrip('/')
+        data = ENGINE_CLASSES.get(engine_class)
+        busy = engine_data.get('busy')
+        if data is None or busy is None:
+            continue
+        if values[data] is None or busy > values[data]:
+            values[data] = busy
+    return values
+
+
+class JSONStreamDecoder:
+    """Incremental decoder for the JSON array written by intel_gpu_top -J
+
+    intel_gpu_top writes one pretty printed object per period inside a never ending
+    array. New text is scanned once for braces, quotes and backslashes, so braces in
+    strings are not counted, and the text of the sample being received is collected
+    in a reusable buffer. Once the top level object is closed it is decoded, so each
+    sample is parsed exactly once however the stream is chunked.
+    """
+
+    tokens = re_compile(r'[{}"\\]')
+
+    def __init__(self) -> None:
+        self.buffer = StringIO()
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> list:
+        """Add text from the stream
+
+        Args:
+            text (str): next chunk of intel_gpu_top output
 
+        Returns:
+            list: samples completed by this chunk
+        """
+        samples = []
+        start = 0
+        position = 0
+        if self.escaped and text:
+            self.escaped = False
+            position = 1
+        token = self.tokens.search(text, position)
+        while token is not None:
+            char = token.group()
+            position = token.end()
+            if self.in_string:
+                if char == '\\':
+                    self.escaped = position == len(text)
+                    position += 1
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                if self.depth == 0:
+                    start = token.start()
+                self.depth += 1
+            elif self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.buffer.write(text[start:position])
+                    try:
+                        samples.append(json.loads(self.buffer.getvalue()))
+                    except json.JSONDecodeError:
+                        pass
+                    self.buffer.seek(0)
+                    self.buffer.truncate()
+            token = self.tokens.search(text, position)
+        if self.depth > 0:
+            self.buffer.write(text[start:])
+        return samples
+
+    def reset(self) -> None:
+        """Drop any pending text
+        """
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+
+class IntelGPUTop(HWSensorBase):
+    """Intel GPU sensor fed by one intel_gpu_top JSON stream per device
+    """
+
+    headings = ['Data', 'Current', 'Min', 'Max', 'Mean']
+    command = ['sudo', 'intel_gpu_top']
+
+    def __init__(self, period_ms: int = 1000, devices: dict | None = None,
+                 start: bool = True) -> None:
+        """
+        Args:
+            period_ms (int, optional): intel_gpu_top sampling period. Defaults to 1000.
+            devices (dict | None, optional): intel_gpu_top -d filters keyed by gpu name.
+                Defaults to the devices listed by intel_gpu_top -L.
+            start (bool, optional): start an intel_gpu_top stream per device.
+                Defaults to True.
+        """
+        self.lock = Lock()
+        self.period_ms = period_ms
+        self.name_iter = None
+        self.current_name = None
+        self.data_iter = None
+        self.data = INTEL_GPU_DATA
+        if devices is None:
+            devices = self.list_devices()
+        self.devices = devices
+        self.count = len(self.devices)
+        self.samples = {name: {} for name in self.devices}
+        self.gpus = {name: dict.fromkeys(self.data) for name in self.devices}
+        self.index = {}
+        for name in self.devices:
+            for data in self.data:
+                self.index[(name, data)] = len(self.index)
+        self.stats = Stats(len(self.index))
         self.running = True
+        self.processes = {}
         self.threads = []
-        for pci_str in intel_pci_strs:
-            self.threads.append(Thread(target=self.monitor, args=(pci_str,name)))
-        for thread in self.threads:
+        if start:
+            self.start_monitoring()
+
+    def list_devices(self) -> dict:
+        """List Intel GPUs known to intel_gpu_top
+
+        Returns:
+            dict: intel_gpu_top -d device filters keyed by gpu name
+        """
+        command = self.command + ['-L']
+        output = run(command, check=True, stdout=PIPE, stderr=PIPE).stdout.decode('utf-8')
+        devices = {}
+        for i, pci_str in enumerate(findall(r"(pci:vendor=8086,device=(\w{4})\S*)", output)):
+            device_filter, device = pci_str
+            name = f"Device_{device}-{i}"
+            device_name = lookup_pci_name('inteldevids', device)
+            if device_name:
+                name = f"{device_name}-{i}"
+            devices[name] = device_filter
+        return devices
+
+    def start_monitoring(self) -> None:
+        """Start one intel_gpu_top stream per device
+        """
+        for name, device in self.devices.items():
+            thread = Thread(target=self.monitor, args=(name, device), daemon=True)
+            self.threads.append(thread)
             thread.start()
 
-    def monitor(self, dev, name):
-        with Popen(['sudo', 'intel_gpu_top', '-J', '-s', '10000', '-d', dev],
-                   stdout=PIPE,
-                   stderr=PIPE,
-                   text=True,
-                   bufsize=1,
-                   universal_newlines=True) as process:
-            sample = ""
-            balance = 0
-            started = False  # This flag will help us ignore data until the first {
-            for line in iter(process.stdout.readline, ''):
-                print(line)
-                if not self.running:
-                    process.terminate()
-                    return
-
-                if '{' in line:
-                    started = True
-
-                if not started:
-                    continue
-
-                sample += line
-                balance += line.count('{') - line.count('}')
-
-                print(balance)
-                if balance == 0:
-                    # Extract samples from the sample string by splitting it at the comma
-                    # followed by an open brace
-                    samples = sample.strip('[]').split('},{')
-                    samples = ['{' + s + '}' for s in samples]
-                    for single_sample in samples:
-                        with open("single_sample", 'a', encoding='utf-8') as file:
-                            file.write(single_sample)
-                        with self.lock:
-                            self.data[name] = json.loads(single_sample)
-                    sample = ""
-                    started = False
-            error_output = process.stderr.read()
-            if error_output:
-                print("Error:", error_output)
-
-    def get_gpu_names(self):
-        return list(self.data.keys())
-
-    def print_data(self):
-        print(self.data)
+    def monitor(self, name: str, device: str) -> None:
+        """Run intel_gpu_top for device and consume its output
+        """
+        command = self.command + ['-J', '-s', str(self.period_ms), '-d', device]
+        with Popen(command, stdout=PIPE, stderr=DEVNULL, text=True, bufsize=1) as process:
+            # stop_monitoring() either finds the process or has already stopped
+            with self.lock:
+                self.processes[name] = process
+                running = self.running
+            if running:
+                self.consume(name, process.stdout)
+            process.terminate()
+
+    def consume(self, name: str, stream) -> None:
+        """Decode intel_gpu_top output from stream into the samples of gpu name
+
+        Args:
+            name (str): gpu name
+            stream: text stream such as intel_gpu_top stdout or a recorded output file
+        """
+        decoder = JSONStreamDecoder()
+        for line in iter(stream.readline, ''):
+            if not self.running:
+                return
+            samples = decoder.feed(line)
+            if samples:
+                with self.lock:
+                    self.samples[name] = samples[-1]
+
+    def __iter__(self):
+        self.name_iter = iter(self.devices)
+        self._next_name()
+        return self
+
+    def _next_name(self):
+        self.current_name = next(self.name_iter, None)
+        if self.current_name:
+            self.data_iter = iter(self.data)
+
+    def __next__(self) -> list:
+        while self.current_name:
+            for data in self.data_iter:
+                return [self.current_name, data]
+            self._next_name()
+        raise StopIteration
+
+    def update(self) -> None:
+        """Update Intel GPU data from the latest samples
+        """
+        with self.lock:
+            samples = dict(self.samples)
+        for name, sample in samples.items():
+            self.gpus[name] = flatten_sample(sample)
+        self.stats.update([self.gpus[name][data] for name, data in self.index])
+
+    def get_gpu_names(self) -> list:
+        """Get list of Intel GPU names
+        """
+        return list(self.devices.keys())
+
+    def get_sample(self, name: str) -> dict:
+        """Get the latest raw intel_gpu_top sample for gpu name
+        """
+        with self.lock:
+            return deepcopy(self.samples.get(name, {}))
+
+    def get_label(self, params: list) -> str | None:
+        """Get label for current gpu's current data"""
+        if len(params) != 2:
+            return None
+        return params[1]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 2:
+            return None
+        return f"{params[0]}"
+
+    def get_subsection(self, _) -> str | None:
+        """Get subsection"""
+        return None
+
+    def get_current(self, params: list) -> int | None:
+        """Get current value of data for gpu name
+        """
+        if len(params) != 2:
+            return None
+        ret = self.gpus.get(params[0], {}).get(params[1], None)
+        if ret is None:
+            return ret
+        return round(ret)
+
+    def get_csv_data(self) -> list:
+        """get a list of current Intel GPU data for csv log, None where there is no data
+        """
+        values = [self.gpus[name][data] for name, data in self.index]
+        return [None if value is None else round(value, 4) for value in values]
+
+    def get_csv_headings(self) -> list:
+        """Get the CSV headings for Intel GPU data
+        """
+        return [f"{name} {data}" for name, data in self.index]
 
     # Period methods
     def get_period_duration(self, name):
-        with self.lock:
-            ret = self.data[name].get('period', {})
-            return ret.get('duration', None)
+        return self.get_sample(name).get('period', {}).get('duration', None)
 
     def get_period_unit(self, name):
-        with self.lock:
-            ret = self.data[name].get('period', {})
-            return ret.get('unit', None)
+        return self.get_sample(name).get('period', {}).get('unit', None)
 
     # Frequency methods
     def get_frequency_requested(self, name):
-        with self.lock:
-            ret = self.data[name].get('frequency', {})
-            return ret.get('requested', None)
+        return self.get_sample(name).get('frequency', {}).get('requested', None)
 
     def get_frequency_actual(self, name):
-        with self.lock:
-            return self.data[name]['frequency']['actual']
+        return self.get_sample(name).get('frequency', {}).get('actual', None)
 
     def get_frequency_unit(self, name):
-        with self.lock:
-            return self.data[name]['frequency']['unit']
+        return self.get_sample(name).get('frequency', {}).get('unit', None)
 
     # Interrupts methods
     def get_interrupts_count(self, name):
-        with self.lock:
-            return self.data[name]['interrupts']['count']
+        return self.get_sample(name).get('interrupts', {}).get('count', None)
 
     def get_interrupts_unit(self, name):
-        with self.lock:
-            return self.data[name]['interrupts']['unit']
+        return self.get_sample(name).get('interrupts', {}).get('unit', None)
 
     # rc6 methods
     def get_rc6_value(self, name):
-        with self.lock:
-            return self.data[name]['rc6']['value']
+        return self.get_sample(name).get('rc6', {}).get('value', None)
 
     def get_rc6_unit(self, name):
-        with self.lock:
-            return self.data[name]['rc6']['unit']
+        return self.get_sample(name).get('rc6', {}).get('unit', None)
 
     # Power methods
     def get_power_GPU(self, name):
-        with self.lock:
-            return self.data[name]['power']['GPU']
+        return self.get_sample(name).get('power', {}).get('GPU', None)
 
     def get_power_package(self, name):
-        with self.lock:
-            return self.data[name]['power']['Package']
+        return self.get_sample(name).get('power', {}).get('Package', None)
 
     def get_power_unit(self, name):
-        with self.lock:
-            return self.data[name]['power']['unit']
+        return self.get_sample(name).get('power', {}).get('unit', None)
 
     # Engines methods
     def get_engine_data(self, name, engine_name):
-        with self.lock:
-            return self.data[name]['engines'].get(engine_name, {})
+        return self.get_sample(name).get('engines', {}).get(engine_name, {})
 
     def stop_monitoring(self):
-        self.running = False
+        """Stop all intel_gpu_top streams
+        """
+        with self.lock:
+            self.running = False
+            processes = list(self.processes.values())
+            self.processes = {}
+        for process in processes:
+            process.terminate()
         for thread in self.threads:
             thread.join()
+        self.threads = []
+
+    def is_empty(self) -> bool:
+        """Is there an Intel GPU?
+        """
+        return not self.devices
 
     def __del__(self):
-        self.stop_monitoring()
+        if hasattr(self, 'threads'):
+            self.stop_monitoring()
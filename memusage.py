@@ -1,63 +1,65 @@
 """MemUsage module
 """
 
-from copy import deepcopy
-from subprocess import run, PIPE
-from psutil import virtual_memory, swap_memory
+from stressmon.dimminfo import DIMMInfo
 from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.sysfs import SysfsFile
+
+MEM_LABELS = [('Mem', 'Total'), ('Mem', 'Available'), ('Mem', 'Used'), ('Mem', 'Percent'),
+              ('Mem', 'Cached'), ('Mem', 'Dirty'), ('Mem', 'Writeback'),
+              ('Mem', 'AnonHugePages'), ('Mem', 'HugePages_Free'), ('Mem', 'Slab'),
+              ('Mem', 'Committed_AS'),
+              ('Swap', 'Total'), ('Swap', 'Free'), ('Swap', 'Used'), ('Swap', 'Percent')]
+
+# /proc/meminfo fields parsed each update, in the order of their slots in the raw list
+MEMINFO_FIELDS = [b'MemTotal', b'MemFree', b'MemAvailable', b'Buffers', b'Cached',
+                  b'SReclaimable', b'Dirty', b'Writeback', b'AnonHugePages',
+                  b'HugePages_Free', b'Slab', b'Committed_AS', b'SwapTotal', b'SwapFree']
+
 
 class MemUsage(HWSensorBase):
     """MemUsage class
+
+    Memory data is parsed from a single read of /proc/meminfo per update into fixed
+    slots, so adding fields doesn't add reads or dict rebuilds.
     """
 
     headings = ['Memory', 'Current', 'Min', 'Max', 'Mean']
 
-    def __init__(self):
-        self.mem_iter = None
-        self.current_mem = None
-        self.data_iter = None
-        self.iteration = 1
-        self.mem = {'Mem': {'Total': 0, 'Available': 0, 'Used': 0, 'Percent': 0.0},
-                    'Swap': {'Total': 0, 'Free': 0, 'Used': 0, 'Percent': 0.0}}
-        self.mmm = dict.fromkeys(['min', 'max', 'mean'])
-        self.mmm['min'] = deepcopy(self.mem)
-        self.mmm['max'] = deepcopy(self.mem)
-        self.mmm['mean'] = deepcopy(self.mem)
-        for mem in self.mmm['min']:
-            for data in self.mmm['min'][mem]:
-                self.mmm['min'][mem][data] = 999999999999
-        command = "dmidecode --type 17 | grep 'Part Number' | awk '{ print $3 }'"
-        result = run([command],
-                     shell=True,
-                     check=True,
-                     stdout=PIPE,
-                     stderr=PIPE).stdout.decode("utf-8").split("\n")
-        self.mem_skus = [x for x in result if x and x != 'Not' and x != 'Unknown']
+    def __init__(self, meminfo: str = '/proc/meminfo'):
+        self._iter = None
+        self.labels = MEM_LABELS
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.fields = {field: i for i, field in enumerate(MEMINFO_FIELDS)}
+        self.raw = [0] * len(MEMINFO_FIELDS)
+        self.values = [0] * len(self.labels)
+        self.stats = Stats(len(self.labels))
+        self.meminfo = SysfsFile(meminfo)
+        self.dimminfo = DIMMInfo()
 
     def __iter__(self):
-        # Create an iterator for the memory data
-        self.mem_iter = iter(self.mem.items())
-        # Initialize the current memory item and an iterator for its keys (data)
-        self.current_mem = next(self.mem_iter, None)
-        self.data_iter = iter(self.current_mem[1]) if self.current_mem else iter([])
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
         return self
 
-    def __next__(self):
-        while self.current_mem:
-            for data_item in self.data_iter:
-                return [self.current_mem[0], data_item]
+    def __next__(self) -> list:
+        return list(next(self._iter))
 
-            # If we've exhausted data for the current memory item, move to the next one
-            self.current_mem = next(self.mem_iter, None)
-            self.data_iter = iter(self.current_mem[1]) if self.current_mem else iter([])
+    def get_mem_skus(self) -> list | None:
+        """Get part numbers of the installed DIMMs
 
-        # If we've exhausted all memory items, raise StopIteration
-        raise StopIteration
-    
-    def get_mem_skus(self) -> str | None:
-        if not self.mem_skus:
+        The DIMM inventory is loaded on the first call and cached.
+        """
+        mem_skus = self.dimminfo.get_part_numbers()
+        if not mem_skus:
             return None
-        return self.mem_skus
+        return mem_skus
+
+    def get_dimms(self) -> list:
+        """Get size, speed, slot locator, rank and part number of the installed DIMMs
+        """
+        return self.dimminfo.get_dimms()
 
     def get_label(self, params: list) -> str | None:
         """Get label"""
@@ -68,31 +70,31 @@ class MemUsage(HWSensorBase):
     def update(self) -> None:
         """Update mem data
         """
-        mem = virtual_memory()
-        swap = swap_memory()
-        self.mem = {'Mem':
-                    {'Total': mem.total,
-                     'Available': mem.available,
-                     'Used': mem.used,
-                     'Percent': mem.percent},
-                    'Swap':
-                    {'Total': swap.total,
-                     'Free': swap.free,
-                     'Used': swap.used,
-                     'Percent': swap.percent}}
-        for mem in self.mmm['min'].keys():
-            for data in self.mmm['min'][mem].keys():
-                self.mmm['min'][mem][data] = min(
-                    self.mmm['min'][mem][data], self.mem[mem][data])
-                self.mmm['max'][mem][data] = max(
-                    self.mmm['max'][mem][data], self.mem[mem][data])
-                self.mmm['mean'][mem][data] = self.mmm['mean'][mem][data] + \
-                    (self.mem[mem][data] - self.mmm['mean'][mem][data]) / self.iteration
-        self.iteration += 1
-
-    def get_headings(self) -> list:
-        """Get list of headings"""
-        return self.headings
+        raw = self.raw
+        fields = self.fields
+        for line in self.meminfo.read().splitlines():
+            field, _, value = line.partition(b':')
+            slot = fields.get(field)
+            if slot is not None:
+                raw[slot] = int(value.split()[0])
+        (mem_total, mem_free, mem_available, buffers, cached, reclaimable, dirty, writeback,
+         anon_huge, huge_free, slab, committed, swap_total, swap_free) = raw
+        cached += reclaimable
+        mem_used = mem_total - mem_free - cached - buffers
+        if mem_used < 0:
+            mem_used = mem_total - mem_free
+        mem_percent = 0.0
+        if mem_total:
+            mem_percent = round((mem_total - mem_available) / mem_total * 100, 1)
+        swap_used = swap_total - swap_free
+        swap_percent = 0.0
+        if swap_total:
+            swap_percent = round(swap_used / swap_total * 100, 1)
+        self.values = [mem_total * 1024, mem_available * 1024, mem_used * 1024, mem_percent,
+                       cached * 1024, dirty * 1024, writeback * 1024, anon_huge * 1024,
+                       huge_free, slab * 1024, committed * 1024,
+                       swap_total * 1024, swap_free * 1024, swap_used * 1024, swap_percent]
+        self.stats.update(self.values)
 
     def get_section(self, _) -> str | None:
         """Get section"""
@@ -102,58 +104,6 @@ class MemUsage(HWSensorBase):
         """Get section"""
         return None
 
-    def get_current(self, params: list) -> int | None:
-        """Get current memory data for index
-        """
-        if len(params) != 2:
-            return None
-        return round(self.mem[params[0]][params[1]])
-
-    def get_min(self, params: list) -> int | None:
-        """get minimum memory data for index
-        """
-        if len(params) != 2:
-            return None
-        return round(self.mmm['min'][params[0]][params[1]])
-
-    def get_max(self, params: list) -> int | None:
-        """get maximum memory data for index
-        """
-        if len(params) != 2:
-            return None
-        return round(self.mmm['max'][params[0]][params[1]])
-
-    def get_mean(self, params: list) -> int | None:
-        """get mean memory data for index rounded to nearest integer
-        """
-        if len(params) != 2:
-            return None
-        return round(self.mmm['mean'][params[0]][params[1]])
-
-    def get_csv_data(self) -> list:
-        """Return list of current mem data
-
-        Returns:
-            list: list of current mem data
-        """
-        ret = []
-        for mem in list(self.mem.keys()):
-            for data in list(self.mem[mem].keys()):
-                ret.append(self.mem[mem][data])
-        return ret
-
-    def get_csv_headings(self) -> list:
-        """Generate Headings list for CSV file of current values
-
-        Returns:
-            list: List of CSV heading names
-        """
-        headings = []
-        for mem in list(self.mem.keys()):
-            for data in list(self.mem[mem].keys()):
-                headings.append(f"{mem} {data}")
-        return headings
-
     # def get_win_lines(self) -> int:
     #    """return number of lines needed for this data's curses window
     #    """
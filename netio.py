@@ -0,0 +1,169 @@
+"""Network throughput sensor
+"""
+
+from fnmatch import fnmatch
+from os import listdir
+from os.path import join
+from time import monotonic_ns
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.sysfs import SysfsFile, read_sysfs
+
+NETIO_DATA = ['RX(MB/s)', 'TX(MB/s)', 'RX(pkt/s)', 'TX(pkt/s)', 'RX Drops', 'TX Drops',
+              'RX Errors', 'TX Errors', 'RX Util(%)', 'TX Util(%)']
+# /proc/net/dev columns after the interface name used for each counter
+NETDEV_COLUMNS = [0, 8, 1, 9, 3, 11, 2, 10]
+
+
+def link_speed(interface: str, net_root: str = '/sys/class/net') -> int | None:
+    """Get the link speed of an interface
+
+    Args:
+        interface (str): interface name
+        net_root (str, optional): net class directory. Defaults to '/sys/class/net'.
+
+    Returns:
+        int | None: link speed in Mb/s or None if unknown or the link is down
+    """
+    speed = read_sysfs(join(net_root, interface, 'speed'))
+    try:
+        speed = int(speed)
+    except (TypeError, ValueError):
+        return None
+    if speed <= 0:
+        return None
+    return speed
+
+
+class NetIO(HWSensorBase):
+    """Per-interface network throughput, packet, drop and error rates
+
+    /proc/net/dev is read once per tick and parsed into preallocated counter lists.
+    Link speeds are read from sysfs at setup so link utilization can be reported.
+    """
+
+    headings = ['Data', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, include: list | None = None, exclude: list | None = None,
+                 netdev: str = '/proc/net/dev', net_root: str = '/sys/class/net') -> None:
+        """
+        Args:
+            include (list | None, optional): fnmatch patterns of interfaces to track.
+                Defaults to every interface.
+            exclude (list | None, optional): fnmatch patterns of interfaces to skip.
+                Defaults to ['lo'].
+            netdev (str, optional): net/dev file. Defaults to '/proc/net/dev'.
+            net_root (str, optional): net class directory. Defaults to '/sys/class/net'.
+        """
+        self._iter = None
+        if include is None:
+            include = ['*']
+        if exclude is None:
+            exclude = ['lo']
+        self.interfaces = [interface for interface in sorted(listdir(net_root))
+                           if any(fnmatch(interface, pattern) for pattern in include)
+                           and not any(fnmatch(interface, pattern) for pattern in exclude)]
+        self.slots = {interface.encode(): i for i, interface in enumerate(self.interfaces)}
+        self.speeds = [link_speed(interface, net_root) for interface in self.interfaces]
+        self.labels = [[interface, data] for interface in self.interfaces for data in NETIO_DATA]
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.netdev = SysfsFile(netdev)
+        self.counters = [None] * len(self.interfaces)
+        self.time = monotonic_ns()
+        self.values = [None] * len(self.labels)
+        self.stats = Stats(len(self.labels))
+        self.read_counters()
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def read_counters(self) -> list:
+        """Read /proc/net/dev
+
+        Returns:
+            list: previous counters of every tracked interface
+        """
+        previous = self.counters
+        self.counters = [None] * len(self.interfaces)
+        self.time = monotonic_ns()
+        slots = self.slots
+        for line in self.netdev.read().splitlines()[2:]:
+            interface, _, columns = line.partition(b':')
+            slot = slots.get(interface.strip())
+            if slot is not None:
+                columns = columns.split()
+                self.counters[slot] = [int(columns[column]) for column in NETDEV_COLUMNS]
+        return previous
+
+    def update(self) -> None:
+        """Update network rates
+        """
+        start_time = self.time
+        previous = self.read_counters()
+        seconds = (self.time - start_time) / 1000000000
+        values = self.values
+        for slot, counters in enumerate(self.counters):
+            start = previous[slot]
+            base = slot * len(NETIO_DATA)
+            if counters is None or start is None or seconds <= 0:
+                values[base:base + len(NETIO_DATA)] = [None] * len(NETIO_DATA)
+                continue
+            (rx_bytes, tx_bytes, rx_packets, tx_packets, rx_drops, tx_drops,
+             rx_errors, tx_errors) = [end - begin for end, begin in zip(counters, start)]
+            values[base] = rx_bytes / 1000000 / seconds
+            values[base + 1] = tx_bytes / 1000000 / seconds
+            values[base + 2] = rx_packets / seconds
+            values[base + 3] = tx_packets / seconds
+            values[base + 4] = rx_drops
+            values[base + 5] = tx_drops
+            values[base + 6] = rx_errors
+            values[base + 7] = tx_errors
+            speed = self.speeds[slot]
+            if speed is None:
+                values[base + 8] = None
+                values[base + 9] = None
+            else:
+                values[base + 8] = rx_bytes * 8 / 1000000 / seconds / speed * 100
+                values[base + 9] = tx_bytes * 8 / 1000000 / seconds / speed * 100
+        self.stats.update(values)
+
+    def get_interfaces(self) -> list:
+        """get list of tracked interfaces
+        """
+        return list(self.interfaces)
+
+    def get_link_speed(self, interface: str) -> int | None:
+        """get link speed in Mb/s of interface
+        """
+        if interface not in self.interfaces:
+            return None
+        return self.speeds[self.interfaces.index(interface)]
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) != 2:
+            return None
+        return params[1]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 2:
+            return None
+        speed = self.get_link_speed(params[0])
+        if speed is None:
+            return params[0]
+        return f"{params[0]} ({speed} Mb/s)"
+
+    def get_subsection(self, _) -> str | None:
+        """Get subsection"""
+        return None
+
+    def is_empty(self) -> bool:
+        """Are there interfaces?
+        """
+        return not self.interfaces
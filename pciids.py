@@ -0,0 +1,57 @@
+"""PCI id helpers for GPU discovery
+"""
+
+from re import findall
+from subprocess import run, PIPE, CalledProcessError
+
+
+def get_pci_ids(vendor: str) -> list:
+    """Get PCI ids of the display controllers made by vendor
+
+    Args:
+        vendor (str): vendor name as printed by lspci
+
+    Returns:
+        list: list of (device id, subsystem vendor id) tuples
+    """
+    command = rf'lspci -vvnn | grep -A 3 "\[0300\]" | grep -A 3 {vendor}'
+    try:
+        output = run([command], shell=True, check=True, stdout=PIPE, stderr=PIPE)
+    except CalledProcessError:
+        return []
+    pci_ids = []
+    pattern = r"\[(\w{4}:\w{4})\]"
+    for gpu in output.stdout.decode('utf-8').split("\n--\n"):
+        result = findall(pattern=pattern, string=gpu)
+        if not result:
+            continue
+        subven = None
+        if len(result) > 1:
+            subven = result[1].split(":")[0]
+        pci_ids.append((result[0].split(":")[1], subven))
+    return pci_ids
+
+
+def lookup_pci_name(table: str, pci_id: str | None) -> str | None:
+    """Look up the name of a PCI id in one of the id tables
+
+    Args:
+        table (str): id table file, e.g. venids or amddevids
+        pci_id (str | None): PCI id to look up
+
+    Returns:
+        str | None: name for the id or None if not found
+    """
+    if not pci_id:
+        return None
+    command = f"cat {table} | grep -i \"{pci_id},\""
+    try:
+        output = run([command],
+                     shell=True,
+                     check=True,
+                     stdout=PIPE,
+                     stderr=PIPE).stdout.decode('utf-8')
+    except CalledProcessError:
+        return None
+    output = output.replace("\n", "")
+    return output[5:] or None
@@ -0,0 +1,118 @@
+"""Pressure stall information (PSI) sensor
+"""
+
+from os.path import join
+from stressmon.cgroups import cgroup_path
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.sysfs import open_sysfs
+
+PSI_RESOURCES = ['cpu', 'memory', 'io']
+PSI_DATA = ['some avg10', 'some stall(ms)', 'full avg10', 'full stall(ms)']
+
+
+class Pressure(HWSensorBase):
+    """CPU, memory and I/O pressure from /proc/pressure and cgroup pressure files
+
+    Each tick reports the kernel's some/full avg10 percentages and the stall time
+    accumulated since the previous tick, from one pread per pressure file.
+    """
+
+    headings = ['Pressure', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, cgroup: str | None = None,
+                 pressure_root: str = '/proc/pressure') -> None:
+        """
+        Args:
+            cgroup (str | None, optional): cgroup v2 path, absolute or relative to
+                /sys/fs/cgroup, to also report pressure for. Defaults to None.
+            pressure_root (str, optional): system pressure directory.
+                Defaults to '/proc/pressure'.
+        """
+        self._iter = None
+        self.files = []
+        self.labels = []
+        sources = [('System', join(pressure_root, '{}'))]
+        if cgroup is not None:
+            sources.append((cgroup, join(cgroup_path(cgroup), '{}.pressure')))
+        for source, path in sources:
+            for resource in PSI_RESOURCES:
+                pressure_file = open_sysfs(path.format(resource))
+                if pressure_file is None:
+                    continue
+                self.files.append(pressure_file)
+                self.labels += [[source, resource, data] for data in PSI_DATA]
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.totals = [total for reading in self.read_totals() for total in reading[1::2]]
+        self.values = [None] * len(self.labels)
+        self.stats = Stats(len(self.labels))
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def read_totals(self) -> list:
+        """Read every pressure file
+
+        Returns:
+            list: [some avg10, some total, full avg10, full total] per file, None where
+                the kernel doesn't report full pressure
+        """
+        readings = []
+        for pressure_file in self.files:
+            fields = pressure_file.read().split()
+            some_avg10 = float(fields[1][6:])
+            some_total = int(fields[4][6:])
+            full_avg10 = None
+            full_total = None
+            if len(fields) > 9:
+                full_avg10 = float(fields[6][6:])
+                full_total = int(fields[9][6:])
+            readings.append([some_avg10, some_total, full_avg10, full_total])
+        return readings
+
+    def update(self) -> None:
+        """Update pressure data
+        """
+        readings = self.read_totals()
+        values = self.values
+        totals = self.totals
+        for i, (some_avg10, some_total, full_avg10, full_total) in enumerate(readings):
+            slot = i * 4
+            values[slot] = some_avg10
+            values[slot + 2] = full_avg10
+            for j, total in ((0, some_total), (1, full_total)):
+                previous = totals[i * 2 + j]
+                totals[i * 2 + j] = total
+                if previous is None or total is None:
+                    values[slot + 1 + j * 2] = None
+                else:
+                    values[slot + 1 + j * 2] = (total - previous) / 1000
+        self.stats.update(values)
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) != 3:
+            return None
+        return params[2]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 3:
+            return None
+        return f"{params[0]} Pressure"
+
+    def get_subsection(self, params: list) -> str | None:
+        """Get subsection"""
+        if len(params) != 3:
+            return None
+        return params[1]
+
+    def is_empty(self) -> bool:
+        """Is PSI available?
+        """
+        return not self.files
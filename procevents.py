@@ -0,0 +1,109 @@
+"""Linux proc connector process events
+"""
+
+from errno import ENOBUFS
+from os import geteuid
+from socket import socket, AF_NETLINK, SOCK_DGRAM, SOL_SOCKET, SO_RCVBUF
+from struct import Struct
+from time import monotonic_ns
+
+NETLINK_CONNECTOR = 11
+NLMSG_DONE = 3
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+# not a kernel event, reported when the receive buffer overflowed
+PROC_EVENT_LOST = -1
+
+NLMSG_HEADER = Struct('=IHHII')
+CN_MSG = Struct('=IIIIHH')
+PROC_EVENT = Struct('=IIQ')
+PROC_EVENT_IDS = Struct('=IIII')
+PROC_EVENT_OFFSET = NLMSG_HEADER.size + CN_MSG.size
+
+
+def parse_proc_event(data: bytes) -> tuple | None:
+    """Parse a proc connector message
+
+    Args:
+        data (bytes): netlink message
+
+    Returns:
+        tuple | None: (event, CLOCK_MONOTONIC timestamp in ns, pid, tgid, parent tgid)
+            for fork, exec and exit events, None for anything else. The parent tgid is
+            only set for fork events, whose pid and tgid are the child's.
+    """
+    if len(data) < PROC_EVENT_OFFSET + PROC_EVENT.size + PROC_EVENT_IDS.size:
+        return None
+    what, _, timestamp = PROC_EVENT.unpack_from(data, PROC_EVENT_OFFSET)
+    ids = PROC_EVENT_IDS.unpack_from(data, PROC_EVENT_OFFSET + PROC_EVENT.size)
+    if what == PROC_EVENT_FORK:
+        return what, timestamp, ids[2], ids[3], ids[1]
+    if what in (PROC_EVENT_EXEC, PROC_EVENT_EXIT):
+        return what, timestamp, ids[0], ids[1], None
+    return None
+
+
+class ProcConnector:
+    """Subscription to the kernel's process fork, exec and exit events
+
+    Subscribing needs CAP_NET_ADMIN, without it the kernel silently sends nothing,
+    so non-root users get a PermissionError up front.
+    """
+
+    def __init__(self) -> None:
+        if geteuid() != 0:
+            raise PermissionError('the proc connector needs root')
+        self.sock = socket(AF_NETLINK, SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            # fork storms of thousands of workers overflow the default buffer
+            self.sock.setsockopt(SOL_SOCKET, SO_RCVBUF, 4194304)
+            self.sock.bind((0, CN_IDX_PROC))
+            self._send(PROC_CN_MCAST_LISTEN)
+        except OSError:
+            self.sock.close()
+            raise
+
+    def __del__(self) -> None:
+        self.close()
+
+    def _send(self, operation: int) -> None:
+        payload = operation.to_bytes(4, 'little')
+        message = CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        header = NLMSG_HEADER.pack(NLMSG_HEADER.size + len(message), NLMSG_DONE, 0, 0,
+                                   self.sock.getsockname()[0])
+        self.sock.send(header + message)
+
+    def read(self, wait: float = 1.0) -> tuple | None:
+        """Wait for the next process event
+
+        Args:
+            wait (float, optional): seconds to wait. Defaults to 1.0.
+
+        Returns:
+            tuple | None: parsed event, see parse_proc_event(), or None on timeout.
+                When the receive buffer overflowed and events were dropped, the event
+                is PROC_EVENT_LOST with only the timestamp set.
+        """
+        self.sock.settimeout(wait)
+        try:
+            return parse_proc_event(self.sock.recv(4096))
+        except OSError as error:
+            if error.errno == ENOBUFS:
+                return PROC_EVENT_LOST, monotonic_ns(), None, None, None
+            return None
+
+    def close(self) -> None:
+        """Unsubscribe and close the socket
+        """
+        if getattr(self, 'sock', None) is not None:
+            try:
+                self._send(PROC_CN_MCAST_IGNORE)
+            except OSError:
+                pass
+            self.sock.close()
+            self.sock = None
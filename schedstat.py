@@ -0,0 +1,125 @@
+"""Interrupt and scheduler activity sensor
+"""
+
+from time import monotonic_ns
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.sysfs import SysfsFile
+
+# /proc/stat counters reported as rates and gauges reported as they are
+STAT_RATES = [(b'ctxt', 'Context Switches/s'), (b'intr', 'Interrupts/s'),
+              (b'processes', 'Forks/s')]
+STAT_GAUGES = [(b'procs_running', 'Running'), (b'procs_blocked', 'Blocked')]
+
+
+class SchedStat(HWSensorBase):
+    """Context switch, interrupt, fork and softirq rates and runnable/blocked tasks
+
+    System wide counters come from the sensor's own /proc/stat read, so its rates
+    never depend on the order the update pool runs sensors in. Softirq rates are
+    reported per softirq type and per CPU from /proc/softirqs.
+    """
+
+    headings = ['Activity', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, proc_stat: str = '/proc/stat',
+                 softirqs: str = '/proc/softirqs') -> None:
+        """
+        Args:
+            proc_stat (str, optional): stat file. Defaults to '/proc/stat'.
+            softirqs (str, optional): softirqs file. Defaults to '/proc/softirqs'.
+        """
+        self._iter = None
+        self.proc_stat = SysfsFile(proc_stat)
+        self.softirqs = SysfsFile(softirqs)
+        header, *rows = self.softirqs.read().splitlines()
+        self.softirq_cpus = [cpu.decode() for cpu in header.split()]
+        self.softirq_types = [row.split(b':')[0].strip().decode() for row in rows]
+        self.labels = [['System', data] for _, data in STAT_RATES + STAT_GAUGES]
+        self.labels += [['Softirqs', f"{softirq}/s"] for softirq in self.softirq_types]
+        self.labels += [['Softirqs', f"{cpu}/s"] for cpu in self.softirq_cpus]
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.values = [None] * len(self.labels)
+        self.stats = Stats(len(self.labels))
+        self.stat_time, self.counters = self.read_stat()
+        self.softirq_time = monotonic_ns()
+        self.softirq_counts = self.read_softirqs()
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def read_stat(self) -> tuple:
+        """Read the /proc/stat counters
+
+        Returns:
+            tuple: (monotonic time in ns, counter values keyed by /proc/stat name)
+        """
+        stat_time, data = monotonic_ns(), self.proc_stat.read()
+        counters = {}
+        for line in data.splitlines():
+            if line.startswith(b'cpu'):
+                continue
+            name, _, values = line.partition(b' ')
+            counters[name] = int(values.split(None, 1)[0])
+        return stat_time, counters
+
+    def read_softirqs(self) -> list:
+        """Read /proc/softirqs
+
+        Returns:
+            list: per-cpu counts of each softirq type
+        """
+        return [[int(count) for count in row.split()[1:]]
+                for row in self.softirqs.read().splitlines()[1:]]
+
+    def update(self) -> None:
+        """Update scheduler and interrupt activity
+        """
+        values = self.values
+        stat_time, counters = self.read_stat()
+        seconds = (stat_time - self.stat_time) / 1000000000
+        for slot, (name, _) in enumerate(STAT_RATES):
+            values[slot] = None
+            if seconds > 0 and name in counters and name in self.counters:
+                values[slot] = (counters[name] - self.counters[name]) / seconds
+        self.stat_time, self.counters = stat_time, counters
+        for slot, (name, _) in enumerate(STAT_GAUGES, len(STAT_RATES)):
+            values[slot] = counters.get(name)
+        softirq_time = monotonic_ns()
+        softirq_counts = self.read_softirqs()
+        seconds = (softirq_time - self.softirq_time) / 1000000000
+        first = len(STAT_RATES) + len(STAT_GAUGES)
+        deltas = [[count - start for count, start in zip(row, start_row)]
+                  for row, start_row in zip(softirq_counts, self.softirq_counts)]
+        for slot, row in enumerate(deltas, first):
+            values[slot] = sum(row) / seconds if seconds > 0 else None
+        for slot, column in enumerate(zip(*deltas), first + len(self.softirq_types)):
+            values[slot] = sum(column) / seconds if seconds > 0 else None
+        self.softirq_time, self.softirq_counts = softirq_time, softirq_counts
+        self.stats.update(values)
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) != 2:
+            return None
+        return params[1]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 2:
+            return None
+        return f"{params[0]} Activity"
+
+    def get_subsection(self, _) -> str | None:
+        """Get subsection"""
+        return None
+
+    def is_empty(self) -> bool:
+        """always returns false
+        """
+        return False
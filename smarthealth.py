@@ -0,0 +1,193 @@
+"""NVMe SMART health sensor
+"""
+
+from logging import getLogger
+from threading import Lock
+from pySMART import Device
+from stressmon.drivetemp import DriveTemp
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.updatepool import PeriodicUpdater
+
+logger = getLogger(__name__)
+
+# pySMART NvmeAttributes names for each health attribute, in order of preference
+NVME_ATTRIBUTES = {
+    'Percentage Used': ['percentageUsed'],
+    'Media Errors': ['integrityErrors', 'mediaAndDataIntegrityErrors'],
+    'Data Units Written': ['dataUnitsWritten'],
+    'Warning Temp Time': ['warningTemperatureTime'],
+    'Critical Temp Time': ['criticalTemperatureTime'],
+    'Thermal 1 Transitions': ['thermalManagementTemperature1TransitionCount',
+                              'thermalTemp1TransitionCount'],
+    'Thermal 2 Transitions': ['thermalManagementTemperature2TransitionCount',
+                              'thermalTemp2TransitionCount'],
+}
+
+
+def read_nvme_attributes(device) -> dict:
+    """Read the health attributes of a pySMART NVMe device
+
+    Args:
+        device: pySMART Device
+
+    Returns:
+        dict: attribute values, None where the device doesn't report one
+    """
+    attributes = getattr(device, 'if_attributes', None)
+    values = {}
+    for attribute, names in NVME_ATTRIBUTES.items():
+        values[attribute] = None
+        for name in names:
+            value = getattr(attributes, name, None)
+            if value is not None:
+                values[attribute] = value
+                break
+    return values
+
+
+class SMARTHealth(HWSensorBase):
+    """NVMe wear and thermal throttling counters
+
+    Drives are taken from DriveTemp's discovery. SMART attributes change slowly and
+    each query runs smartctl, so a background thread refreshes them every
+    refresh_interval seconds and update() only serves the cached values. The CSV
+    data only holds the attributes that changed in the last update, None for the
+    others, and get_changes() reports them.
+    """
+
+    headings = ['Data', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, drivetemp: DriveTemp | None = None,
+                 refresh_interval: float = 300.0) -> None:
+        """
+        Args:
+            drivetemp (DriveTemp | None, optional): drive temperature sensor to take the
+                drives from. Defaults to a new DriveTemp.
+            refresh_interval (float, optional): seconds between SMART refreshes.
+                Defaults to 300.0.
+        """
+        if drivetemp is None:
+            drivetemp = DriveTemp()
+        self.drivetemp = drivetemp
+        self.lock = Lock()
+        self.data = list(NVME_ATTRIBUTES.keys())
+        self.drives = [drive for drive in drivetemp.get_drive_names()
+                       if drive.startswith('nvme')]
+        self.devices = {}
+        self.cache = {drive: dict.fromkeys(self.data) for drive in self.drives}
+        self.health = {drive: dict.fromkeys(self.data) for drive in self.drives}
+        self.changes = {}
+        self.changed = []
+        self.index = {}
+        for drive in self.drives:
+            for data in self.data:
+                self.index[(drive, data)] = len(self.index)
+        self.stats = Stats(len(self.index))
+        self.updater = None
+        if self.drives:
+            self.updater = PeriodicUpdater(self.refresh, refresh_interval, immediate=True)
+            self.updater.start()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the refresh thread
+        """
+        if getattr(self, 'updater', None) is not None:
+            self.updater.stop()
+            self.updater = None
+
+    def __iter__(self):
+        for drive in self.drives:
+            for data in self.data:
+                yield [drive, data]
+
+    def refresh(self) -> None:
+        """Query SMART for every drive and cache the attributes
+
+        A drive whose query fails keeps its previous attributes.
+        """
+        for drive in self.drives:
+            try:
+                device = self.devices.get(drive)
+                if device is None:
+                    device = Device(drive)
+                    self.devices[drive] = device
+                else:
+                    device.update()
+                values = read_nvme_attributes(device)
+            except Exception:
+                logger.exception("SMART query of %s failed", drive)
+                continue
+            with self.lock:
+                self.cache[drive] = values
+
+    def update(self) -> None:
+        """Update health data from the cached SMART attributes
+        """
+        with self.lock:
+            cache = {drive: dict(values) for drive, values in self.cache.items()}
+        self.changes = {}
+        self.changed = []
+        for (drive, data), slot in self.index.items():
+            current = cache[drive][data]
+            if current is not None and current != self.health[drive][data]:
+                self.changes[f"{drive} {data}"] = current
+                self.changed.append(slot)
+        self.health = cache
+        self.stats.update([cache[drive][data] for drive, data in self.index])
+
+    def get_changes(self) -> dict:
+        """Get the attributes that changed in the last update
+
+        Returns:
+            dict: new attribute values keyed by "drive attribute"
+        """
+        return self.changes
+
+    def get_label(self, params: list) -> str | None:
+        """Get label for current attribute"""
+        if len(params) != 2:
+            return None
+        return params[1]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 2:
+            return None
+        return f"{params[0]} - {self.drivetemp.get_model(params[0])}"
+
+    def get_subsection(self, _) -> str | None:
+        """Get subsection"""
+        return None
+
+    def get_current(self, params: list) -> int | None:
+        """Get current value of attribute for drive
+        """
+        if len(params) != 2:
+            return None
+        ret = self.health.get(params[0], {}).get(params[1], None)
+        if ret is None:
+            return ret
+        return round(ret)
+
+    def get_csv_data(self) -> list:
+        """Return list of health attributes that changed in the last update
+        """
+        values = [self.health[drive][data] for drive, data in self.index]
+        data = [None] * len(values)
+        for slot in self.changed:
+            data[slot] = round(values[slot], 4)
+        return data
+
+    def get_csv_headings(self) -> list:
+        """Generate Headings list for CSV file of current values
+        """
+        return [f"{drive} {data}" for drive, data in self.index]
+
+    def is_empty(self) -> bool:
+        """Are there NVMe drives?
+        """
+        return not self.drives
@@ -0,0 +1,385 @@
+"""Running statistics over fixed slots of sensor values
+"""
+
+from bisect import bisect_right
+from collections import deque
+from stressmon.history import History
+from stressmon.steadystate import SteadyState
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+# window name: length in samples, at one sample per second
+DEFAULT_WINDOWS = {'10s': 10, '1m': 60, '5m': 300}
+
+
+class Quantiles:
+    """Streaming quantile estimates of a fixed number of values
+
+    Uses the extended P-square algorithm: every slot keeps 2m + 3 marker heights
+    and positions for m quantiles (9 for p50/p95/p99), adjusted by piecewise
+    parabolic interpolation as samples arrive. Memory is constant and an update
+    is O(markers) per slot, no samples are stored after the first few.
+    """
+
+    def __init__(self, size: int, quantiles: tuple = DEFAULT_QUANTILES) -> None:
+        self.size = size
+        quantiles = sorted(quantiles)
+        self.probabilities = [0.0]
+        previous = 0.0
+        for quantile in quantiles:
+            self.probabilities += [(previous + quantile) / 2, quantile]
+            previous = quantile
+        self.probabilities += [(previous + 1) / 2, 1.0]
+        self.markers = len(self.probabilities)
+        self.heights = [[] for _ in range(size)]
+        self.positions = [None] * size
+        self.counts = [0] * size
+
+    def update(self, values: list) -> None:
+        """Add one sample for every slot
+
+        Args:
+            values (list): one value per slot, None if there is no value
+        """
+        markers = self.markers
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            heights = self.heights[i]
+            self.counts[i] += 1
+            if self.counts[i] <= markers:
+                heights.append(value)
+                if self.counts[i] == markers:
+                    heights.sort()
+                    self.positions[i] = list(range(1, markers + 1))
+                continue
+            self._adjust(heights, self.positions[i], self.counts[i], value)
+
+    def _adjust(self, heights: list, positions: list, count: int, value: float) -> None:
+        last = self.markers - 1
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[last]:
+            heights[last] = value
+            cell = last - 1
+        else:
+            cell = bisect_right(heights, value) - 1
+        for marker in range(cell + 1, self.markers):
+            positions[marker] += 1
+        probabilities = self.probabilities
+        for marker in range(1, last):
+            position = positions[marker]
+            offset = 1 + (count - 1) * probabilities[marker] - position
+            if (offset >= 1 and positions[marker + 1] - position > 1) or \
+                    (offset <= -1 and positions[marker - 1] - position < -1):
+                step = 1 if offset > 0 else -1
+                height = heights[marker]
+                below = position - positions[marker - 1]
+                above = positions[marker + 1] - position
+                parabolic = height + step / (below + above) * (
+                    (below + step) * (heights[marker + 1] - height) / above +
+                    (above - step) * (height - heights[marker - 1]) / below)
+                if heights[marker - 1] < parabolic < heights[marker + 1]:
+                    heights[marker] = parabolic
+                else:
+                    heights[marker] = height + step * (heights[marker + step] - height) \
+                        / (positions[marker + step] - position)
+                positions[marker] = position + step
+
+    def get(self, index: int, quantile: float) -> float | None:
+        """Get the estimated quantile of slot index
+
+        Args:
+            index (int): slot
+            quantile (float): quantile between 0 and 1, e.g. 0.95
+
+        Returns:
+            float | None: estimate, interpolated between markers for quantiles that
+                aren't tracked, or None if the slot has no samples
+        """
+        count = self.counts[index]
+        if not count:
+            return None
+        if count < self.markers:
+            heights = sorted(self.heights[index])
+            return heights[min(int(quantile * count), count - 1)]
+        heights = self.heights[index]
+        probabilities = self.probabilities
+        marker = bisect_right(probabilities, quantile) - 1
+        if marker >= self.markers - 1:
+            return heights[-1]
+        fraction = (quantile - probabilities[marker]) / \
+            (probabilities[marker + 1] - probabilities[marker])
+        return heights[marker] + fraction * (heights[marker + 1] - heights[marker])
+
+
+class RollingWindows:
+    """Min, max and mean of the last N samples of a fixed number of values
+
+    Every slot has one preallocated ring buffer as long as the longest window.
+    Each window keeps a running sum and count, and monotonic deques of
+    (sample, value) pairs whose front is the window's min or max, so an update is
+    O(1) amortized per slot and window.
+    """
+
+    def __init__(self, size: int, windows: dict) -> None:
+        """
+        Args:
+            size (int): number of slots
+            windows (dict): window lengths in samples keyed by window name
+        """
+        self.size = size
+        self.windows = dict(windows)
+        self.names = list(self.windows)
+        self.lengths = list(self.windows.values())
+        self.capacity = max(self.lengths)
+        self.rings = [[None] * self.capacity for _ in range(size)]
+        self.sums = [[0.0] * size for _ in self.names]
+        self.counts = [[0] * size for _ in self.names]
+        self.mins = [[deque() for _ in range(size)] for _ in self.names]
+        self.maxs = [[deque() for _ in range(size)] for _ in self.names]
+        self.sample = 0
+
+    def update(self, values: list) -> None:
+        """Add one sample for every slot
+
+        Args:
+            values (list): one value per slot, None if there is no value
+        """
+        sample = self.sample
+        capacity = self.capacity
+        position = sample % capacity
+        for i, value in enumerate(values):
+            ring = self.rings[i]
+            for window, length in enumerate(self.lengths):
+                expired = sample - length
+                mins = self.mins[window][i]
+                maxs = self.maxs[window][i]
+                if expired >= 0:
+                    old = ring[expired % capacity]
+                    if old is not None:
+                        self.sums[window][i] -= old
+                        self.counts[window][i] -= 1
+                    if mins and mins[0][0] <= expired:
+                        mins.popleft()
+                    if maxs and maxs[0][0] <= expired:
+                        maxs.popleft()
+                if value is None:
+                    continue
+                self.sums[window][i] += value
+                self.counts[window][i] += 1
+                while mins and mins[-1][1] >= value:
+                    mins.pop()
+                mins.append((sample, value))
+                while maxs and maxs[-1][1] <= value:
+                    maxs.pop()
+                maxs.append((sample, value))
+            ring[position] = value
+        self.sample = sample + 1
+
+    def get(self, index: int, name: str) -> dict | None:
+        """Get min, max, mean and sample count of slot index over window name
+
+        Returns:
+            dict | None: window statistics or None if the window has no samples
+        """
+        if name not in self.windows:
+            return None
+        window = self.names.index(name)
+        count = self.counts[window][index]
+        if not count:
+            return None
+        return {'min': self.mins[window][index][0][1], 'max': self.maxs[window][index][0][1],
+                'mean': self.sums[window][index] / count, 'count': count}
+
+
+class Stats:
+    """Min, max and mean of a fixed number of values
+
+    Values are stored in flat lists indexed by slot, so an update is a single pass
+    over the new values with no dict lookups. None values are skipped and don't
+    count towards the mean of their slot.
+
+    Besides the lifetime statistics, named epochs such as "idle" or "cpu-burn" can
+    be opened and closed. Every open epoch accumulates the same samples into its
+    own Stats, so a phase summary is read back at O(1) per slot and the lifetime
+    statistics are never reset.
+
+    Streaming quantile estimates are kept alongside, see Quantiles, and rolling
+    window statistics, a bounded history and steady state detection once enabled,
+    see RollingWindows, History and SteadyState.
+    """
+
+    def __init__(self, size: int, quantiles: tuple | None = DEFAULT_QUANTILES) -> None:
+        """
+        Args:
+            size (int): number of slots
+            quantiles (tuple | None, optional): quantiles to estimate, None to skip
+                them. Defaults to DEFAULT_QUANTILES.
+        """
+        self.size = size
+        self.quantiles = None
+        if quantiles:
+            self.quantiles = Quantiles(size, quantiles)
+        self.windows = None
+        self.history = None
+        self.steady_state = None
+        self.mins = [float('inf')] * size
+        self.maxs = [float('-inf')] * size
+        self.means = [0.0] * size
+        self.counts = [0] * size
+        self.epochs = {}
+        self.open_epochs = []
+
+    def enable_windows(self, windows: dict | None = None) -> None:
+        """Start keeping rolling window statistics
+
+        Args:
+            windows (dict | None, optional): window lengths in samples keyed by name.
+                Defaults to DEFAULT_WINDOWS.
+        """
+        self.windows = RollingWindows(self.size, windows or DEFAULT_WINDOWS)
+
+    def enable_history(self, **kwargs) -> None:
+        """Start keeping a bounded multi-resolution history
+
+        Args:
+            **kwargs: History options
+        """
+        self.history = History(self.size, **kwargs)
+
+    def get_history(self, index: int, start: float | None = None,
+                    end: float | None = None) -> list:
+        """Get (timestamp, min, max, mean) history of slot index, see History.query()"""
+        if self.history is None:
+            return []
+        return self.history.query(index, start, end)
+
+    def enable_steady_state(self, **kwargs) -> None:
+        """Start detecting steady state
+
+        Args:
+            **kwargs: SteadyState options
+        """
+        self.steady_state = SteadyState(self.size, **kwargs)
+
+    def get_steady_state(self, index: int) -> dict | None:
+        """Get steady flag, settle timestamp and plateau value of slot index"""
+        if self.steady_state is None:
+            return None
+        return self.steady_state.get(index)
+
+    def get_window(self, index: int, name: str) -> dict | None:
+        """Get min, max, mean and sample count of slot index over window name"""
+        if self.windows is None:
+            return None
+        return self.windows.get(index, name)
+
+    def open_epoch(self, name: str) -> None:
+        """Start accumulating a new epoch, replacing an earlier one of the same name
+
+        Args:
+            name (str): epoch name
+        """
+        self.close_epoch(name)
+        epoch = Stats(self.size, None)
+        if self.quantiles is not None:
+            epoch.quantiles = Quantiles(self.size, self.quantiles_tracked())
+        self.epochs[name] = epoch
+        # replaced rather than mutated so a concurrent update() sees a stable list
+        self.open_epochs = self.open_epochs + [epoch]
+
+    def close_epoch(self, name: str) -> None:
+        """Stop accumulating an epoch, keeping its statistics
+
+        Args:
+            name (str): epoch name
+        """
+        epoch = self.epochs.get(name)
+        self.open_epochs = [open_epoch for open_epoch in self.open_epochs
+                            if open_epoch is not epoch]
+
+    def get_epoch(self, name: str):
+        """Get the statistics of an epoch
+
+        Args:
+            name (str): epoch name
+
+        Returns:
+            Stats | None: epoch statistics or None if it was never opened
+        """
+        return self.epochs.get(name)
+
+    def get_epochs(self) -> list:
+        """get names of every epoch in the order they were opened
+        """
+        return list(self.epochs)
+
+    def update(self, values: list) -> None:
+        """Add one sample for every slot
+
+        Args:
+            values (list): one value per slot, None if there is no value
+        """
+        for epoch in self.open_epochs:
+            epoch.update(values)
+        if self.quantiles is not None:
+            self.quantiles.update(values)
+        if self.windows is not None:
+            self.windows.update(values)
+        if self.history is not None:
+            self.history.update(values)
+        if self.steady_state is not None:
+            self.steady_state.update(values)
+        mins = self.mins
+        maxs = self.maxs
+        means = self.means
+        counts = self.counts
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            count = counts[i] + 1
+            counts[i] = count
+            if value < mins[i]:
+                mins[i] = value
+            if value > maxs[i]:
+                maxs[i] = value
+            means[i] += (value - means[i]) / count
+
+    def get_min(self, index: int) -> float | None:
+        """Get minimum value of slot index"""
+        if not self.counts[index]:
+            return None
+        return self.mins[index]
+
+    def get_max(self, index: int) -> float | None:
+        """Get maximum value of slot index"""
+        if not self.counts[index]:
+            return None
+        return self.maxs[index]
+
+    def get_mean(self, index: int) -> float | None:
+        """Get mean value of slot index"""
+        if not self.counts[index]:
+            return None
+        return self.means[index]
+
+    def get_percentile(self, index: int, quantile: float) -> float | None:
+        """Get the estimated quantile (0-1) of slot index"""
+        if self.quantiles is None:
+            return None
+        return self.quantiles.get(index, quantile)
+
+    def quantiles_tracked(self) -> tuple:
+        """get the quantiles the estimators track exactly
+        """
+        if self.quantiles is None:
+            return ()
+        return tuple(self.quantiles.probabilities[2:-2:2])
+
+    def get_summary(self, index: int) -> dict | None:
+        """Get min, max, mean and sample count of slot index"""
+        if not self.counts[index]:
+            return None
+        return {'min': self.mins[index], 'max': self.maxs[index],
+                'mean': self.means[index], 'count': self.counts[index]}
@@ -0,0 +1,113 @@
+"""Online steady state detection
+"""
+
+from math import sqrt
+from time import monotonic, time
+
+
+class SteadyState:
+    """Sliding window slope and deviation test for a fixed number of values
+
+    Each slot keeps running sums of t, t², v, v² and t·v over a ring of the last
+    window samples, so the least squares slope and the standard deviation of the
+    window cost O(1) per sample. A slot is steady once a full window has an
+    absolute slope of at most slope per minute and a standard deviation of at most
+    deviation. The start of that window is its settle time and the window mean its
+    plateau value; both are cleared if the slot drifts out of steady state again.
+    Samples are timed with time.monotonic() so a wall clock step can't bend the
+    slope, and settle times are converted to wall clock time when they are found.
+    """
+
+    def __init__(self, size: int, window: int = 300, slope: float = 0.1,
+                 deviation: float = 0.5) -> None:
+        """
+        Args:
+            size (int): number of slots
+            window (int, optional): window length in samples. Defaults to 300.
+            slope (float, optional): largest steady slope in units per minute.
+                Defaults to 0.1.
+            deviation (float, optional): largest steady standard deviation.
+                Defaults to 0.5.
+        """
+        self.size = size
+        self.window = window
+        self.slope = slope
+        self.deviation = deviation
+        self.origin = None
+        # wall clock minus monotonic time, 0 for caller supplied timestamps
+        self.wall_offset = 0.0
+        self.times = [0.0] * window
+        self.values = [[None] * window for _ in range(size)]
+        self.sums = [[0, 0.0, 0.0, 0.0, 0.0, 0.0] for _ in range(size)]
+        self.samples = 0
+        self.steady = [False] * size
+        self.settled = [None] * size
+        self.plateaus = [None] * size
+
+    def update(self, values: list, timestamp: float | None = None) -> None:
+        """Add one sample for every slot
+
+        Args:
+            values (list): one value per slot, None if there is no value
+            timestamp (float | None, optional): sample time in seconds on any
+                monotonic clock, settle times are reported on the same clock.
+                Defaults to now.
+        """
+        if timestamp is None:
+            timestamp = monotonic()
+            self.wall_offset = time() - timestamp
+        if self.origin is None:
+            self.origin = timestamp
+        position = self.samples % self.window
+        full = self.samples >= self.window
+        old_x = self.times[position]
+        x = timestamp - self.origin
+        self.times[position] = x
+        self.samples += 1
+        for i, value in enumerate(values):
+            ring = self.values[i]
+            sums = self.sums[i]
+            old = ring[position]
+            if full and old is not None:
+                sums[0] -= 1
+                sums[1] -= old_x
+                sums[2] -= old_x * old_x
+                sums[3] -= old
+                sums[4] -= old * old
+                sums[5] -= old_x * old
+            ring[position] = value
+            if value is not None:
+                sums[0] += 1
+                sums[1] += x
+                sums[2] += x * x
+                sums[3] += value
+                sums[4] += value * value
+                sums[5] += x * value
+            if self.samples >= self.window:
+                self._test(i)
+
+    def _test(self, slot: int) -> None:
+        count, sum_x, sum_xx, sum_y, sum_yy, sum_xy = self.sums[slot]
+        steady = False
+        if count >= 2:
+            spread = count * sum_xx - sum_x * sum_x
+            slope = (count * sum_xy - sum_x * sum_y) / spread if spread > 0 else 0.0
+            variance = max(sum_yy / count - (sum_y / count) ** 2, 0.0)
+            steady = abs(slope) * 60 <= self.slope and sqrt(variance) <= self.deviation
+        if steady and not self.steady[slot]:
+            start = self.times[self.samples % self.window]
+            self.settled[slot] = self.origin + start + self.wall_offset
+            self.plateaus[slot] = sum_y / count
+        elif not steady:
+            self.settled[slot] = None
+            self.plateaus[slot] = None
+        self.steady[slot] = steady
+
+    def get(self, index: int) -> dict:
+        """Get the steady state of slot index
+
+        Returns:
+            dict: steady flag, settle timestamp and plateau value, None until steady
+        """
+        return {'steady': self.steady[index], 'settled': self.settled[index],
+                'plateau': self.plateaus[index]}
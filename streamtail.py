@@ -0,0 +1,100 @@
+"""Non-blocking line reader for log files and pipes
+"""
+
+from os import open as os_open, close, fstat, pread, read, set_blocking, O_RDONLY
+from stat import S_ISREG
+
+
+class StreamTail:
+    """Complete lines appended to a log file or written to a pipe
+
+    Log files are read from the last offset with pread and pipes are switched to
+    non-blocking mode, so readlines() never waits on the writer. A partial last line
+    is held back until it is completed. Carriage returns end lines too, so progress
+    lines that are redrawn in place are seen one by one.
+    """
+
+    def __init__(self, source) -> None:
+        """
+        Args:
+            source: log file path, which may not exist yet, or a pipe or file given
+                as a file descriptor or an object with fileno(), e.g. Popen.stdout
+        """
+        self.path = None
+        self.fd = None
+        self.owned = False
+        self.regular = True
+        self.offset = 0
+        self.buffer = b''
+        self.eof = False
+        if isinstance(source, str):
+            self.path = source
+        else:
+            self._attach(source if isinstance(source, int) else source.fileno())
+
+    def __del__(self) -> None:
+        self.close()
+
+    def _attach(self, fd: int) -> None:
+        self.fd = fd
+        self.regular = S_ISREG(fstat(fd).st_mode)
+        if not self.regular:
+            set_blocking(fd, False)
+
+    def _read(self) -> bytes:
+        chunks = []
+        if self.regular:
+            if fstat(self.fd).st_size < self.offset:
+                # truncated or rotated
+                self.offset = 0
+            while True:
+                data = pread(self.fd, 1048576, self.offset)
+                if not data:
+                    break
+                self.offset += len(data)
+                chunks.append(data)
+            return b''.join(chunks)
+        while True:
+            try:
+                data = read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                self.eof = True
+                break
+            chunks.append(data)
+        return b''.join(chunks)
+
+    def readlines(self) -> list:
+        """Read the lines completed since the previous call
+
+        Returns:
+            list: decoded lines without line endings
+        """
+        if self.fd is None:
+            if self.path is None:
+                return []
+            try:
+                self._attach(os_open(self.path, O_RDONLY))
+            except OSError:
+                return []
+            self.owned = True
+        data = self.buffer + self._read().replace(b'\r', b'\n')
+        lines = data.split(b'\n')
+        self.buffer = lines.pop()
+        if self.eof and self.buffer:
+            lines.append(self.buffer)
+            self.buffer = b''
+        return [line.decode('utf-8', 'replace') for line in lines if line]
+
+    def is_closed(self) -> bool:
+        """Has the writer closed the pipe?
+        """
+        return self.eof
+
+    def close(self) -> None:
+        """Close the file descriptor if it was opened from a path
+        """
+        if getattr(self, 'owned', False) and self.fd is not None:
+            close(self.fd)
+        self.fd = None
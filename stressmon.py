@@ -1,9 +1,464 @@
 """Stress utility monitoring class
 """
 
-from psutil import process_iter
+from logging import getLogger
+from os import listdir, sysconf
+from os.path import join
+from subprocess import Popen
+from threading import Lock
+from time import monotonic_ns, time
+from stressmon.cgroups import CGroup, CGROUP_DATA
+from stressmon.hwsensors import HWSensorBase
+from stressmon.procevents import ProcConnector, PROC_EVENT_EXEC, PROC_EVENT_EXIT, \
+    PROC_EVENT_FORK, PROC_EVENT_LOST
+from stressmon.stats import Stats
+from stressmon.updatepool import PeriodicUpdater
 
-class StressMon:
+logger = getLogger(__name__)
+
+PROCESS_DATA = ['Workers', 'Running', 'Sleeping', 'Disk Sleep', 'CPU(%)', 'CPU Time(s)',
+                'RSS(MB)']
+CLOCK_TICKS = sysconf('SC_CLK_TCK')
+PAGE_SIZE = sysconf('SC_PAGE_SIZE')
+
+
+def match_utility(comm: str, utilities: list) -> str | None:
+    """Find the stress utility a process belongs to
+
+    Workers rename themselves after the utility, e.g. stress-ng-cpu, so the process
+    name is matched against the start of each utility name.
+
+    Args:
+        comm (str): process name from /proc/<pid>/comm
+        utilities (list): stress utility names
+
+    Returns:
+        str | None: matching utility or None
+    """
+    comm = comm.lower()
+    for utility in utilities:
+        if comm.startswith(utility.lower()[:15]):
+            return utility
+    return None
+
+
+def read_comm(proc: str, pid: int) -> str | None:
+    """Read the name of a process
+
+    Args:
+        proc (str): procfs mount point
+        pid (int): process id
+
+    Returns:
+        str | None: process name or None if the process is gone
+    """
+    try:
+        with open(join(proc, str(pid), 'comm'), 'r', encoding='UTF-8') as comm:
+            return comm.read().strip()
+    except OSError:
+        return None
+
+
+def read_proc_stat(proc: str, pid: int) -> tuple | None:
+    """Read the state, CPU time, RSS, start time and process group of a process
+
+    Args:
+        proc (str): procfs mount point
+        pid (int): process id
+
+    Returns:
+        tuple | None: (state, CPU jiffies, RSS pages, start time in jiffies after
+            boot, process group id) or None if the process is gone
+    """
+    try:
+        with open(join(proc, str(pid), 'stat'), 'rb') as stat_file:
+            data = stat_file.read()
+    except OSError:
+        return None
+    fields = data.rpartition(b')')[2].split()
+    return fields[0], int(fields[11]) + int(fields[12]), int(fields[21]), int(fields[19]), \
+        int(fields[2])
+
+
+class StressMon(HWSensorBase):
     """Class to monitor and report info about stress utilities
+
+    /proc is scanned incrementally: only PIDs that weren't there on the previous
+    scan have their name read, and the PIDs matching a stress utility are cached,
+    so each update costs one directory listing plus one stat read per worker.
+    Workers are identified by PID and start time, so a reused PID isn't counted as
+    the worker that had it before. Reports worker count, run state counts, CPU
+    usage, CPU time and RSS for each utility.
+
+    In event-driven mode workers are tracked from the kernel's proc connector
+    instead of scanning, so even short-lived workers are seen, and /proc is only
+    rescanned when events were lost to a receive buffer overflow. It needs root,
+    otherwise StressMon falls back to scanning. Either way the first worker of a
+    utility starting and its last worker exiting are recorded as timestamped phase
+    markers, see get_markers().
+
+    Utilities can also be given a cgroup v2 group, either an existing one to
+    attach to or a new one that launch() starts them in. The group's CPU, memory,
+    I/O and CPU pressure accounting is then read each tick at a cost that doesn't
+    depend on the number of workers.
     """
     stress_utilities = ['stress-ng', 'gpu_burn', 'glmark2', 'valley', 'Superposition', 'memtester']
+    headings = ['Data', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, stress_utilities: list | None = None, proc: str = '/proc',
+                 events: bool = False, cgroups: dict | None = None) -> None:
+        """
+        Args:
+            stress_utilities (list | None, optional): process names to track.
+                Defaults to StressMon.stress_utilities.
+            proc (str, optional): procfs mount point. Defaults to '/proc'.
+            events (bool, optional): track workers from proc connector events when
+                permitted. Defaults to False.
+            cgroups (dict | None, optional): cgroup path, absolute or relative to
+                /sys/fs/cgroup, keyed by utility. Missing groups are created.
+                Defaults to None.
+        """
+        self._iter = None
+        if stress_utilities is not None:
+            self.stress_utilities = list(stress_utilities)
+        self.proc = proc
+        self.slots = {utility: i for i, utility in enumerate(self.stress_utilities)}
+        self.labels = [[utility, data] for utility in self.stress_utilities
+                       for data in PROCESS_DATA]
+        self.cgroups = {}
+        for utility, path in (cgroups or {}).items():
+            if utility not in self.slots:
+                continue
+            try:
+                self.cgroups[utility] = CGroup(path)
+            except OSError as error:
+                # creating a group needs root, monitoring goes on without it
+                logger.warning("can't use cgroup %s for %s: %s", path, utility, error)
+        self.labels += [[utility, 'cgroup', data] for utility in self.cgroups
+                        for data in CGROUP_DATA]
+        self.cgroup_counters = [group.read() for group in self.cgroups.values()]
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.pids = set()
+        # matched pid: [utility, CPU jiffies at the last update, start time]
+        self.workers = {}
+        # CPU jiffies of exited workers of each utility
+        self.exited = [0] * len(self.stress_utilities)
+        # CPU jiffies exited workers used since the last update
+        self.exited_delta = [0] * len(self.stress_utilities)
+        # running workers of each utility
+        self.active = [0] * len(self.stress_utilities)
+        # (wall clock timestamp, utility, 'start' or 'exit')
+        self.markers = []
+        self.lock = Lock()
+        self.values = [None] * len(self.labels)
+        self.stats = Stats(len(self.labels))
+        self.connector = None
+        self.updater = None
+        if events:
+            try:
+                self.connector = ProcConnector()
+            except OSError:
+                self.connector = None
+        # subscribe before the first scan so no worker falls in between
+        self.scan(initial=True)
+        for pid, worker in list(self.workers.items()):
+            stat = read_proc_stat(self.proc, pid)
+            if stat is not None:
+                worker[1] = stat[1]
+        self.time = monotonic_ns()
+        if self.connector is not None:
+            self.updater = PeriodicUpdater(self.read_event, 0.0)
+            self.updater.start()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop listening for process events
+        """
+        if getattr(self, 'updater', None) is not None:
+            self.updater.stop()
+            self.updater = None
+        if getattr(self, 'connector', None) is not None:
+            self.connector.close()
+            self.connector = None
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def scan(self, initial: bool = False) -> None:
+        """Scan /proc for processes started since the previous scan
+
+        Args:
+            initial (bool, optional): workers found are already running, so they
+                don't get start markers. Defaults to False.
+        """
+        timestamp = None if initial else time()
+        listed = {int(name) for name in listdir(self.proc) if name.isdigit()}
+        pids = set(listed)
+        for pid in listed - self.pids:
+            comm = read_comm(self.proc, pid)
+            if comm is None:
+                # try again on the next scan
+                pids.discard(pid)
+                continue
+            utility = match_utility(comm, self.stress_utilities)
+            if utility is not None:
+                self.add_worker(pid, utility, timestamp)
+        # workers tracked from events needn't be in the previous scan
+        with self.lock:
+            gone = [pid for pid in self.workers if pid not in listed]
+        for pid in gone:
+            self.remove_worker(pid, timestamp)
+        self.pids = pids
+
+    def read_event(self) -> None:
+        """Wait for a proc connector event and track the workers it concerns
+        """
+        event = self.connector.read()
+        if event is None:
+            return
+        what, timestamp_ns, pid, tgid, parent = event
+        if what == PROC_EVENT_LOST:
+            # events were dropped, catch up on the workers they'd have reported
+            self.scan()
+            return
+        if pid != tgid:
+            # thread events
+            return
+        timestamp = time() - (monotonic_ns() - timestamp_ns) / 1000000000
+        if what == PROC_EVENT_FORK:
+            with self.lock:
+                worker = self.workers.get(parent)
+            if worker is not None:
+                self.add_worker(pid, worker[0], timestamp)
+        elif what == PROC_EVENT_EXEC:
+            comm = read_comm(self.proc, pid)
+            utility = None if comm is None else match_utility(comm, self.stress_utilities)
+            if utility is not None:
+                self.add_worker(pid, utility, timestamp)
+        elif what == PROC_EVENT_EXIT:
+            self.remove_worker(pid, timestamp)
+
+    def add_worker(self, pid: int, utility: str, timestamp: float | None) -> None:
+        """Start tracking a worker
+
+        Args:
+            pid (int): process id
+            utility (str): stress utility the worker belongs to
+            timestamp (float | None): when it started, None to skip the start marker
+        """
+        slot = self.slots[utility]
+        stat = read_proc_stat(self.proc, pid)
+        if stat is None:
+            return
+        with self.lock:
+            if pid in self.workers:
+                return
+            self.workers[pid] = [utility, stat[1], stat[3]]
+            self.active[slot] += 1
+            if self.active[slot] == 1 and timestamp is not None:
+                self.markers.append((timestamp, utility, 'start'))
+
+    def remove_worker(self, pid: int, timestamp: float | None) -> None:
+        """Stop tracking an exited worker, keeping its CPU time
+
+        The CPU time used since the last update is taken from a final stat read,
+        while the exited process can still be read.
+
+        Args:
+            pid (int): process id
+            timestamp (float | None): when it exited, None to skip the exit marker
+        """
+        if pid not in self.workers:
+            return
+        stat = read_proc_stat(self.proc, pid)
+        with self.lock:
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                return
+            slot = self.slots[worker[0]]
+            jiffies = worker[1]
+            if stat is not None and stat[3] == worker[2]:
+                jiffies = max(stat[1], jiffies)
+            self.exited[slot] += jiffies
+            self.exited_delta[slot] += jiffies - worker[1]
+            self.active[slot] -= 1
+            if not self.active[slot] and timestamp is not None:
+                self.markers.append((timestamp, worker[0], 'exit'))
+
+    def recheck(self, pid: int) -> None:
+        """Track the process that reused the pid of a worker if it is one too
+
+        Args:
+            pid (int): process id
+        """
+        comm = read_comm(self.proc, pid)
+        utility = None if comm is None else match_utility(comm, self.stress_utilities)
+        if utility is not None:
+            self.add_worker(pid, utility, time())
+
+    def get_markers(self) -> list:
+        """Get the phase markers recorded since the previous call
+
+        Returns:
+            list: (wall clock timestamp, utility, 'start' or 'exit') tuples in order
+        """
+        with self.lock:
+            markers = sorted(self.markers)
+            self.markers = []
+        return markers
+
+    def is_event_driven(self) -> bool:
+        """Are workers tracked from proc connector events?
+        """
+        return self.connector is not None
+
+    def update(self) -> None:
+        """Update stress utility process data
+        """
+        if self.connector is None:
+            self.scan()
+        start_time = self.time
+        self.time = monotonic_ns()
+        seconds = (self.time - start_time) / 1000000000
+        width = len(PROCESS_DATA)
+        with self.lock:
+            workers = list(self.workers.items())
+            totals = [[0, 0, 0, 0, delta, 0, 0] for delta in self.exited_delta]
+            self.exited_delta = [0] * len(self.stress_utilities)
+        for pid, worker in workers:
+            stat = read_proc_stat(self.proc, pid)
+            if stat is None or stat[3] != worker[2]:
+                # the exit event may have been dropped, or the pid reused
+                self.remove_worker(pid, time())
+                if stat is not None:
+                    self.recheck(pid)
+                continue
+            state, jiffies, rss = stat[:3]
+            total = totals[self.slots[worker[0]]]
+            total[0] += 1
+            if state == b'R':
+                total[1] += 1
+            elif state == b'S':
+                total[2] += 1
+            elif state == b'D':
+                total[3] += 1
+            total[4] += jiffies - worker[1]
+            total[5] += jiffies
+            total[6] += rss
+            worker[1] = jiffies
+        values = self.values
+        for slot, total in enumerate(totals):
+            base = slot * width
+            values[base:base + 4] = total[:4]
+            if not total[0] or seconds <= 0:
+                values[base + 4:base + width] = [None] * (width - 4)
+                continue
+            values[base + 4] = total[4] / CLOCK_TICKS / seconds * 100
+            values[base + 5] = (total[5] + self.exited[slot]) / CLOCK_TICKS
+            values[base + 6] = total[6] * PAGE_SIZE / 1000000
+        base = len(self.stress_utilities) * width
+        for slot, group in enumerate(self.cgroups.values()):
+            self.update_cgroup(slot, group.read(), seconds, base + slot * len(CGROUP_DATA))
+        self.stats.update(values)
+
+    def update_cgroup(self, slot: int, counters: list, seconds: float, base: int) -> None:
+        """Turn a cgroup's accounting counters into per-tick values
+
+        Args:
+            slot (int): position of the cgroup
+            counters (list): counters from CGroup.read()
+            seconds (float): time since the previous update
+            base (int): first value slot of the cgroup
+        """
+        previous = self.cgroup_counters[slot]
+        self.cgroup_counters[slot] = counters
+        deltas = [None if end is None or begin is None or seconds <= 0 else end - begin
+                  for end, begin in zip(counters, previous)]
+        values = self.values
+        for i in range(3):
+            values[base + i] = None if deltas[i] is None \
+                else deltas[i] / 1000000 / seconds * 100
+        values[base + 3] = None if deltas[3] is None else deltas[3] / 1000
+        values[base + 4] = None if counters[4] is None else counters[4] / 1000000
+        values[base + 5] = deltas[5]
+        values[base + 6] = deltas[6]
+        for i in (7, 8):
+            values[base + i] = None if deltas[i] is None else deltas[i] / 1000000 / seconds
+        values[base + 9] = None if deltas[9] is None else deltas[9] / seconds
+        values[base + 10] = counters[10]
+
+    def launch(self, utility: str, args: list, **kwargs) -> Popen:
+        """Start a stress utility, inside its cgroup if it has one
+
+        The process is moved into the group once it is started, together with any
+        workers it already forked, which are found by its process group. A utility
+        with a group is started as the leader of a new session and process group.
+
+        Args:
+            utility (str): stress utility
+            args (list): command line
+            **kwargs: passed on to subprocess.Popen
+
+        Returns:
+            Popen: the started process
+        """
+        group = self.cgroups.get(utility)
+        if group is None:
+            return Popen(args, **kwargs)
+        # workers forked before the move inherit the process group
+        kwargs['start_new_session'] = True
+        process = Popen(args, **kwargs)
+        try:
+            group.attach(process.pid)
+            for pid in listdir(self.proc):
+                if not pid.isdigit() or int(pid) == process.pid:
+                    continue
+                stat = read_proc_stat(self.proc, int(pid))
+                if stat is not None and stat[4] == process.pid:
+                    group.attach(int(pid))
+        except OSError as error:
+            logger.warning("can't move %s into cgroup %s: %s", utility, group.path, error)
+        return process
+
+    def get_workers(self, utility: str) -> list:
+        """get PIDs of the running workers of a stress utility
+        """
+        return sorted(pid for pid, worker in self.workers.items() if worker[0] == utility)
+
+    def get_cgroup(self, utility: str) -> str | None:
+        """get cgroup directory of a stress utility
+        """
+        group = self.cgroups.get(utility)
+        if group is None:
+            return None
+        return group.path
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) not in (2, 3):
+            return None
+        return params[-1]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) not in (2, 3):
+            return None
+        return params[0]
+
+    def get_subsection(self, params: list) -> str | None:
+        """Get subsection"""
+        if len(params) != 3:
+            return None
+        return params[1]
+
+    def is_empty(self) -> bool:
+        """Are there stress utilities to track?
+        """
+        return not self.labels
@@ -0,0 +1,229 @@
+"""stress-ng throughput sensor
+"""
+
+from re import compile as re_compile
+from stressmon.cputemp import CPUTemp
+from stressmon.cpuwatts import CPUWatts
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.streamtail import StreamTail
+
+STRESSNG_DATA = ['Bogo Ops/s', 'Bogo Ops/s(CPU)', 'Bogo Ops/J', 'Bogo Ops/s/C']
+# YAML metrics keys and the record fields they fill
+YAML_FIELDS = {'bogo-ops': 'bogo ops', 'wall-clock-time': 'real time',
+               'user-time': 'usr time', 'system-time': 'sys time',
+               'bogo-ops-per-second-real-time': 'bogo ops/s',
+               'bogo-ops-per-second-usr-sys-time': 'bogo ops/s(usr+sys)'}
+
+
+class StressNGParser:
+    """Line by line parser of stress-ng metrics
+
+    Understands the --metrics/--metrics-brief table lines stress-ng logs (tagged
+    info: or metrc: depending on the version) and the metrics section of --yaml
+    output. Each line is looked at once; a YAML record is returned when the line
+    after it arrives, or from flush().
+    """
+
+    metrics = re_compile(r'stress-ng: \w+:\s+\[\d+\]\s+([\w-]+)\s+(\d+)\s+([\d.]+)\s+'
+                         r'([\d.]+)\s+([\d.]+)\s+([\d.]+)\s+([\d.]+)')
+    yaml_key = re_compile(r'\s+(-\s+)?([\w-]+):\s*(\S*)')
+
+    def __init__(self) -> None:
+        self.record = None
+
+    def feed(self, line: str) -> dict | None:
+        """Parse a line of stress-ng output
+
+        Args:
+            line (str): output line
+
+        Returns:
+            dict | None: completed record with stressor, bogo ops, real time, usr time,
+                sys time, bogo ops/s and bogo ops/s(usr+sys), or None
+        """
+        match = self.metrics.match(line)
+        if match is not None:
+            values = [float(value) for value in match.groups()[1:]]
+            return dict(zip(['stressor', 'bogo ops', 'real time', 'usr time', 'sys time',
+                             'bogo ops/s', 'bogo ops/s(usr+sys)'], [match.group(1)] + values))
+        match = self.yaml_key.match(line)
+        if match is None or (match.group(1) and match.group(2) == 'stressor'):
+            record = self.flush()
+            if match is not None:
+                self.record = {'stressor': match.group(3)}
+            return record
+        if self.record is not None and match.group(2) in YAML_FIELDS:
+            try:
+                self.record[YAML_FIELDS[match.group(2)]] = float(match.group(3))
+            except ValueError:
+                pass
+        return None
+
+    def flush(self) -> dict | None:
+        """Complete the pending YAML record
+
+        Returns:
+            dict | None: pending record or None
+        """
+        record = self.record
+        self.record = None
+        if record is None or 'bogo ops/s' not in record:
+            return None
+        return record
+
+
+class StressNG(HWSensorBase):
+    """Live stress-ng throughput lined up with CPU power and temperature
+
+    stress-ng output is tailed without blocking from its stdout pipe or a log file
+    (--log-file or --yaml). stress-ng reports metrics when a run ends, so each batch
+    of metrics is a sample; loop short runs, e.g. --timeout 30 or --seq, for a live
+    series. Bogo ops are related to the mean CPU power and the mean temperature of
+    the hottest core over the ticks the batch covers. Every update adds the current
+    total power of the CPUWatts sensor and hottest core of the CPUTemp sensor to
+    sums kept here, which are reset when a batch arrives, so the sensors' own stats
+    are left alone. Throughput per degree is taken over the rise above the idle
+    temperature, stressors missing from a batch have no values for it.
+    """
+
+    headings = ['Throughput', 'Current', 'Min', 'Max', 'Mean']
+
+    def __init__(self, source, stressors: list | None = None,
+                 cpuwatts: CPUWatts | None = None, cputemp: CPUTemp | None = None,
+                 idle_temp: float | None = None) -> None:
+        """
+        Args:
+            source: stress-ng log or YAML file path, or its stdout pipe, see StreamTail
+            stressors (list | None, optional): stressors to report individually
+                besides the total. Defaults to None.
+            cpuwatts (CPUWatts | None, optional): CPU power sensor. Defaults to None.
+            cputemp (CPUTemp | None, optional): CPU temperature sensor. Defaults to None.
+            idle_temp (float | None, optional): hottest core temperature at idle, e.g.
+                from an "idle" epoch. Bogo Ops/s/C is only reported with it.
+                Defaults to None.
+        """
+        self._iter = None
+        self.tail = StreamTail(source)
+        self.parser = StressNGParser()
+        self.cpuwatts = cpuwatts
+        self.cputemp = cputemp
+        self.idle_temp = idle_temp
+        self.cpu_keys = [None if sensor is None else [list(params) for params in sensor]
+                         for sensor in (cpuwatts, cputemp)]
+        # total power and hottest core temperature summed over the batch's ticks
+        self.cpu_sums = [0.0, 0.0]
+        self.cpu_counts = [0, 0]
+        self.rows = ['All'] + list(stressors or [])
+        self.slots = {row: i for i, row in enumerate(self.rows)}
+        self.labels = [[row, data] for row in self.rows for data in STRESSNG_DATA]
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.records = {}
+        self.values = [None] * len(self.labels)
+        self.stats = Stats(len(self.labels))
+
+    def __iter__(self):
+        """Make class an iterator."""
+        self._iter = iter(self.labels)
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def _sample_cpu(self) -> None:
+        """Add the current CPU power and hottest core temperature to the batch sums
+        """
+        sensors = ((self.cpuwatts, sum), (self.cputemp, max))
+        for i, ((sensor, reduce), keys) in enumerate(zip(sensors, self.cpu_keys)):
+            if sensor is None:
+                continue
+            values = [value for value in (sensor.get_raw(params) for params in keys)
+                      if value is not None]
+            if values:
+                self.cpu_sums[i] += reduce(values)
+                self.cpu_counts[i] += 1
+
+    def _batch_cpu(self) -> tuple:
+        """Get the CPU power and hottest core temperature of the batch and start anew
+
+        Returns:
+            tuple: mean total power (W) and mean temperature of the hottest core (C),
+                None where there is no sensor or no tick was sampled
+        """
+        watts, temp = [total / count if count else None
+                       for total, count in zip(self.cpu_sums, self.cpu_counts)]
+        self.cpu_sums = [0.0, 0.0]
+        self.cpu_counts = [0, 0]
+        return watts, temp
+
+    def update(self) -> None:
+        """Update throughput from the stress-ng metrics logged since the last tick
+        """
+        self._sample_cpu()
+        batch = {}
+        for line in self.tail.readlines():
+            record = self.parser.feed(line)
+            if record is not None:
+                batch[record['stressor']] = record
+        if self.tail.is_closed():
+            record = self.parser.flush()
+            if record is not None:
+                batch[record['stressor']] = record
+        if not batch:
+            return
+        self.records.update(batch)
+        watts, temp = self._batch_cpu()
+        rise = None
+        if temp is not None and self.idle_temp is not None:
+            rise = temp - self.idle_temp
+        rows = {'All': [sum(record.get('bogo ops/s', 0) for record in batch.values()),
+                        sum(record.get('bogo ops/s(usr+sys)', 0) for record in batch.values())]}
+        for stressor, record in batch.items():
+            if stressor in self.slots:
+                rows[stressor] = [record.get('bogo ops/s'), record.get('bogo ops/s(usr+sys)')]
+        width = len(STRESSNG_DATA)
+        # stressors that aren't in this batch didn't report, rather than repeat
+        self.values = [None] * len(self.labels)
+        for row, (ops, cpu_ops) in rows.items():
+            base = self.slots[row] * width
+            self.values[base] = ops
+            self.values[base + 1] = cpu_ops
+            self.values[base + 2] = None if ops is None or not watts else ops / watts
+            # under a degree of rise the ratio is noise
+            self.values[base + 3] = None if ops is None or rise is None or rise < 1 \
+                else ops / rise
+        self.stats.update(self.values)
+
+    def get_stressors(self) -> dict:
+        """get the latest metrics of every stressor seen
+
+        Returns:
+            dict: records keyed by stressor, see StressNGParser.feed()
+        """
+        return dict(self.records)
+
+    def get_label(self, params: list) -> str | None:
+        """Get label"""
+        if len(params) != 2:
+            return None
+        return params[1]
+
+    def get_section(self, params: list) -> str | None:
+        """Get section"""
+        if len(params) != 2:
+            return None
+        return f"stress-ng {params[0]}"
+
+    def get_subsection(self, _) -> str | None:
+        """Get subsection"""
+        return None
+
+    def get_csv_headings(self) -> list:
+        """Generate Headings list for CSV file of current values
+        """
+        return [f"stress-ng {row} {data}" for row, data in self.labels]
+
+    def is_empty(self) -> bool:
+        """Is there throughput to report?
+        """
+        return not self.labels
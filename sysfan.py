@@ -1,7 +1,6 @@
 """Hardware monitor module for fan sensor data
 """
 
-from copy import deepcopy
 from psutil import sensors_fans
 from stressmon.hwsensors import HWSensorBase
 
@@ -13,11 +12,9 @@ class SysFan(HWSensorBase):
     headings = ['Fans', 'Current(RPM)', 'Min(RPM)', 'Max(RPM)', 'Mean(RPM)']
 
     def __init__(self) -> None:
-        self.iteration = 1
         self.drivers = [driver for driver in sensors_fans().keys()
                         if driver != 'amdgpu']
         self.fans = {}
-        self.mmm = {}
         self.lines = len(self.drivers) * 2
         if self.drivers:
             self.fans = dict.fromkeys(self.drivers)
@@ -30,11 +27,6 @@ class SysFan(HWSensorBase):
                     self.lines += 1
                 self.fans[driver] = dict.fromkeys(fans)
             self.lines += 1
-            self.mmm = deepcopy(self.fans)
-            for driver in self.drivers:
-                fans = list(self.mmm[driver].keys())
-                for fan in fans:
-                    self.mmm[driver][fan] = [9999, 0, 0]
         self.driver_iter = None
         self.current_driver = None
         self.current_fans = None
@@ -99,14 +91,6 @@ class SysFan(HWSensorBase):
                     if fan[0] == '':
                         fan[0] = driver
                     self.fans[driver][fan[0]] = fan[1]
-                    self.mmm[driver][fan[0]][0] = min(
-                        [self.mmm[driver][fan[0]][0], fan[1]])
-                    self.mmm[driver][fan[0]][1] = max(
-                        [self.mmm[driver][fan[0]][1], fan[1]])
-                    mean = self.mmm[driver][fan[0]][2]
-                    self.mmm[driver][fan[0]][2] = mean + \
-                        (fan[1] - mean) / self.iteration
-        self.iteration += 1
 
     def get_label(self, params: list) -> str | None:
         """Get label for current fan"""
@@ -138,51 +122,6 @@ class SysFan(HWSensorBase):
             return None
         return self.fans.get(params[0], {}).get(params[1], None)
 
-    def get_min(self, params: list) -> int | None:
-        """Get the minimum fan speed for fans[driver][fan]
-
-        Args:
-            driver (str): supported driver name
-            fan (str): fan name
-
-        Returns:
-            int: minimum fan speed
-        """
-        if len(params) != 2:
-            return None
-        return self.mmm.get(params[0], {}).get(params[1], (None, None, None))[0]
-
-    def get_max(self, params: list) -> int | None:
-        """Get the maximum fan speed for fans[driver][fan]
-
-        Args:
-            driver (str): supported driver name
-            fan (str): fan name
-
-        Returns:
-            int: maximum fan speed
-        """
-        if len(params) != 2:
-            return None
-        return self.mmm.get(params[0], {}).get(params[1], (None, None, None))[1]
-
-    def get_mean(self, params: list) -> int | None:
-        """Get the mean fan speed for fans[driver][fan]
-
-        Args:
-            driver (str): supported driver name
-            fan (str): fan name
-
-        Returns:
-            int: mean fan speed
-        """
-        if len(params) != 2:
-            return None
-        ret = self.mmm.get(params[0], {}).get(params[1], (None, None, None))[2]
-        if ret is None:
-            return ret
-        return round(ret)
-
     def get_csv_data(self) -> list:
         """get fan speeds as a list
 
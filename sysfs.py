@@ -0,0 +1,79 @@
+"""Cached sysfs and procfs file readers
+"""
+
+from os import open as os_open, close, pread, O_RDONLY
+
+
+class SysfsFile:
+    """sysfs or procfs file kept open and re-read with pread
+
+    Keeping the file descriptor open turns every sample into a single pread instead
+    of an open/read/close sequence.
+    """
+
+    def __init__(self, path: str, size: int = 4096) -> None:
+        self.path = path
+        self.size = size
+        self.fd = os_open(path, O_RDONLY)
+
+    def __del__(self) -> None:
+        self.close()
+
+    def read(self) -> bytes:
+        """Read the whole file
+
+        Returns:
+            bytes: file contents
+        """
+        data = pread(self.fd, self.size, 0)
+        while len(data) == self.size:
+            self.size *= 2
+            data = pread(self.fd, self.size, 0)
+        return data
+
+    def read_int(self) -> int:
+        """Read a file holding a single integer
+
+        Returns:
+            int: file value
+        """
+        return int(pread(self.fd, self.size, 0))
+
+    def close(self) -> None:
+        """Close the file descriptor
+        """
+        if getattr(self, 'fd', None) is not None:
+            close(self.fd)
+            self.fd = None
+
+
+def open_sysfs(path: str, size: int = 4096) -> SysfsFile | None:
+    """Open a sysfs or procfs file if it exists and is readable
+
+    Args:
+        path (str): file path
+        size (int, optional): initial read size. Defaults to 4096.
+
+    Returns:
+        SysfsFile | None: open file or None
+    """
+    try:
+        return SysfsFile(path, size)
+    except OSError:
+        return None
+
+
+def read_sysfs(path: str) -> str | None:
+    """Read a sysfs file once
+
+    Args:
+        path (str): file path
+
+    Returns:
+        str | None: stripped file contents or None if it can't be read
+    """
+    try:
+        with open(path, 'r', encoding='UTF-8') as sysfs_file:
+            return sysfs_file.read().strip()
+    except OSError:
+        return None
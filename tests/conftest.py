@@ -0,0 +1,65 @@
+"""Shared test fixtures
+"""
+
+from pytest import fixture
+from stressmon.hwsensors import HWSensorBase
+
+
+class FakeSensor(HWSensorBase):
+    """Legacy style sensor without its own Stats, whose readings the test sets
+
+    Current values are rounded, get_raw() returns them as they are.
+    """
+
+    def __init__(self, readings: dict) -> None:
+        self.readings = dict(readings)
+        # readings taken by the next update() calls
+        self.pending = []
+        self._iter = None
+
+    def __iter__(self):
+        self._iter = iter([[key] for key in self.readings])
+        return self
+
+    def __next__(self) -> list:
+        return next(self._iter)
+
+    def update(self) -> None:
+        self.readings = dict(zip(self.readings, self.pending.pop(0)))
+
+    def tick(self, values: list) -> None:
+        """Take values as the readings and record them, as UpdatePool would"""
+        self.pending.append(values)
+        self.update()
+        self.record()
+
+    def get_label(self, params: list) -> str | None:
+        return params[0]
+
+    def get_section(self, params: list) -> str | None:
+        return None
+
+    def get_subsection(self, params: list) -> str | None:
+        return None
+
+    def get_current(self, params: list) -> int | None:
+        value = self.readings.get(params[0])
+        return None if value is None else round(value)
+
+    def get_raw(self, params: list) -> float | None:
+        return self.readings.get(params[0])
+
+    def get_csv_headings(self) -> list:
+        return list(self.readings)
+
+    def get_csv_data(self) -> list:
+        return list(self.readings.values())
+
+    def is_empty(self) -> bool:
+        return False
+
+
+@fixture
+def fake_sensor():
+    """FakeSensor class, called with the initial readings keyed by label"""
+    return FakeSensor
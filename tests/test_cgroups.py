@@ -0,0 +1,50 @@
+"""Tests for cgroup v2 accounting against a fake cgroup tree
+"""
+
+import logging
+from stressmon import cgroups
+from stressmon.cgroups import CGroup, create_cgroup, parse_keyed
+
+
+def test_parse_keyed():
+    assert parse_keyed(b'usage_usec 100\nuser_usec 60\n') == \
+        {b'usage_usec': 100, b'user_usec': 60}
+
+
+def test_create_cgroup_enables_controllers_one_by_one(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(cgroups, 'CGROUP_ROOT', str(tmp_path))
+    (tmp_path / 'cgroup.subtree_control').write_text('')
+    (tmp_path / 'stress').mkdir()
+    # a file that can't be written
+    (tmp_path / 'stress' / 'cgroup.subtree_control').mkdir()
+    with caplog.at_level(logging.WARNING, logger='stressmon.cgroups'):
+        create_cgroup(str(tmp_path / 'stress' / 'cpu'))
+    assert (tmp_path / 'stress' / 'cpu').is_dir()
+    # each controller is its own write, the last one is left in the file
+    assert (tmp_path / 'cgroup.subtree_control').read_text() == '+io'
+    assert [record.args[0] for record in caplog.records] == ['cpu', 'memory', 'io']
+
+
+def test_read_and_attach(tmp_path):
+    group = tmp_path / 'stress'
+    group.mkdir()
+    (group / 'cpu.stat').write_text('usage_usec 300\nuser_usec 200\nsystem_usec 100\n'
+                                    'nr_throttled 0\nthrottled_usec 7\n')
+    (group / 'memory.current').write_text('4096\n')
+    (group / 'memory.events').write_text('low 0\nhigh 2\nmax 0\noom 0\noom_kill 1\n')
+    (group / 'io.stat').write_text('8:0 rbytes=10 wbytes=20 rios=1 wios=2 dbytes=0 dios=0\n'
+                                   '8:16 rbytes=5 wbytes=0 rios=1 wios=0 dbytes=0 dios=0\n')
+    (group / 'cpu.pressure').write_text('some avg10=1.50 avg60=0.00 avg300=0.00 total=9\n'
+                                        'full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n')
+    (group / 'cgroup.procs').write_text('')
+    cgroup = CGroup(str(group))
+    assert cgroup.read() == [300, 200, 100, 7, 4096, 1, 2, 15, 20, 4, 1.5]
+    cgroup.attach(1234)
+    assert (group / 'cgroup.procs').read_text() == '1234'
+
+
+def test_missing_controllers_read_none(tmp_path):
+    group = tmp_path / 'stress'
+    group.mkdir()
+    (group / 'memory.current').write_text('4096\n')
+    assert CGroup(str(group)).read() == [None] * 4 + [4096] + [None] * 6
@@ -0,0 +1,77 @@
+"""Tests for CPUResidency against a fake cpu tree
+"""
+
+from stressmon import cpuresidency
+from stressmon.cpuresidency import CPUResidency
+
+
+class FakeCPUInfo:
+    """CPUInfo stand-in for a non-hybrid CPU"""
+
+    def has_intel_pe_cores(self) -> bool:
+        return False
+
+
+def write_cpu(root, cpu: int, idle: dict, time_in_state: dict) -> None:
+    for state, (name, time_us) in enumerate(idle.items()):
+        directory = root / f"cpu{cpu}" / 'cpuidle' / f"state{state}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / 'name').write_text(f"{name}\n")
+        (directory / 'time').write_text(f"{time_us}\n")
+    stats = root / f"cpu{cpu}" / 'cpufreq' / 'stats'
+    stats.mkdir(parents=True, exist_ok=True)
+    (stats / 'time_in_state').write_text(
+        "".join(f"{freq} {time_10ms}\n" for freq, time_10ms in time_in_state.items()))
+
+
+def test_residency_and_average_frequency(tmp_path, monkeypatch):
+    monkeypatch.setattr(cpuresidency, 'CPUInfo', FakeCPUInfo)
+    now = [0]
+    monkeypatch.setattr(cpuresidency, 'monotonic_ns', lambda: now[0])
+    for cpu in (0, 1):
+        write_cpu(tmp_path, cpu, {'POLL': 0, 'C1': 0, 'C6': 0},
+                  {800000: 0, 3000000: 0})
+    sensor = CPUResidency(str(tmp_path))
+    assert sensor.get_csv_headings()[:4] == ['CPU POLL(%)', 'CPU C1(%)', 'CPU C6(%)',
+                                             'CPU Avg(MHz)']
+    # one second: cpu0 60% in C6 at 800 MHz, cpu1 busy at 3 GHz
+    write_cpu(tmp_path, 0, {'POLL': 0, 'C1': 100000, 'C6': 600000},
+              {800000: 100, 3000000: 0})
+    write_cpu(tmp_path, 1, {'POLL': 0, 'C1': 0, 'C6': 0},
+              {800000: 0, 3000000: 100})
+    now[0] = 1000000000
+    sensor.update()
+    assert sensor.get_current(['Core 0', 'C6(%)']) == 60
+    assert sensor.get_current(['Core 0', 'Avg(MHz)']) == 800
+    assert sensor.get_current(['Core 1', 'Avg(MHz)']) == 3000
+    assert sensor.get_current(['CPU', 'C6(%)']) == 30
+    assert sensor.get_current(['CPU', 'Avg(MHz)']) == 1900
+    assert sensor.get_pstate_residency(1) == {3000: 100.0}
+
+
+def test_unreadable_cpu_has_no_residency(tmp_path, monkeypatch):
+    monkeypatch.setattr(cpuresidency, 'CPUInfo', FakeCPUInfo)
+    now = [0]
+    monkeypatch.setattr(cpuresidency, 'monotonic_ns', lambda: now[0])
+    for cpu in (0, 1):
+        write_cpu(tmp_path, cpu, {'C1': 0}, {800000: 0})
+    sensor = CPUResidency(str(tmp_path))
+    write_cpu(tmp_path, 0, {'C1': 500000}, {800000: 100})
+    (tmp_path / 'cpu1' / 'cpuidle' / 'state0' / 'time').write_text('')
+    (tmp_path / 'cpu1' / 'cpufreq' / 'stats' / 'time_in_state').write_text('garbage\n')
+    now[0] = 1000000000
+    sensor.update()
+    assert sensor.get_current(['Core 0', 'C1(%)']) == 50
+    assert sensor.get_current(['Core 1', 'C1(%)']) is None
+    assert sensor.get_current(['Core 1', 'Avg(MHz)']) is None
+    assert sensor.get_current(['CPU', 'C1(%)']) == 50
+    # the next tick after the counters are readable again starts over
+    write_cpu(tmp_path, 1, {'C1': 100000}, {800000: 100})
+    now[0] = 2000000000
+    sensor.update()
+    assert sensor.get_current(['Core 1', 'C1(%)']) is None
+    write_cpu(tmp_path, 1, {'C1': 400000}, {800000: 200})
+    now[0] = 3000000000
+    sensor.update()
+    assert sensor.get_current(['Core 1', 'C1(%)']) == 30
+    assert sensor.get_current(['Core 1', 'Avg(MHz)']) == 800
@@ -0,0 +1,67 @@
+"""Tests for CPUThrottle against a fake cpu tree
+"""
+
+from stressmon.cputhrottle import CPUThrottle
+
+
+def make_cpu(root, number: int, package: int, core: int, counts: tuple) -> None:
+    cpu = root / f"cpu{number}"
+    (cpu / 'topology').mkdir(parents=True)
+    (cpu / 'thermal_throttle').mkdir()
+    (cpu / 'topology' / 'physical_package_id').write_text(f"{package}\n")
+    (cpu / 'topology' / 'core_id').write_text(f"{core}\n")
+    write_counts(root, number, counts)
+
+
+def write_counts(root, number: int, counts: tuple) -> None:
+    throttle = root / f"cpu{number}" / 'thermal_throttle'
+    core_count, core_ms, package_count, package_ms = counts
+    (throttle / 'core_throttle_count').write_text(f"{core_count}\n")
+    (throttle / 'core_throttle_total_time_ms').write_text(f"{core_ms}\n")
+    (throttle / 'package_throttle_count').write_text(f"{package_count}\n")
+    (throttle / 'package_throttle_total_time_ms').write_text(f"{package_ms}\n")
+
+
+def make_sensor(tmp_path) -> CPUThrottle:
+    # cpu0 and cpu2 are SMT siblings of core 0
+    make_cpu(tmp_path, 0, 0, 0, (10, 100, 5, 50))
+    make_cpu(tmp_path, 1, 0, 1, (20, 200, 5, 50))
+    make_cpu(tmp_path, 2, 0, 0, (10, 100, 5, 50))
+    return CPUThrottle(str(tmp_path))
+
+
+def test_siblings_are_read_once(tmp_path):
+    sensor = make_sensor(tmp_path)
+    units = [unit for _, unit, data in sensor if data == 'Thermal Throttles']
+    assert units == ['Package', 'Core 0', 'Core 1', 'All Cores']
+
+
+def test_deltas_and_core_totals(tmp_path):
+    sensor = make_sensor(tmp_path)
+    write_counts(tmp_path, 0, (13, 130, 9, 90))
+    write_counts(tmp_path, 1, (21, 260, 9, 90))
+    sensor.update()
+    assert sensor.get_current(['Package 0', 'Package', 'Thermal Throttles']) == 4
+    assert sensor.get_current(['Package 0', 'Core 0', 'Thermal Throttles']) == 3
+    assert sensor.get_current(['Package 0', 'All Cores', 'Thermal Throttles']) == 4
+    assert sensor.get_current(['Package 0', 'All Cores', 'Thermal Throttle(ms)']) == 90
+
+
+class OfflineCounter:
+    """Counter of a CPU that went offline"""
+
+    def read_int(self) -> int:
+        raise OSError(19, 'No such device')
+
+
+def test_unreadable_counters_report_none(tmp_path):
+    sensor = make_sensor(tmp_path)
+    (tmp_path / 'cpu1' / 'thermal_throttle' / 'core_throttle_count').write_text("\n")
+    slot = sensor.index[('Package 0', 'Core 1', 'Thermal Throttle(ms)')]
+    sensor.files[slot] = OfflineCounter()
+    sensor.update()
+    assert sensor.get_current(['Package 0', 'Core 1', 'Thermal Throttles']) is None
+    assert sensor.get_current(['Package 0', 'Core 1', 'Thermal Throttle(ms)']) is None
+    assert sensor.get_current(['Package 0', 'Core 0', 'Thermal Throttles']) == 0
+    sensor.update()
+    assert sensor.get_current(['Package 0', 'All Cores', 'Thermal Throttles']) == 0
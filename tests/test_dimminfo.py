@@ -0,0 +1,58 @@
+"""Tests for the SMBIOS memory device parser and DIMM inventory
+"""
+
+from struct import pack_into
+from stressmon.dimminfo import DIMMInfo, parse_memory_device
+
+
+def memory_device(size: int, strings: list, speed: int = 4800, rank: int = 2,
+                  extended_size: int = 0, extended_speed: int = 0) -> bytes:
+    """Build an SMBIOS 3.2 type 17 structure with its string set"""
+    raw = bytearray(0x5C)
+    raw[0] = 17
+    raw[1] = len(raw)
+    pack_into('<H', raw, 0x0C, size)
+    raw[0x10] = 1
+    raw[0x11] = 2
+    pack_into('<H', raw, 0x15, speed)
+    raw[0x17] = 3
+    raw[0x18] = 4
+    raw[0x1A] = 5
+    raw[0x1B] = rank
+    pack_into('<I', raw, 0x1C, extended_size)
+    pack_into('<I', raw, 0x54, extended_speed)
+    return bytes(raw) + b'\0'.join(string.encode() for string in strings) + b'\0\0'
+
+
+STRINGS = ['DIMM_A1', 'BANK 0', 'Samsung', '1234ABCD', 'M321R4GA3BB6-CQKET ']
+
+
+def test_parse_memory_device():
+    dimm = parse_memory_device(memory_device(16384, STRINGS))
+    assert dimm == {'Locator': 'DIMM_A1', 'Bank': 'BANK 0', 'Size': 16384,
+                    'Speed': 4800, 'Manufacturer': 'Samsung', 'Serial': '1234ABCD',
+                    'Part Number': 'M321R4GA3BB6-CQKET', 'Rank': 2}
+
+
+def test_parse_memory_device_sizes_and_speeds():
+    assert parse_memory_device(memory_device(0, STRINGS)) is None
+    assert parse_memory_device(memory_device(0x7FFF, STRINGS,
+                                             extended_size=65536))['Size'] == 65536
+    # bit 15 set: size in KB
+    assert parse_memory_device(memory_device(0x8000 | 2048, STRINGS))['Size'] == 2
+    assert parse_memory_device(memory_device(16384, STRINGS, speed=0xFFFF,
+                                             extended_speed=70000))['Speed'] == 70000
+    assert parse_memory_device(memory_device(16384, STRINGS, speed=0))['Speed'] is None
+
+
+def test_inventory_is_loaded_once(tmp_path):
+    for number, size in ((0, 16384), (1, 0), (2, 16384)):
+        entry = tmp_path / f"17-{number}"
+        entry.mkdir()
+        strings = STRINGS[:4] + ['Unknown' if number == 2 else 'PART-0']
+        (entry / 'raw').write_bytes(memory_device(size, strings))
+    dimminfo = DIMMInfo(str(tmp_path))
+    assert len(dimminfo.get_dimms()) == 2
+    assert dimminfo.get_part_numbers() == ['PART-0']
+    (tmp_path / '17-0' / 'raw').unlink()
+    assert len(dimminfo.get_dimms()) == 2
@@ -0,0 +1,62 @@
+"""Tests for DiskIO /proc/diskstats parsing
+"""
+
+from stressmon import diskio
+from stressmon.diskio import DISKIO_DATA, DiskIO
+
+
+class FakeDriveTemp:
+    """DriveTemp stand-in"""
+
+    def get_drive_names(self) -> list:
+        return ['nvme0', 'nvme1', 'sda']
+
+
+def diskstats(counters: dict) -> str:
+    lines = []
+    for minor, (name, values) in enumerate(counters.items()):
+        lines.append(f"259 {minor} {name} " + " ".join(str(value) for value in values) +
+                     " 0 0 0 0 0 0")
+    return "\n".join(lines) + "\n"
+
+
+IDLE = [0] * 11
+
+
+def make_sensor(tmp_path, monkeypatch, drivetemp=None) -> tuple:
+    block = tmp_path / 'block'
+    for name in ('nvme0n1', 'nvme0n2', 'nvme1n1', 'sda', 'loop0'):
+        (block / name).mkdir(parents=True)
+    stats = tmp_path / 'diskstats'
+    stats.write_text(diskstats({'nvme0n1': IDLE, 'nvme0n2': IDLE, 'nvme1n1': IDLE,
+                                'sda': IDLE, 'sda1': IDLE, 'loop0': IDLE}))
+    now = [0]
+    monkeypatch.setattr(diskio, 'monotonic_ns', lambda: now[0])
+    sensor = DiskIO(drivetemp, str(stats), str(block))
+    return sensor, stats, now
+
+
+def test_namespaces_keep_their_own_slots(tmp_path, monkeypatch):
+    sensor, _, _ = make_sensor(tmp_path, monkeypatch, FakeDriveTemp())
+    assert sensor.get_drive_names() == ['nvme0n1', 'nvme0n2', 'nvme1', 'sda']
+    assert len(sensor.index) == 4 * len(DISKIO_DATA)
+
+
+def test_rates_from_counter_deltas(tmp_path, monkeypatch):
+    sensor, stats, now = make_sensor(tmp_path, monkeypatch)
+    # reads, merged, sectors read, ms reading, writes, merged, sectors written,
+    # ms writing, in flight, ms doing I/O, weighted ms
+    busy = [100, 0, 2000, 300, 300, 0, 6000, 500, 2, 500, 2000]
+    stats.write_text(diskstats({'nvme0n1': busy, 'nvme0n2': IDLE, 'nvme1n1': IDLE,
+                                'sda': IDLE, 'sda1': IDLE, 'loop0': IDLE}))
+    now[0] = 2000000000
+    sensor.update()
+    values = dict(zip(sensor.get_csv_headings(), sensor.get_csv_data()))
+    assert values['nvme0n1 IOPS'] == 200.0
+    assert values['nvme0n1 Read(MB/s)'] == 0.512
+    assert values['nvme0n1 Write(MB/s)'] == 1.536
+    assert values['nvme0n1 Await(ms)'] == 2.0
+    assert values['nvme0n1 Queue Depth'] == 1.0
+    assert values['nvme0n1 Util(%)'] == 25.0
+    assert values['nvme0n2 IOPS'] == 0.0
+    assert 'loop0 IOPS' not in values
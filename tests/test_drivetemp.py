@@ -0,0 +1,107 @@
+"""Tests for DriveTemp discovery and updates against fake sysfs trees
+"""
+
+from os import makedirs, symlink
+from os.path import join
+from stressmon import drivetemp
+from stressmon.drivetemp import DriveTemp, drive_key, find_block_drives
+
+
+def write(path: str, value) -> None:
+    with open(path, 'w', encoding='utf-8') as sysfs_file:
+        sysfs_file.write(f"{value}\n")
+
+
+def make_tree(root: str) -> tuple:
+    hwmon_root = join(root, 'hwmon')
+    block_root = join(root, 'block')
+    controller = join(root, 'devices', 'nvme0')
+    makedirs(controller)
+    hwmon = join(hwmon_root, 'hwmon2')
+    makedirs(hwmon)
+    symlink(controller, join(hwmon, 'device'))
+    write(join(hwmon, 'name'), 'nvme')
+    write(join(hwmon, 'temp1_input'), 41850)
+    write(join(hwmon, 'temp1_label'), 'Composite')
+    write(join(hwmon, 'temp2_input'), 44850)
+    write(join(hwmon, 'temp2_label'), 'Sensor 1')
+    for name in ('nvme0n1', 'nvme0n2', 'sda'):
+        makedirs(join(block_root, name, 'device'))
+    makedirs(join(block_root, 'loop0'))
+    makedirs(join(block_root, 'dm-0', 'device'))
+    return hwmon_root, block_root, hwmon
+
+
+class FakeDevice:
+    """pySMART Device stand-in"""
+
+    created = []
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.model = 'Fake SATA SSD'
+        self.temperature = 33
+        FakeDevice.created.append(name)
+
+    def update(self) -> None:
+        self.temperature += 1
+
+
+def test_drive_key():
+    assert drive_key('nvme0n1') == 'nvme0'
+    assert drive_key('nvme12') == 'nvme12'
+    assert drive_key('sda') == 'sda'
+
+
+def test_find_block_drives(tmp_path):
+    _, block_root, _ = make_tree(str(tmp_path))
+    assert find_block_drives(block_root) == ['nvme0', 'sda']
+
+
+def test_hwmon_and_smart_fallback(tmp_path, monkeypatch):
+    hwmon_root, block_root, hwmon = make_tree(str(tmp_path))
+    FakeDevice.created = []
+    monkeypatch.setattr(drivetemp, 'Device', FakeDevice)
+    sensor = DriveTemp(smart_interval=3600, hwmon_root=hwmon_root, block_root=block_root)
+    try:
+        sensor.smart_updater.stop()
+        assert sensor.get_csv_headings() == ['sda Composite', 'nvme0 Composite',
+                                             'nvme0 Sensor 1']
+        # only the drive without a hwmon sensor is queried with SMART
+        assert FakeDevice.created == ['/dev/sda']
+        sensor.update()
+        assert sensor.get_csv_data() == [33, 41.85, 44.85]
+        assert sensor.get_model('sda') == 'Fake SATA SSD'
+        write(join(hwmon, 'temp1_input'), 43850)
+        sensor.poll_smart()
+        sensor.update()
+        assert sensor.get_current(['sda', 'Composite']) == 34
+        assert sensor.get_mean(['nvme0', 'Composite']) == round((41.85 + 43.85) / 2)
+        assert sensor.get_max(['nvme0', 'Composite']) == 44
+    finally:
+        sensor.close()
+
+
+class FailingDevice(FakeDevice):
+    """pySMART Device stand-in for a drive whose queries fail after the first"""
+
+    def update(self) -> None:
+        raise OSError('smartctl failed')
+
+
+def test_failed_smart_query_keeps_temperature(tmp_path, monkeypatch, caplog):
+    hwmon_root, block_root, _ = make_tree(str(tmp_path))
+    makedirs(join(block_root, 'sdb', 'device'))
+    monkeypatch.setattr(drivetemp, 'Device', FailingDevice)
+    sensor = DriveTemp(smart_interval=3600, hwmon_root=hwmon_root, block_root=block_root)
+    try:
+        sensor.smart_updater.stop()
+        sensor.smart_devices['sdb'] = FakeDevice('/dev/sdb')
+        sensor.poll_smart()
+        sensor.update()
+        # sda failed and kept its first reading, sdb was still queried
+        assert sensor.get_current(['sda', 'Composite']) == 33
+        assert sensor.get_current(['sdb', 'Composite']) == 34
+        assert 'SMART query of sda failed' in caplog.text
+    finally:
+        sensor.close()
@@ -0,0 +1,71 @@
+"""Tests for the EDAC sensor against a fake edac tree
+"""
+
+from types import SimpleNamespace
+from stressmon.edac import EDAC, match_locator
+
+
+class FakeDIMMInfo:
+    """DIMMInfo stand-in with two installed DIMMs"""
+
+    def get_dimms(self) -> list:
+        return [{'Locator': 'DIMM_A1', 'Part Number': 'PART-A1'},
+                {'Locator': 'DIMM_B1', 'Part Number': 'PART-B1'}]
+
+
+def write(path, value) -> None:
+    path.write_text(f"{value}\n")
+
+
+def make_tree(root, labels: tuple) -> None:
+    mc = root / 'mc0'
+    mc.mkdir()
+    write(mc / 'ce_count', 0)
+    write(mc / 'ue_count', 0)
+    for number, label in enumerate(labels):
+        dimm = mc / f"dimm{number}"
+        dimm.mkdir()
+        write(dimm / 'dimm_label', label)
+        write(dimm / 'dimm_ce_count', 0)
+        write(dimm / 'dimm_ue_count', 0)
+
+
+def make_sensor(root) -> EDAC:
+    return EDAC(SimpleNamespace(dimminfo=FakeDIMMInfo()), str(root))
+
+
+def test_match_locator():
+    assert match_locator('NODE 0 DIMM_B1', ['DIMM_A1', 'DIMM_B1']) == 1
+    assert match_locator('DIMM_A1', ['DIMM_A1', 'DIMM_B1']) == 0
+    assert match_locator('CPU_SrcID#0_Ha#0_Chan#0_DIMM#0', ['DIMM_A1']) is None
+
+
+def test_dimms_mapped_by_label(tmp_path):
+    make_tree(tmp_path, ('NODE 0 DIMM_B1', 'NODE 0 DIMM_A1'))
+    sensor = make_sensor(tmp_path)
+    assert sensor.get_part_number('mc0 DIMM_B1') == 'PART-B1'
+    assert sensor.get_part_number('mc0 DIMM_A1') == 'PART-A1'
+
+
+def test_dimms_mapped_by_position(tmp_path):
+    make_tree(tmp_path, ('mc#0csrow#0channel#0', 'mc#0csrow#1channel#0'))
+    sensor = make_sensor(tmp_path)
+    assert sensor.get_part_number('mc0 DIMM_A1') == 'PART-A1'
+    assert sensor.get_part_number('mc0 DIMM_B1') == 'PART-B1'
+
+
+def test_only_changes_are_reported(tmp_path):
+    make_tree(tmp_path, ('DIMM_A1', 'DIMM_B1'))
+    sensor = make_sensor(tmp_path)
+    headings = sensor.get_csv_headings()
+    sensor.update()
+    assert sensor.get_csv_data() == [None] * len(headings)
+    write(tmp_path / 'mc0' / 'ce_count', 2)
+    write(tmp_path / 'mc0' / 'dimm1' / 'dimm_ce_count', 2)
+    sensor.update()
+    assert sensor.get_changes() == {'mc0 Correctable': 2, 'mc0 DIMM_B1 Correctable': 2}
+    data = dict(zip(headings, sensor.get_csv_data()))
+    assert data['mc0 DIMM_B1 Correctable'] == 2
+    assert data['mc0 DIMM_A1 Correctable'] is None
+    sensor.update()
+    assert sensor.get_changes() == {}
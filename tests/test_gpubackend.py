@@ -0,0 +1,60 @@
+"""Tests for the sysfs Intel GPU backend against a fake drm tree
+"""
+
+from os import makedirs, symlink
+from os.path import join
+from stressmon import gpubackend
+from stressmon.gpubackend import IntelSysfsBackend
+
+
+def write(path: str, value) -> None:
+    with open(path, 'w', encoding='utf-8') as sysfs_file:
+        sysfs_file.write(f"{value}\n")
+
+
+def make_card(root: str) -> str:
+    card = join(root, 'card0')
+    hwmon = join(card, 'device', 'hwmon', 'hwmon5')
+    makedirs(hwmon)
+    makedirs(join(card, 'power'))
+    makedirs(join(root, 'drivers', 'i915'))
+    symlink(join(root, 'drivers', 'i915'), join(card, 'device', 'driver'))
+    write(join(card, 'device', 'vendor'), '0x8086')
+    write(join(card, 'device', 'device'), '0x56a0')
+    write(join(card, 'device', 'subsystem_vendor'), '0x8086')
+    write(join(card, 'gt_act_freq_mhz'), 300)
+    write(join(card, 'power', 'rc6_residency_ms'), 1000)
+    write(join(hwmon, 'energy1_input'), 5000000)
+    write(join(hwmon, 'temp1_input'), 45000)
+    return card
+
+
+def test_counters_give_power_and_utilization(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    card = make_card(root)
+    now = [0]
+    monkeypatch.setattr(gpubackend, 'monotonic_ns', lambda: now[0])
+    backend = IntelSysfsBackend()
+    backend.drm = root
+    info = backend.discover()
+    assert list(info) == ['Device_56a0-0']
+    # one second later: 250 ms in RC6 and 12 J used
+    now[0] = 1000000000
+    write(join(card, 'gt_act_freq_mhz'), 1200)
+    write(join(card, 'power', 'rc6_residency_ms'), 1250)
+    write(join(card, 'device', 'hwmon', 'hwmon5', 'energy1_input'), 17000000)
+    batch = backend.read()['Device_56a0-0']
+    backend.close()
+    assert batch['clock'] == 1200
+    assert batch['temp'] == 45.0
+    assert batch['power'] == 12.0
+    assert batch['utilization'] == 75.0
+
+
+def test_non_intel_cards_are_skipped(tmp_path):
+    root = str(tmp_path)
+    card = make_card(root)
+    write(join(card, 'device', 'vendor'), '0x10de')
+    backend = IntelSysfsBackend()
+    backend.drm = root
+    assert not backend.discover()
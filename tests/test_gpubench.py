@@ -0,0 +1,73 @@
+"""Tests for the gpu_burn and glmark2 output parsers and the benchmark sensor
+"""
+
+from types import SimpleNamespace
+from stressmon.gpubench import GPUBench, parse_glmark2, parse_gpu_burn
+
+GPU_BURN_LINE = ("50.0%  proc'd: 1463 (16512 Gflop/s) - 1440 (16398 Gflop/s)   "
+                 "errors: 0 - 3   temps: 75 C - 73 C \n")
+
+
+def test_parse_gpu_burn():
+    assert parse_gpu_burn(GPU_BURN_LINE) == [(16512, 0), (16398, 3)]
+    assert parse_gpu_burn("10.0%  proc'd: 10 (900 Gflop/s)   errors: 0   temps: 50 C") == \
+        [(900, 0)]
+    # error counts that don't line up with the GPUs aren't guessed
+    assert parse_gpu_burn("proc'd: 1 (10 Gflop/s) - 2 (20 Gflop/s) errors: 0") == \
+        [(10, None), (20, None)]
+    assert parse_gpu_burn('Burning for 60 seconds.') is None
+
+
+def test_parse_glmark2():
+    assert parse_glmark2('[build] use-vbo=false: FPS: 2841 FrameTime: 0.352 ms') == \
+        ('build', 2841)
+    assert parse_glmark2('                                  glmark2 Score: 3012 ') == \
+        ('Score', 3012)
+    assert parse_glmark2('=======================================================') is None
+
+
+def test_gpubench_follows_logs(tmp_path):
+    gpu_burn = tmp_path / 'gpu_burn.log'
+    glmark2 = tmp_path / 'glmark2.log'
+    gpu_burn.write_text('')
+    glmark2.write_text('')
+    gpudata = SimpleNamespace(
+        get_gpu_names=lambda vendor: ['RTX A-0', 'RTX A-1'],
+        gpus={'nvidia': {'RTX A-0': {'power': 200.0}, 'RTX A-1': {'power': None}}})
+    sensor = GPUBench(str(gpu_burn), str(glmark2), gpudata, glmark2_gpu=1)
+    assert sensor.get_csv_headings() == [
+        'RTX A-0 gpu_burn Gflop/s', 'RTX A-0 gpu_burn Errors', 'RTX A-0 gpu_burn Gflop/s/W',
+        'RTX A-1 gpu_burn Gflop/s', 'RTX A-1 gpu_burn Errors', 'RTX A-1 gpu_burn Gflop/s/W',
+        'RTX A-1 glmark2 FPS', 'RTX A-1 glmark2 Score', 'RTX A-1 glmark2 FPS/W']
+    sensor.update()
+    assert sensor.get_csv_data() == [None] * 9
+    gpu_burn.write_text("10.0%  proc'd: 1 (10000 Gflop/s) - 1 (9000 Gflop/s)   errors: 0 - 0\n"
+                        + GPU_BURN_LINE)
+    glmark2.write_text('[build] use-vbo=false: FPS: 2841 FrameTime: 0.352 ms\n'
+                       '[texture] texture-filter=nearest: FPS: 3000 FrameTime: 0.333 ms\n')
+    sensor.update()
+    # the latest progress line of the tick counts
+    assert sensor.get_csv_data() == [16512, 0, 82.56, 16398, 3, None, 3000, None, None]
+    assert sensor.get_scene() == 'texture'
+    assert sensor.get_subsection(['RTX A-1', 'glmark2', 'FPS']) == 'glmark2 [texture]'
+    with open(glmark2, 'a', encoding='UTF-8') as log:
+        log.write('                                  glmark2 Score: 3012 \n')
+    sensor.update()
+    # results not reported this tick stay current but don't count again
+    assert sensor.get_current(['RTX A-0', 'gpu_burn', 'Gflop/s']) == 16512
+    assert sensor.stats.counts[0] == 1
+    assert sensor.get_current(['RTX A-1', 'glmark2', 'Score']) == 3012
+    assert sensor.get_mean(['RTX A-1', 'glmark2', 'FPS']) == 3000
+
+
+def test_gpubench_without_gpudata(tmp_path):
+    gpu_burn = tmp_path / 'gpu_burn.log'
+    gpu_burn.write_text(GPU_BURN_LINE)
+    sensor = GPUBench(str(gpu_burn), gpu_count=1)
+    sensor.update()
+    # progress for more GPUs than known is ignored
+    assert sensor.get_csv_headings() == ['GPU 0 gpu_burn Gflop/s', 'GPU 0 gpu_burn Errors',
+                                         'GPU 0 gpu_burn Gflop/s/W']
+    assert sensor.get_csv_data() == [16512, 0, None]
+    assert not sensor.is_empty()
+    assert GPUBench().is_empty()
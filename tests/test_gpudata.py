@@ -0,0 +1,72 @@
+"""Tests for GPUData statistics
+"""
+
+from stressmon.gpubackend import FakeGPUBackend
+from stressmon.gpudata import GPUData
+
+
+class GappyBackend(FakeGPUBackend):
+    """Fake GPU whose power reading is missing every other poll"""
+
+    def __init__(self) -> None:
+        super().__init__(interval=3600)
+        self.polls = 0
+
+    def read(self) -> dict:
+        self.polls += 1
+        batch = {}
+        for name in self.gpus:
+            power = 100.0 if self.polls % 2 else None
+            batch[name] = {'temp': 40.0 + self.polls, 'power': power}
+        return batch
+
+
+def test_mean_counts_only_samples_with_values():
+    backend = GappyBackend()
+    gpudata = GPUData(backends=[backend])
+    try:
+        for _ in range(4):
+            gpudata.table.poll(backend)
+            gpudata.update()
+        name = gpudata.get_gpu_names('fake')[0]
+        assert gpudata.get_mean(['fake', name, 'power']) == 100
+        assert gpudata.get_min(['fake', name, 'temp']) == 42
+        assert gpudata.get_max(['fake', name, 'temp']) == 45
+        assert gpudata.get_mean(['fake', name, 'fan_speed']) is None
+    finally:
+        gpudata.close()
+
+
+class BrokenBackend(FakeGPUBackend):
+    """Fake GPU whose first read fails"""
+
+    def __init__(self) -> None:
+        super().__init__(interval=3600)
+        self.polls = 0
+
+    def read(self) -> dict:
+        self.polls += 1
+        if self.polls == 1:
+            raise OSError('device busy')
+        return super().read()
+
+
+def test_stats_only_for_reported_fields():
+    gpudata = GPUData(backends=[GappyBackend()])
+    try:
+        name = gpudata.get_gpu_names('fake')[0]
+        assert sorted(data for _, _, data in gpudata.index) == ['power', 'temp']
+        assert gpudata.get_stats().size == 2
+        assert gpudata.get_min(['fake', name, 'fan_speed']) is None
+    finally:
+        gpudata.close()
+
+
+def test_failed_first_poll_is_logged(caplog):
+    gpudata = GPUData(backends=[BrokenBackend()])
+    try:
+        assert gpudata.get_vendors() == ['fake']
+        assert gpudata.index == {}
+        assert 'first poll of fake GPUs failed' in caplog.text
+    finally:
+        gpudata.close()
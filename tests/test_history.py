@@ -0,0 +1,45 @@
+"""Tests for the multi-resolution history
+"""
+
+from stressmon import history
+from stressmon.history import History
+
+
+def test_raw_samples_and_missing_values():
+    samples = History(2, raw=10, tiers=((10, 5),))
+    for timestamp in range(5):
+        samples.update([float(timestamp), None], timestamp)
+    assert samples.query(0, 1, 3) == [(1, 1, 1, 1), (2, 2, 2, 2), (3, 3, 3, 3)]
+    assert samples.query(1) == [(timestamp, None, None, None) for timestamp in range(5)]
+
+
+def test_full_range_query_reaches_the_newest_sample():
+    samples = History(1)
+    for timestamp in range(1000, 21000):
+        samples.update([float(timestamp)], timestamp)
+    entries = samples.query(0)
+    timestamps = [entry[0] for entry in entries]
+    assert timestamps == sorted(set(timestamps))
+    # buckets start on multiples of their width
+    assert timestamps[0] == 960
+    assert timestamps[-1] == 20999
+    # 1 minute buckets, then the 10 s buckets and raw samples after the last one
+    assert entries[-16] == (20880, 20880, 20939, 20909.5)
+    assert timestamps[-15:] == [20940, 20950, 20960, 20970, 20980] + list(range(20990, 21000))
+
+
+def test_query_picks_the_finest_tier_reaching_back():
+    samples = History(1, raw=30, tiers=((10, 100),))
+    for timestamp in range(100):
+        samples.update([float(timestamp)], timestamp)
+    assert samples.query(0, 80) == [(timestamp, timestamp, timestamp, timestamp)
+                                    for timestamp in range(80, 100)]
+    assert samples.query(0, 20, 45) == [(20, 20, 29, 24.5), (30, 30, 39, 34.5),
+                                        (40, 40, 49, 44.5)]
+
+
+def test_default_timestamps_are_monotonic(monkeypatch):
+    monkeypatch.setattr(history, 'monotonic', lambda: 12.5)
+    samples = History(1)
+    samples.update([1.0])
+    assert samples.query(0) == [(12.5, 1.0, 1.0, 1.0)]
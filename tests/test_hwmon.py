@@ -0,0 +1,58 @@
+"""Tests for HWMon channel discovery against a fake hwmon tree
+"""
+
+from stressmon.hwmon import HWMon, find_hwmon_channels
+
+
+def make_chip(root, number: int, name: str, channels: dict) -> None:
+    hwmon = root / f"hwmon{number}"
+    hwmon.mkdir()
+    (hwmon / 'name').write_text(f"{name}\n")
+    for channel, (value, label) in channels.items():
+        (hwmon / channel).write_text(f"{value}\n")
+        if label is not None:
+            (hwmon / channel.replace('_input', '_label')
+             .replace('_average', '_label')).write_text(f"{label}\n")
+
+
+def make_tree(root) -> None:
+    make_chip(root, 0, 'nvme', {'temp1_input': (40000, 'Composite')})
+    make_chip(root, 1, 'nvme', {'temp1_input': (42000, 'Composite')})
+    make_chip(root, 2, 'coretemp', {'temp1_input': (50000, 'Package id 0')})
+    make_chip(root, 3, 'coretemp', {'temp1_input': (51000, 'Package id 1')})
+    make_chip(root, 4, 'nct6798', {'in0_input': (1216, 'Vcore'),
+                                   'in1_input': (1008, 'Vcore'),
+                                   'power1_average': (95000000, 'CPU'),
+                                   'power1_input': (96000000, 'CPU'),
+                                   'curr1_input': (2500, None)})
+    make_chip(root, 10, 'nct6798', {'temp1_input': (35000, 'SYSTIN')})
+
+
+def test_channels_are_unique(tmp_path):
+    make_tree(tmp_path)
+    channels = find_hwmon_channels(str(tmp_path))
+    pairs = [(chip, label) for _, chip, label, _, _, _ in channels]
+    assert len(pairs) == len(set(pairs))
+    assert ('nvme-1', 'Composite(C)') in pairs
+    assert ('nct6798', 'Vcore in1(V)') in pairs
+    assert ('nct6798-1', 'SYSTIN(C)') in pairs
+
+
+def test_default_excludes_cover_every_chip_of_a_name(tmp_path):
+    make_tree(tmp_path)
+    sensor = HWMon(hwmon_root=str(tmp_path))
+    assert sensor.get_chips() == ['nct6798', 'nct6798-1']
+
+
+def test_readings(tmp_path):
+    make_tree(tmp_path)
+    sensor = HWMon(include=['nct6798 *'], hwmon_root=str(tmp_path))
+    sensor.update()
+    values = dict(zip(sensor.get_csv_headings(), sensor.get_csv_data()))
+    # an _input file replaces the _average one of the same channel, and the
+    # pattern matches both chips named nct6798
+    assert values == {'nct6798 Vcore(V)': 1.216, 'nct6798 Vcore in1(V)': 1.008,
+                      'nct6798 curr1(A)': 2.5, 'nct6798 CPU(W)': 96.0,
+                      'nct6798-1 SYSTIN(C)': 35.0}
+    sensor = HWMon(include=['nct6798-1 *'], hwmon_root=str(tmp_path))
+    assert sensor.get_chips() == ['nct6798-1']
@@ -0,0 +1,113 @@
+"""Tests for the sensor base class: shadow stats, raw values and epochs
+"""
+
+from pytest import raises
+from stressmon.hwsensors import HWSensorBase
+from stressmon.stats import Stats
+from stressmon.updatepool import UpdatePool
+
+
+class IndexedSensor(HWSensorBase):
+    """Sensor keeping its own Stats, using the base class getters"""
+
+    def __init__(self) -> None:
+        self.labels = [['sda', 'Read(MB/s)'], ['sda', 'Write(MB/s)']]
+        self.index = {tuple(label): i for i, label in enumerate(self.labels)}
+        self.values = [None, None]
+        self.stats = Stats(2)
+
+    def update(self) -> None:
+        self.stats.update(self.values)
+
+    def get_label(self, params: list) -> str | None:
+        return params[1]
+
+    def get_section(self, params: list) -> str | None:
+        return params[0]
+
+    def get_subsection(self, params: list) -> str | None:
+        return None
+
+    def is_empty(self) -> bool:
+        return False
+
+
+def test_shadow_stats_use_raw_values(fake_sensor):
+    sensor = fake_sensor({'Core 0': 0.0, 'Core 1': 0.0})
+    pool = UpdatePool()
+    pool.add_executor('FakeSensor', sensor.update)
+    # the shadow stats exist before any update thread runs
+    assert sensor.stat_keys == {('Core 0',): 0, ('Core 1',): 1}
+    sensor.pending = [[40.4, 50.0], [40.4, 50.0], [41.6, 52.0]]
+    pool.do_updates()
+    pool.open_epoch('load')
+    pool.do_updates()
+    pool.do_updates()
+    pool.close_epoch('load')
+    summary = pool.summary('load')['FakeSensor']
+    assert summary['Core 0'] == {'min': 40.4, 'max': 41.6, 'mean': 41.0, 'count': 2}
+    assert summary['Core 1']['mean'] == 51.0
+    # lifetime stats go on, unrounded too
+    assert round(sensor.get_stats().get_mean(0), 6) == 40.8
+
+
+def test_base_getters_and_csv():
+    sensor = IndexedSensor()
+    assert sensor.get_current(['sda', 'Read(MB/s)']) is None
+    assert sensor.get_min(['sda', 'Read(MB/s)']) is None
+    for values in ([1.24, None], [2.0, 0.5]):
+        sensor.values = values
+        sensor.update()
+    assert sensor.get_current(['sda', 'Read(MB/s)']) == 2
+    assert sensor.get_min(['sda', 'Read(MB/s)']) == 1
+    assert sensor.get_max(['sda', 'Write(MB/s)']) == 0
+    assert sensor.get_mean(['sda', 'Read(MB/s)']) == 2
+    assert sensor.get_mean(['sdb', 'Read(MB/s)']) is None
+    assert sensor.get_csv_headings() == ['sda Read(MB/s)', 'sda Write(MB/s)']
+    sensor.values = [1.23456, None]
+    assert sensor.get_csv_data() == [1.2346, None]
+    # own stats are used as they are, record() adds nothing
+    sensor.record()
+    assert sensor.get_stats().counts == [2, 1]
+
+
+def test_legacy_getters_read_shadow_stats(fake_sensor):
+    sensor = fake_sensor({'Core 0': 0.0, 'Core 1': 0.0})
+    assert sensor.get_mean(['Core 0']) is None
+    sensor.tick([40.4, 50.0])
+    sensor.tick([41.6, 52.0])
+    assert sensor.get_min(['Core 0']) == 40
+    assert sensor.get_max(['Core 1']) == 52
+    assert sensor.get_mean(['Core 0']) == 41
+    assert sensor.get_mean(['Core 2']) is None
+    # each sensor guards its own shadow stats
+    other = fake_sensor({'Core 0': 0.0})
+    other.get_stats()
+    assert sensor.stats_lock is not other.stats_lock
+
+
+class BareSensor(HWSensorBase):
+    """Sensor with neither its own getters nor index, values and labels"""
+
+    def update(self) -> None:
+        pass
+
+    def get_label(self, params: list) -> str | None:
+        return None
+
+    def get_section(self, params: list) -> str | None:
+        return None
+
+    def get_subsection(self, params: list) -> str | None:
+        return None
+
+    def is_empty(self) -> bool:
+        return True
+
+
+def test_missing_contract_is_reported():
+    sensor = BareSensor()
+    with raises(NotImplementedError, match='BareSensor must implement get_current'):
+        sensor.get_current(['x'])
+    with raises(NotImplementedError, match='self.labels'):
+        sensor.get_csv_headings()
@@ -0,0 +1,96 @@
+"""Replay tests for IntelGPUTop against recorded intel_gpu_top -J output
+"""
+
+from io import StringIO
+from os.path import dirname, join
+from threading import Thread
+from stressmon.intelgputop import IntelGPUTop, JSONStreamDecoder, flatten_sample
+
+FIXTURE = join(dirname(__file__), 'data', 'intel_gpu_top.json')
+
+
+def read_fixture() -> str:
+    with open(FIXTURE, encoding='utf-8') as fixture:
+        return fixture.read()
+
+
+def decode(text: str, chunk: int) -> list:
+    decoder = JSONStreamDecoder()
+    samples = []
+    for start in range(0, len(text), chunk):
+        samples += decoder.feed(text[start:start + chunk])
+    return samples
+
+
+def test_decoder_is_independent_of_chunking():
+    text = read_fixture()
+    whole = decode(text, len(text))
+    assert len(whole) == 3
+    for chunk in (1, 7, 64, 4096):
+        assert decode(text, chunk) == whole
+
+
+def test_decoder_holds_only_the_pending_sample():
+    text = read_fixture()
+    decoder = JSONStreamDecoder()
+    decoder.feed(text)
+    # the recording stops part way through a fourth sample
+    assert decoder.depth == 1
+    assert decoder.buffer.getvalue() == text[text.rindex('{\n\t"period"'):]
+
+
+def test_decoder_skips_braces_in_strings():
+    text = '[\n{"name": "a}{\\"b\\\\", "engines": {"Video/0": {"busy": 1.5}}},\n{"name": "}"}'
+    expected = [{'name': 'a}{"b\\', 'engines': {'Video/0': {'busy': 1.5}}}, {'name': '}'}]
+    # every split, including between a backslash and the character it escapes
+    for chunk in (1, 2, 3, 5, len(text)):
+        assert decode(text, chunk) == expected
+
+
+def test_flatten_sample_takes_busiest_engine_instance():
+    sample = decode(read_fixture(), 4096)[1]
+    values = flatten_sample(sample)
+    assert values['freq_actual'] == 1100.0
+    assert values['video_busy'] == 30.1
+    assert values['compute_busy'] is None
+
+
+def test_replay_statistics_and_csv():
+    gpu = IntelGPUTop(devices={'Test GPU-0': 'pci:vendor=8086,device=56A0'}, start=False)
+    headings = gpu.get_csv_headings()
+    gpu.update()
+    # no sample yet: the columns are there, the values and stats are empty
+    assert gpu.get_csv_headings() == headings
+    assert gpu.get_csv_data() == [None] * len(headings)
+    assert gpu.get_mean(['Test GPU-0', 'freq_actual']) is None
+    decoder = JSONStreamDecoder()
+    for line in StringIO(read_fixture()):
+        for sample in decoder.feed(line):
+            gpu.samples['Test GPU-0'] = sample
+            gpu.update()
+    assert gpu.get_current(['Test GPU-0', 'freq_actual']) == 1250
+    assert gpu.get_min(['Test GPU-0', 'freq_actual']) == 350
+    assert gpu.get_max(['Test GPU-0', 'freq_actual']) == 1250
+    assert gpu.get_mean(['Test GPU-0', 'freq_actual']) == round((350 + 1100 + 1250) / 3)
+    data = gpu.get_csv_data()
+    assert len(data) == len(headings)
+    assert data[headings.index('Test GPU-0 compute_busy')] is None
+    assert data[headings.index('Test GPU-0 power_gpu')] == 11.02
+
+
+def test_consume_replays_a_recorded_stream():
+    gpu = IntelGPUTop(devices={'Test GPU-0': 'pci:vendor=8086,device=56A0'}, start=False)
+    with open(FIXTURE, encoding='utf-8') as stream:
+        gpu.consume('Test GPU-0', stream)
+    assert gpu.get_sample('Test GPU-0')['frequency']['actual'] == 1250.0
+
+
+def test_stop_before_the_stream_is_registered():
+    gpu = IntelGPUTop(devices={'Test GPU-0': 'pci:vendor=8086,device=56A0'}, start=False)
+    # a stream that never writes a sample and ignores its arguments
+    gpu.command = ['sh', '-c', 'sleep 30', 'sh']
+    gpu.stop_monitoring()
+    thread = Thread(target=gpu.monitor, args=('Test GPU-0', 'unused'), daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
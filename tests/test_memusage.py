@@ -0,0 +1,52 @@
+"""Tests for MemUsage /proc/meminfo parsing
+"""
+
+from stressmon.memusage import MemUsage
+
+MEMINFO = """MemTotal:       16000000 kB
+MemFree:         4000000 kB
+MemAvailable:    8000000 kB
+Buffers:          500000 kB
+Cached:          3000000 kB
+SwapCached:            0 kB
+Active:          6000000 kB
+SwapTotal:       2000000 kB
+SwapFree:        1500000 kB
+Dirty:              1200 kB
+Writeback:             0 kB
+AnonPages:       5000000 kB
+Slab:             700000 kB
+SReclaimable:     400000 kB
+Committed_AS:   12000000 kB
+AnonHugePages:    204800 kB
+HugePages_Total:       0
+HugePages_Free:        0
+"""
+
+
+def make_sensor(tmp_path, text: str = MEMINFO) -> MemUsage:
+    meminfo = tmp_path / 'meminfo'
+    meminfo.write_text(text)
+    return MemUsage(str(meminfo))
+
+
+def test_meminfo_fields(tmp_path):
+    mem = make_sensor(tmp_path)
+    mem.update()
+    values = dict(zip(mem.get_csv_headings(), mem.get_csv_data()))
+    assert values['Mem Total'] == 16000000 * 1024
+    assert values['Mem Available'] == 8000000 * 1024
+    # used excludes free memory, buffers and reclaimable cache
+    assert values['Mem Used'] == (16000000 - 4000000 - 3400000 - 500000) * 1024
+    assert values['Mem Cached'] == 3400000 * 1024
+    assert values['Mem Percent'] == 50.0
+    assert values['Mem AnonHugePages'] == 204800 * 1024
+    assert values['Swap Used'] == 500000 * 1024
+    assert values['Swap Percent'] == 25.0
+
+
+def test_meminfo_without_swap(tmp_path):
+    mem = make_sensor(tmp_path, MEMINFO.replace('2000000', '0').replace('1500000', '0'))
+    mem.update()
+    assert mem.get_current(['Swap', 'Percent']) == 0
+    assert mem.get_mean(['Mem', 'Percent']) == 50
@@ -0,0 +1,58 @@
+"""Tests for NetIO /proc/net/dev parsing
+"""
+
+from stressmon import netio
+from stressmon.netio import NetIO, link_speed
+
+HEADER = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+"""
+
+
+def netdev(counters: dict) -> str:
+    lines = [HEADER.rstrip('\n')]
+    for interface, (rx_bytes, rx_packets, rx_errs, rx_drop,
+                    tx_bytes, tx_packets, tx_errs, tx_drop) in counters.items():
+        lines.append(f"{interface:>6}: {rx_bytes} {rx_packets} {rx_errs} {rx_drop} 0 0 0 0 "
+                     f"{tx_bytes} {tx_packets} {tx_errs} {tx_drop} 0 0 0 0")
+    return "\n".join(lines) + "\n"
+
+
+def make_tree(tmp_path) -> tuple:
+    net = tmp_path / 'net'
+    for interface, speed in (('lo', None), ('eth0', '1000'), ('wlan0', '-1')):
+        (net / interface).mkdir(parents=True)
+        if speed is not None:
+            (net / interface / 'speed').write_text(speed + "\n")
+    dev = tmp_path / 'dev'
+    dev.write_text(netdev({'lo': [0] * 8, 'eth0': [0] * 8, 'wlan0': [0] * 8}))
+    return net, dev
+
+
+def test_link_speed(tmp_path):
+    net, _ = make_tree(tmp_path)
+    assert link_speed('eth0', str(net)) == 1000
+    assert link_speed('wlan0', str(net)) is None
+    assert link_speed('lo', str(net)) is None
+
+
+def test_rates_from_counter_deltas(tmp_path, monkeypatch):
+    net, dev = make_tree(tmp_path)
+    now = [0]
+    monkeypatch.setattr(netio, 'monotonic_ns', lambda: now[0])
+    sensor = NetIO(netdev=str(dev), net_root=str(net))
+    assert sensor.get_interfaces() == ['eth0', 'wlan0']
+    dev.write_text(netdev({'lo': [5] * 8,
+                           'eth0': [250000000, 200000, 1, 3, 50000000, 40000, 0, 2],
+                           'wlan0': [1000000, 1000, 0, 0, 0, 0, 0, 0]}))
+    now[0] = 2000000000
+    sensor.update()
+    values = dict(zip(sensor.get_csv_headings(), sensor.get_csv_data()))
+    assert values['eth0 RX(MB/s)'] == 125.0
+    assert values['eth0 TX(pkt/s)'] == 20000.0
+    assert values['eth0 RX Drops'] == 3
+    assert values['eth0 RX Errors'] == 1
+    assert values['eth0 TX Drops'] == 2
+    assert values['eth0 RX Util(%)'] == 100.0
+    assert values['eth0 TX Util(%)'] == 20.0
+    assert values['wlan0 RX Util(%)'] is None
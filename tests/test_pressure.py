@@ -0,0 +1,45 @@
+"""Tests for the PSI pressure sensor
+"""
+
+from stressmon.pressure import PSI_DATA, Pressure
+
+
+def psi(some_avg10: float, some_total: int, full: tuple | None = None) -> str:
+    text = f"some avg10={some_avg10:.2f} avg60=0.00 avg300=0.00 total={some_total}\n"
+    if full is not None:
+        text += f"full avg10={full[0]:.2f} avg60=0.00 avg300=0.00 total={full[1]}\n"
+    return text
+
+
+def write_pressure(root, cpu: tuple, memory: tuple, io: tuple) -> None:
+    (root / 'cpu').write_text(psi(*cpu))
+    (root / 'memory').write_text(psi(*memory))
+    (root / 'io').write_text(psi(*io))
+
+
+def test_stall_time_since_previous_tick(tmp_path):
+    write_pressure(tmp_path, (1.5, 1000000), (0.0, 0, (0.0, 0)), (2.0, 50000, (1.0, 20000)))
+    sensor = Pressure(pressure_root=str(tmp_path))
+    assert len(sensor.get_csv_headings()) == 3 * len(PSI_DATA)
+    write_pressure(tmp_path, (3.25, 1250000), (0.0, 0, (0.0, 0)), (4.0, 90000, (2.0, 30000)))
+    sensor.update()
+    assert sensor.get_current(['System', 'cpu', 'some stall(ms)']) == 250
+    assert sensor.get_current(['System', 'cpu', 'some avg10']) == 3
+    # older kernels report no full line for cpu
+    assert sensor.get_current(['System', 'cpu', 'full avg10']) is None
+    assert sensor.get_current(['System', 'io', 'full stall(ms)']) == 10
+    assert sensor.get_current(['System', 'io', 'some stall(ms)']) == 40
+
+
+def test_cgroup_pressure(tmp_path):
+    system = tmp_path / 'proc'
+    system.mkdir()
+    write_pressure(system, (0.0, 0), (0.0, 0, (0.0, 0)), (0.0, 0, (0.0, 0)))
+    group = tmp_path / 'stress'
+    group.mkdir()
+    (group / 'cpu.pressure').write_text(psi(0.0, 0, (0.0, 0)))
+    sensor = Pressure(str(group), pressure_root=str(system))
+    assert [label[0] for label in sensor][-1] == str(group)
+    (group / 'cpu.pressure').write_text(psi(10.0, 500000, (5.0, 200000)))
+    sensor.update()
+    assert sensor.get_current([str(group), 'cpu', 'full stall(ms)']) == 200
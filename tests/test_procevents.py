@@ -0,0 +1,51 @@
+"""Tests for proc connector message parsing
+"""
+
+from errno import ENOBUFS
+from socket import timeout
+from stressmon import procevents
+from stressmon.procevents import CN_MSG, NLMSG_HEADER, PROC_EVENT, PROC_EVENT_EXEC, \
+    PROC_EVENT_EXIT, PROC_EVENT_FORK, PROC_EVENT_IDS, PROC_EVENT_LOST, ProcConnector, \
+    parse_proc_event
+
+
+def message(what: int, timestamp: int, ids: tuple) -> bytes:
+    event = PROC_EVENT.pack(what, 0, timestamp) + PROC_EVENT_IDS.pack(*ids)
+    header = CN_MSG.pack(1, 1, 0, 0, len(event), 0)
+    size = NLMSG_HEADER.size + len(header) + len(event)
+    return NLMSG_HEADER.pack(size, 3, 0, 0, 0) + header + event
+
+
+def test_parse_proc_event():
+    assert parse_proc_event(message(PROC_EVENT_FORK, 5, (1, 1, 20, 20))) == \
+        (PROC_EVENT_FORK, 5, 20, 20, 1)
+    assert parse_proc_event(message(PROC_EVENT_EXEC, 6, (20, 20, 0, 0))) == \
+        (PROC_EVENT_EXEC, 6, 20, 20, None)
+    assert parse_proc_event(message(PROC_EVENT_EXIT, 7, (21, 20, 0, 0))) == \
+        (PROC_EVENT_EXIT, 7, 21, 20, None)
+    # uid change
+    assert parse_proc_event(message(0x4, 8, (20, 20, 0, 0))) is None
+    assert parse_proc_event(message(PROC_EVENT_EXIT, 7, (21, 20, 0, 0))[:-4]) is None
+
+
+class FakeSocket:
+    """Socket whose recv() raises a given error"""
+
+    def __init__(self, error: OSError) -> None:
+        self.error = error
+
+    def settimeout(self, _) -> None:
+        pass
+
+    def recv(self, _) -> bytes:
+        raise self.error
+
+
+def test_read_reports_overflow(monkeypatch):
+    monkeypatch.setattr(procevents, 'monotonic_ns', lambda: 42)
+    connector = object.__new__(ProcConnector)
+    connector.sock = FakeSocket(timeout())
+    assert connector.read() is None
+    connector.sock = FakeSocket(OSError(ENOBUFS, 'No buffer space available'))
+    assert connector.read() == (PROC_EVENT_LOST, 42, None, None, None)
+    connector.sock = None
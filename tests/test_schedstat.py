@@ -0,0 +1,57 @@
+"""Tests for SchedStat against recorded /proc/stat and /proc/softirqs
+"""
+
+from stressmon import schedstat
+from stressmon.schedstat import SchedStat
+
+
+def proc_stat(ctxt: int, intr: int, processes: int, running: int, blocked: int) -> str:
+    return (f"cpu  100 0 50 1000 10 0 5 0 0 0\n"
+            f"cpu0 50 0 25 500 5 0 2 0 0 0\n"
+            f"cpu1 50 0 25 500 5 0 3 0 0 0\n"
+            f"intr {intr} 9 0 0\n"
+            f"ctxt {ctxt}\n"
+            f"btime 1700000000\n"
+            f"processes {processes}\n"
+            f"procs_running {running}\n"
+            f"procs_blocked {blocked}\n"
+            f"softirq 100 0 50 50 0 0 0 0 0 0 0\n")
+
+
+def softirqs(timer: tuple, net_rx: tuple) -> str:
+    return ("                    CPU0       CPU1\n"
+            f"          TIMER:  {timer[0]:>8}  {timer[1]:>8}\n"
+            f"         NET_RX:  {net_rx[0]:>8}  {net_rx[1]:>8}\n")
+
+
+def test_rates_and_gauges(tmp_path, monkeypatch):
+    stat = tmp_path / 'stat'
+    irqs = tmp_path / 'softirqs'
+    stat.write_text(proc_stat(1000, 5000, 300, 1, 0))
+    irqs.write_text(softirqs((100, 200), (10, 0)))
+    now = [0]
+    monkeypatch.setattr(schedstat, 'monotonic_ns', lambda: now[0])
+    sensor = SchedStat(str(stat), str(irqs))
+    assert sensor.get_csv_headings() == [
+        'System Context Switches/s', 'System Interrupts/s', 'System Forks/s',
+        'System Running', 'System Blocked', 'Softirqs TIMER/s', 'Softirqs NET_RX/s',
+        'Softirqs CPU0/s', 'Softirqs CPU1/s']
+    stat.write_text(proc_stat(5000, 9000, 310, 12, 2))
+    irqs.write_text(softirqs((300, 400), (50, 20)))
+    now[0] = 2000000000
+    sensor.update()
+    assert sensor.get_csv_data() == [2000.0, 2000.0, 5.0, 12, 2, 200.0, 30.0, 120.0, 110.0]
+
+
+def test_no_elapsed_time_gives_no_rates(tmp_path, monkeypatch):
+    stat = tmp_path / 'stat'
+    irqs = tmp_path / 'softirqs'
+    stat.write_text(proc_stat(1000, 5000, 300, 1, 0))
+    irqs.write_text(softirqs((100, 200), (10, 0)))
+    monkeypatch.setattr(schedstat, 'monotonic_ns', lambda: 0)
+    sensor = SchedStat(str(stat), str(irqs))
+    sensor.update()
+    assert sensor.get_current(['System', 'Context Switches/s']) is None
+    assert sensor.get_current(['Softirqs', 'CPU0/s']) is None
+    assert sensor.get_current(['System', 'Running']) == 1
+    assert sensor.stats.get_summary(0) is None
@@ -0,0 +1,62 @@
+"""Tests for SMARTHealth change reporting and refresh errors
+"""
+
+from types import SimpleNamespace
+from stressmon import smarthealth
+from stressmon.smarthealth import SMARTHealth, read_nvme_attributes
+
+
+class FakeDriveTemp:
+    """DriveTemp stand-in listing two NVMe drives and a SATA drive"""
+
+    def get_drive_names(self) -> list:
+        return ['nvme0', 'nvme1', 'sda']
+
+    def get_model(self, _) -> str:
+        return 'Fake NVMe'
+
+
+class FakeDevice:
+    """pySMART Device stand-in whose media errors grow on every update"""
+
+    def __init__(self, name: str) -> None:
+        if name == 'nvme1':
+            raise OSError("smartctl failed")
+        self.if_attributes = SimpleNamespace(percentageUsed=3, integrityErrors=0,
+                                             dataUnitsWritten=1000)
+
+    def update(self) -> None:
+        self.if_attributes.integrityErrors += 1
+
+
+def test_read_nvme_attributes_prefers_first_name():
+    device = SimpleNamespace(if_attributes=SimpleNamespace(
+        mediaAndDataIntegrityErrors=7, thermalTemp1TransitionCount=2))
+    values = read_nvme_attributes(device)
+    assert values['Media Errors'] == 7
+    assert values['Thermal 1 Transitions'] == 2
+    assert values['Percentage Used'] is None
+
+
+def test_csv_reports_only_changes(monkeypatch):
+    monkeypatch.setattr(smarthealth, 'Device', FakeDevice)
+    health = SMARTHealth(FakeDriveTemp(), refresh_interval=3600)
+    health.close()
+    headings = health.get_csv_headings()
+    assert len(headings) == 2 * len(smarthealth.NVME_ATTRIBUTES)
+    health.update()
+    data = dict(zip(headings, health.get_csv_data()))
+    assert data['nvme0 Percentage Used'] == 3
+    assert data['nvme0 Media Errors'] == 0
+    # the failed drive has no attributes and doesn't stop the others
+    assert data['nvme1 Percentage Used'] is None
+    health.update()
+    assert health.get_csv_data() == [None] * len(headings)
+    health.refresh()
+    health.update()
+    data = dict(zip(headings, health.get_csv_data()))
+    assert [heading for heading, value in data.items() if value is not None] == \
+        ['nvme0 Media Errors']
+    assert health.get_changes() == {'nvme0 Media Errors': 1}
+    assert health.get_current(['nvme0', 'Percentage Used']) == 3
+    assert health.get_max(['nvme0', 'Media Errors']) == 1
@@ -0,0 +1,83 @@
+"""Tests for the running statistics against brute force
+"""
+
+from random import Random
+from stressmon.stats import Quantiles, RollingWindows
+
+
+def exact(values: list, quantile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(quantile * len(ordered)), len(ordered) - 1)]
+
+
+def test_quantiles_before_markers_fill_are_exact():
+    quantiles = Quantiles(1)
+    assert quantiles.get(0, 0.5) is None
+    samples = [5.0, 1.0, 4.0, 2.0, 3.0]
+    for value in samples:
+        quantiles.update([value])
+    for quantile in (0.0, 0.5, 0.95, 1.0):
+        assert quantiles.get(0, quantile) == exact(samples, quantile)
+
+
+def test_quantiles_track_brute_force():
+    rng = Random(1)
+    quantiles = Quantiles(3)
+    samples = [[], [], []]
+    for _ in range(20000):
+        values = [rng.gauss(60, 5), rng.uniform(0, 100), rng.expovariate(0.1)]
+        quantiles.update(values)
+        for slot, value in enumerate(values):
+            samples[slot].append(value)
+    for slot in range(3):
+        spread = exact(samples[slot], 0.99) - exact(samples[slot], 0.01)
+        for quantile in (0.5, 0.95, 0.99):
+            estimate = quantiles.get(slot, quantile)
+            assert abs(estimate - exact(samples[slot], quantile)) < 0.005 * spread
+        # untracked quantiles are interpolated between markers, so only roughly
+        assert abs(quantiles.get(slot, 0.75) - exact(samples[slot], 0.75)) < 0.05 * spread
+        assert quantiles.get(slot, 0.0) == min(samples[slot])
+        assert quantiles.get(slot, 1.0) == max(samples[slot])
+
+
+def test_quantiles_skip_none_per_slot():
+    quantiles = Quantiles(2, (0.5,))
+    rng = Random(2)
+    samples = []
+    for step in range(1000):
+        value = rng.uniform(0, 10)
+        samples.append(value)
+        quantiles.update([value, None if step % 2 else value])
+    assert quantiles.counts == [1000, 500]
+    assert abs(quantiles.get(0, 0.5) - exact(samples, 0.5)) < 0.3
+
+
+def test_rolling_windows_match_brute_force():
+    rng = Random(3)
+    windows = RollingWindows(2, {'short': 3, 'long': 10})
+    samples = [[], []]
+    for step in range(200):
+        # runs of missing values and repeated values exercise the deques
+        values = [None if rng.random() < 0.2 else float(rng.randint(0, 5)),
+                  None if 50 <= step < 65 else rng.uniform(-1, 1)]
+        windows.update(values)
+        for slot, value in enumerate(values):
+            samples[slot].append(value)
+        for slot in range(2):
+            for name, length in (('short', 3), ('long', 10)):
+                recent = [value for value in samples[slot][-length:] if value is not None]
+                window = windows.get(slot, name)
+                if not recent:
+                    assert window is None
+                    continue
+                assert window['count'] == len(recent)
+                assert window['min'] == min(recent)
+                assert window['max'] == max(recent)
+                assert abs(window['mean'] - sum(recent) / len(recent)) < 1e-9
+
+
+def test_rolling_windows_unknown_name():
+    windows = RollingWindows(1, {'10s': 10})
+    windows.update([1.0])
+    assert windows.get(0, '1m') is None
+    assert windows.get(0, '10s') == {'min': 1.0, 'max': 1.0, 'mean': 1.0, 'count': 1}
@@ -0,0 +1,85 @@
+"""Tests for steady state detection
+"""
+
+from random import Random
+from stressmon import steadystate
+from stressmon.cputemp import CPUTemp
+from stressmon.steadystate import SteadyState
+from stressmon.updatepool import UpdatePool
+
+
+def test_ramp_then_plateau():
+    state = SteadyState(1, window=60, slope=0.1, deviation=0.5)
+    rng = Random(4)
+    # heats up 1 degree a minute for 10 minutes, then holds 70 +- 0.2
+    for second in range(600):
+        state.update([60 + second / 60], second)
+        assert not state.get(0)['steady']
+    for second in range(600, 720):
+        state.update([70 + rng.uniform(-0.2, 0.2)], second)
+    steady = state.get(0)
+    assert steady['steady']
+    assert 600 <= steady['settled'] <= 660
+    assert abs(steady['plateau'] - 70) < 0.2
+    # drifting out clears the settle time and plateau
+    for second in range(720, 780):
+        state.update([70 + (second - 720) / 10], second)
+    assert state.get(0) == {'steady': False, 'settled': None, 'plateau': None}
+
+
+def test_wall_clock_steps_do_not_bend_the_slope(monkeypatch):
+    now = [1000.0]
+    # the wall clock is set back an hour half way through
+    wall = [1700000000.0]
+    monkeypatch.setattr(steadystate, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(steadystate, 'time', lambda: wall[0])
+    state = SteadyState(1, window=20, slope=0.1, deviation=0.5)
+    for second in range(40):
+        if second == 10:
+            wall[0] -= 3600
+        state.update([70.0])
+        now[0] += 1
+        wall[0] += 1
+    steady = state.get(0)
+    assert steady['steady']
+    # settled at the first sample, reported on the wall clock as it is now set
+    assert steady['settled'] == 1700000000.0 - 3600
+
+
+def test_noise_and_missing_values():
+    state = SteadyState(2, window=30, deviation=0.5)
+    rng = Random(5)
+    for second in range(120):
+        state.update([50 + rng.choice([-1, 1]), None if second % 3 else 40.0], second)
+    assert not state.get(0)['steady']
+    assert state.get(1)['steady']
+    assert state.get(1)['plateau'] == 40.0
+
+
+class SoakTemp(CPUTemp):
+    """CPUTemp subclass replaying temperatures instead of reading psutil"""
+
+    def __init__(self, readings: list) -> None:
+        self.temps = {'Package id 0': {'Package id 0': 0.0, 'Core 0': 0.0}}
+        self.readings = readings
+        self.cpu_iter = None
+        self.current_cpu = None
+        self.core_iter = None
+
+    def update(self) -> None:
+        self.temps['Package id 0'] = dict(zip(self.temps['Package id 0'],
+                                              self.readings.pop(0)))
+
+
+def test_pool_detects_subclasses_on_raw_values():
+    sensor = SoakTemp([[60.4, 58.6]] * 10)
+    pool = UpdatePool()
+    pool.add_executor('CPUTemp', sensor.update)
+    pool.enable_steady_state(window=5)
+    assert not pool.is_steady()
+    for _ in range(10):
+        pool.do_updates()
+    states = pool.get_steady_state()['CPUTemp']
+    assert states['Package id 0 Package id 0']['plateau'] == 60.4
+    assert states['Package id 0 Core 0']['plateau'] == 58.6
+    assert pool.is_steady()
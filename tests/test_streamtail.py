@@ -0,0 +1,37 @@
+"""Tests for the non-blocking log and pipe reader
+"""
+
+from os import close, pipe, write
+from stressmon.streamtail import StreamTail
+
+
+def test_log_file_lines(tmp_path):
+    log = tmp_path / 'run.log'
+    tail = StreamTail(str(log))
+    # the file doesn't exist yet
+    assert tail.readlines() == []
+    log.write_bytes(b'first\nsec')
+    assert tail.readlines() == ['first']
+    with open(log, 'ab') as log_file:
+        log_file.write(b'ond\r 10%\r 20%\n')
+    assert tail.readlines() == ['second', ' 10%', ' 20%']
+    assert tail.readlines() == []
+    # truncated and written again
+    log.write_bytes(b'new\n')
+    assert tail.readlines() == ['new']
+    assert not tail.is_closed()
+    tail.close()
+
+
+def test_pipe_lines_and_eof():
+    read_end, write_end = pipe()
+    tail = StreamTail(read_end)
+    assert tail.readlines() == []
+    write(write_end, b'one\ntw')
+    assert tail.readlines() == ['one']
+    write(write_end, b'o')
+    close(write_end)
+    # the partial last line is returned once the writer is gone
+    assert tail.readlines() == ['two']
+    assert tail.is_closed()
+    close(read_end)
@@ -0,0 +1,165 @@
+"""Tests for StressMon against a fake /proc
+"""
+
+from os import getpgid
+from stressmon import stressmon
+from stressmon.procevents import PROC_EVENT_EXEC, PROC_EVENT_EXIT, PROC_EVENT_LOST
+from stressmon.stressmon import StressMon
+
+
+def add_process(proc, pid: int, comm: str, utime: int = 0, starttime: int = 100,
+                state: str = 'R') -> None:
+    directory = proc / str(pid)
+    directory.mkdir(exist_ok=True)
+    (directory / 'comm').write_text(f"{comm}\n")
+    # fields after the comm: state is 3rd, utime 14th, starttime 22nd and rss 24th
+    fields = [state] + ['0'] * 10 + [str(utime), '0'] + ['0'] * 6 + [str(starttime), '0',
+                                                                   '256']
+    (directory / 'stat').write_text(f"{pid} ({comm}) {' '.join(fields)}\n")
+
+
+def remove_process(proc, pid: int) -> None:
+    for name in ('comm', 'stat'):
+        (proc / str(pid) / name).unlink()
+    (proc / str(pid)).rmdir()
+
+
+def make_sensor(tmp_path, monkeypatch) -> tuple:
+    proc = tmp_path / 'proc'
+    proc.mkdir()
+    now = [0]
+    monkeypatch.setattr(stressmon, 'monotonic_ns', lambda: now[0])
+    monkeypatch.setattr(stressmon, 'CLOCK_TICKS', 100)
+    return proc, now
+
+
+def test_scan_tracks_workers(tmp_path, monkeypatch):
+    proc, now = make_sensor(tmp_path, monkeypatch)
+    add_process(proc, 1, 'systemd')
+    add_process(proc, 10, 'stress-ng-cpu', utime=50)
+    sensor = StressMon(['stress-ng'], proc=str(proc))
+    assert sensor.get_workers('stress-ng') == [10]
+    add_process(proc, 11, 'stress-ng-cpu')
+    add_process(proc, 10, 'stress-ng-cpu', utime=100)
+    now[0] = 1000000000
+    sensor.update()
+    assert sensor.get_current(['stress-ng', 'Workers']) == 2
+    assert sensor.get_current(['stress-ng', 'CPU(%)']) == 50
+    # the utility was already running when monitoring started
+    assert sensor.get_markers() == []
+    remove_process(proc, 10)
+    remove_process(proc, 11)
+    now[0] = 2000000000
+    sensor.update()
+    assert sensor.get_workers('stress-ng') == []
+    assert sensor.get_current(['stress-ng', 'Workers']) == 0
+    assert [marker[1:] for marker in sensor.get_markers()] == [('stress-ng', 'exit')]
+
+
+def test_reused_pid_is_a_new_process(tmp_path, monkeypatch):
+    proc, now = make_sensor(tmp_path, monkeypatch)
+    add_process(proc, 10, 'stress-ng-cpu', utime=500)
+    add_process(proc, 11, 'stress-ng-cpu', utime=500)
+    sensor = StressMon(['stress-ng', 'memtester'], proc=str(proc))
+    # both workers exit between ticks and their pids are reused
+    add_process(proc, 10, 'bash', utime=1, starttime=900)
+    add_process(proc, 11, 'memtester', utime=1, starttime=900)
+    now[0] = 1000000000
+    sensor.update()
+    assert sensor.get_workers('stress-ng') == []
+    assert sensor.get_workers('memtester') == [11]
+    assert sensor.get_current(['stress-ng', 'Workers']) == 0
+    assert sensor.get_current(['stress-ng', 'CPU Time(s)']) is None
+    markers = [marker[1:] for marker in sensor.get_markers()]
+    assert sorted(markers) == [('memtester', 'start'), ('stress-ng', 'exit')]
+    add_process(proc, 11, 'memtester', utime=101, starttime=900)
+    now[0] = 2000000000
+    sensor.update()
+    # a worker found between ticks is charged the CPU time it used since then
+    assert sensor.get_current(['memtester', 'CPU(%)']) == 100
+    assert sensor.get_current(['memtester', 'CPU Time(s)']) == 1
+
+
+def test_unreadable_comm_is_retried(tmp_path, monkeypatch):
+    proc, _ = make_sensor(tmp_path, monkeypatch)
+    sensor = StressMon(['stress-ng'], proc=str(proc))
+    add_process(proc, 10, 'stress-ng-cpu')
+    (proc / '10' / 'comm').unlink()
+    sensor.scan()
+    assert sensor.get_workers('stress-ng') == []
+    (proc / '10' / 'comm').write_text('stress-ng-cpu\n')
+    sensor.scan()
+    assert sensor.get_workers('stress-ng') == [10]
+
+
+class FakeConnector:
+    """Proc connector replaying a list of events"""
+
+    def __init__(self, events: list) -> None:
+        self.events = events
+
+    def read(self) -> tuple | None:
+        return self.events.pop(0) if self.events else None
+
+    def close(self) -> None:
+        pass
+
+
+def test_lost_events_rescan(tmp_path, monkeypatch):
+    proc, _ = make_sensor(tmp_path, monkeypatch)
+    add_process(proc, 10, 'stress-ng-cpu')
+    sensor = StressMon(['stress-ng'], proc=str(proc))
+    # the fork of 11 and the exit of 10 were dropped
+    add_process(proc, 11, 'stress-ng-cpu')
+    remove_process(proc, 10)
+    sensor.connector = FakeConnector([(PROC_EVENT_LOST, 0, None, None, None)])
+    sensor.read_event()
+    assert sensor.get_workers('stress-ng') == [11]
+    # a worker tracked from events that exits while events are lost
+    add_process(proc, 12, 'stress-ng-cpu')
+    sensor.connector.events = [(PROC_EVENT_EXEC, 0, 12, 12, None)]
+    sensor.read_event()
+    assert sensor.get_workers('stress-ng') == [11, 12]
+    remove_process(proc, 12)
+    sensor.connector.events = [(PROC_EVENT_LOST, 0, None, None, None)]
+    sensor.read_event()
+    assert sensor.get_workers('stress-ng') == [11]
+
+
+def test_exit_keeps_cpu_time_since_last_update(tmp_path, monkeypatch):
+    proc, now = make_sensor(tmp_path, monkeypatch)
+    add_process(proc, 10, 'stress-ng-cpu', utime=100)
+    add_process(proc, 11, 'stress-ng-cpu', utime=100)
+    sensor = StressMon(['stress-ng'], proc=str(proc))
+    # 10 used another 50 jiffies and exited, its stat is readable until reaped
+    add_process(proc, 10, 'stress-ng-cpu', utime=150, state='Z')
+    sensor.connector = FakeConnector([(PROC_EVENT_EXIT, 0, 10, 10, None)])
+    sensor.read_event()
+    remove_process(proc, 10)
+    add_process(proc, 11, 'stress-ng-cpu', utime=130)
+    now[0] = 1000000000
+    sensor.update()
+    assert sensor.get_current(['stress-ng', 'CPU(%)']) == 80
+    assert sensor.get_current(['stress-ng', 'CPU Time(s)']) == 3
+
+
+def test_unusable_cgroup_is_skipped(tmp_path, monkeypatch):
+    proc, _ = make_sensor(tmp_path, monkeypatch)
+    (tmp_path / 'file').write_text('')
+    sensor = StressMon(['stress-ng'], proc=str(proc),
+                       cgroups={'stress-ng': str(tmp_path / 'file' / 'stress')})
+    assert sensor.get_cgroup('stress-ng') is None
+    assert all(len(label) == 2 for label in sensor.labels)
+
+
+def test_launch_moves_process_into_cgroup(tmp_path):
+    group = tmp_path / 'stress'
+    group.mkdir()
+    (group / 'cgroup.procs').write_text('')
+    sensor = StressMon(['sleep'], cgroups={'sleep': str(group)})
+    process = sensor.launch('sleep', ['sleep', '0.2'])
+    try:
+        assert getpgid(process.pid) == process.pid
+        assert (group / 'cgroup.procs').read_text() == str(process.pid)
+    finally:
+        process.wait()
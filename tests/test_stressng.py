@@ -0,0 +1,92 @@
+"""Tests for the stress-ng metrics parser and throughput sensor
+"""
+
+from stressmon.stressng import StressNG, StressNGParser
+
+METRICS = """\
+stress-ng: info:  [1234] dispatching hogs: 2 cpu, 1 vm
+stress-ng: metrc: [1234] stressor       bogo ops real time  usr time  sys time   bogo ops/s     bogo ops/s
+stress-ng: metrc: [1234]                           (secs)    (secs)    (secs)   (real time) (usr+sys time)
+stress-ng: metrc: [1234] cpu               40000     10.00     19.90      0.10      4000.00        2000.00
+stress-ng: metrc: [1234] vm                 5000     10.00      5.00      5.00       500.00         500.00
+"""
+
+YAML = """\
+metrics:
+    - stressor: cpu
+      bogo-ops: 40000
+      bogo-ops-per-second-usr-sys-time: 2000.000000
+      bogo-ops-per-second-real-time: 4000.000000
+      wall-clock-time: 10.000000
+      user-time: 19.900000
+      system-time: 0.100000
+    - stressor: vm
+      bogo-ops: 5000
+      bogo-ops-per-second-real-time: 500.000000
+times:
+"""
+
+
+def test_parse_metrics_lines():
+    parser = StressNGParser()
+    records = [parser.feed(line) for line in METRICS.splitlines()]
+    records = [record for record in records if record is not None]
+    assert records == [
+        {'stressor': 'cpu', 'bogo ops': 40000, 'real time': 10, 'usr time': 19.9,
+         'sys time': 0.1, 'bogo ops/s': 4000, 'bogo ops/s(usr+sys)': 2000},
+        {'stressor': 'vm', 'bogo ops': 5000, 'real time': 10, 'usr time': 5,
+         'sys time': 5, 'bogo ops/s': 500, 'bogo ops/s(usr+sys)': 500}]
+    assert parser.flush() is None
+
+
+def test_parse_yaml():
+    parser = StressNGParser()
+    records = [parser.feed(line) for line in YAML.splitlines()]
+    records = [record for record in records if record is not None]
+    assert records == [
+        {'stressor': 'cpu', 'bogo ops': 40000, 'bogo ops/s(usr+sys)': 2000,
+         'bogo ops/s': 4000, 'real time': 10, 'usr time': 19.9, 'sys time': 0.1},
+        {'stressor': 'vm', 'bogo ops': 5000, 'bogo ops/s': 500}]
+
+
+def test_batches_line_up_with_cpu_ticks(tmp_path, fake_sensor):
+    log = tmp_path / 'stress-ng.log'
+    log.write_text('')
+    watts = fake_sensor({'package-0': 0, 'package-1': 0})
+    temps = fake_sensor({'Core 0': 0, 'Core 1': 0})
+    sensor = StressNG(str(log), ['cpu', 'vm'], watts, temps, idle_temp=40)
+    watts.tick([60, 50])
+    temps.tick([60, 70])
+    sensor.update()
+    assert sensor.get_current(['All', 'Bogo Ops/s']) is None
+    watts.tick([80, 50])
+    temps.tick([60, 90])
+    log.write_text(METRICS)
+    sensor.update()
+    # 4500 ops/s at a mean of 120 W and the hottest core 40 C above idle
+    assert sensor.get_csv_data()[:4] == [4500, 2500, 37.5, 112.5]
+    assert sensor.get_current(['vm', 'Bogo Ops/s']) == 500
+    # only the cpu stressor reports in the next batch, one tick later
+    with open(log, 'a', encoding='UTF-8') as log_file:
+        log_file.write(METRICS.splitlines(keepends=True)[3])
+    sensor.update()
+    assert sensor.get_csv_data()[:8] == [4000, 2000, 30.7692, 80, 4000, 2000, 30.7692, 80]
+    assert sensor.get_current(['vm', 'Bogo Ops/s']) is None
+    assert sensor.get_mean(['vm', 'Bogo Ops/s']) == 500
+    # a temperature less than a degree above idle gives no per degree figure
+    temps.tick([40.5, 40.5])
+    with open(log, 'a', encoding='UTF-8') as log_file:
+        log_file.write(METRICS.splitlines(keepends=True)[3])
+    sensor.update()
+    assert sensor.get_current(['All', 'Bogo Ops/s/C']) is None
+    # the CPU sensors' own stats have no epochs from the batches
+    assert watts.get_stats().get_epochs() == []
+    assert temps.get_stats().get_epochs() == []
+
+
+def test_batch_without_cpu_sensors(tmp_path):
+    log = tmp_path / 'stress-ng.log'
+    log.write_text(METRICS)
+    sensor = StressNG(str(log), idle_temp=40)
+    sensor.update()
+    assert sensor.get_csv_data()[:4] == [4500, 2500, None, None]
@@ -0,0 +1,27 @@
+"""Tests for the update pool and periodic updater
+"""
+
+from threading import Event
+from stressmon.updatepool import PeriodicUpdater
+
+
+def test_periodic_updater_survives_exceptions():
+    calls = []
+    done = Event()
+
+    def update():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("transient sysfs error")
+        done.set()
+
+    updater = PeriodicUpdater(update, 0.01, immediate=True)
+    updater.start()
+    assert done.wait(2)
+    updater.stop()
+    assert len(calls) >= 2
+
+
+def test_periodic_updater_call_reports_live_owner():
+    updater = PeriodicUpdater(lambda: 1 / 0, 1.0)
+    assert updater.call()
@@ -2,14 +2,48 @@
 """
 
 from concurrent.futures import ThreadPoolExecutor, wait
+from inspect import ismethod
+from logging import getLogger
+from threading import Thread, Event, current_thread
+from weakref import WeakMethod
+from stressmon.hwsensors import HWSensorBase
+
+logger = getLogger(__name__)
+
+
+def update_sensor(update_fn, sensor: HWSensorBase | None, *args, **kwargs) -> None:
+    """Update a sensor and record the new values in its stats
+    """
+    update_fn(*args, **kwargs)
+    if sensor is not None:
+        sensor.record()
+
+
+def thermal_sensors() -> tuple:
+    """Get the sensor classes with soak temperature series
+
+    Returns:
+        tuple: (sensor class, data name of the temperature series) pairs, the data
+            name None when every series is a temperature
+    """
+    # these sensor modules import this one
+    from stressmon.cputemp import CPUTemp
+    from stressmon.drivetemp import DriveTemp
+    from stressmon.gpudata import GPUData
+    return (CPUTemp, None), (GPUData, 'temp'), (DriveTemp, None)
 
 
 class UpdatePool:
     """UpdatePool class to asyncronously execute sensor updates
+
+    Sensors whose update functions are registered are also recorded after each
+    update, and stats epochs opened on the pool are opened on every sensor, so
+    phases such as "idle" or "gpu-burn" can be summarised without rebuilding them.
     """
 
     def __init__(self) -> None:
         self.update_pool = {}
+        self.sensors = {}
         self.executor = None
 
     def __del__(self) -> None:
@@ -20,12 +54,154 @@ class UpdatePool:
         """Add sensor.update function to update pool
         """
         self.update_pool[classname] = update_fn
+        sensor = getattr(update_fn, '__self__', None)
+        if isinstance(sensor, HWSensorBase):
+            # create shadow stats here rather than from an update thread
+            sensor.get_stats()
+            self.sensors[classname] = sensor
 
     def do_updates(self, *args, **kwargs) -> None:
         """Perform updates asynchronously"""
         futures = []
         if self.executor is None:
             self.executor = ThreadPoolExecutor(max_workers=len(self.update_pool.keys()))
-        for _, func in self.update_pool.items():
-            futures.append(self.executor.submit(func, *args, **kwargs))
+        for classname, func in self.update_pool.items():
+            futures.append(self.executor.submit(update_sensor, func,
+                                                self.sensors.get(classname), *args, **kwargs))
         wait(futures)
+
+    def enable_windows(self, windows: dict | None = None) -> None:
+        """Keep rolling window statistics for every sensor, see Stats.enable_windows()
+        """
+        for sensor in self.sensors.values():
+            sensor.enable_windows(windows)
+
+    def enable_history(self, **kwargs) -> None:
+        """Keep a bounded history for every sensor, see Stats.enable_history()
+        """
+        for sensor in self.sensors.values():
+            sensor.enable_history(**kwargs)
+
+    def _thermal_sensors(self) -> dict:
+        thermal = {}
+        for classname, sensor in self.sensors.items():
+            for sensor_class, data in thermal_sensors():
+                if isinstance(sensor, sensor_class):
+                    thermal[classname] = (sensor, data)
+                    break
+        return thermal
+
+    def enable_steady_state(self, **kwargs) -> None:
+        """Detect steady state of the CPU, GPU and drive temperature sensors
+
+        Args:
+            **kwargs: SteadyState options
+        """
+        for sensor, _ in self._thermal_sensors().values():
+            sensor.enable_steady_state(**kwargs)
+
+    def get_steady_state(self) -> dict:
+        """Get the steady state of every temperature series
+
+        Returns:
+            dict: steady flag, settle timestamp and plateau value keyed by classname,
+                then by the sensor's params joined with spaces
+        """
+        states = {}
+        for classname, (sensor, data) in self._thermal_sensors().items():
+            states[classname] = {}
+            for params in sensor:
+                params = list(params)
+                if data is not None and params[-1] != data:
+                    continue
+                state = sensor.get_steady_state(params)
+                if state is not None and sensor.get_current(params) is not None:
+                    states[classname][" ".join(str(param) for param in params)] = state
+        return states
+
+    def is_steady(self) -> bool:
+        """Have all temperatures settled, so a thermal soak can end early?
+        """
+        states = [state for series in self.get_steady_state().values()
+                  for state in series.values()]
+        return bool(states) and all(state['steady'] for state in states)
+
+    def open_epoch(self, name: str) -> None:
+        """Open a named stats epoch on every sensor, e.g. at a stress phase marker
+        """
+        for sensor in self.sensors.values():
+            sensor.open_epoch(name)
+
+    def close_epoch(self, name: str) -> None:
+        """Close a named stats epoch on every sensor
+        """
+        for sensor in self.sensors.values():
+            sensor.close_epoch(name)
+
+    def summary(self, name: str) -> dict:
+        """Summarise an epoch
+
+        Args:
+            name (str): epoch name
+
+        Returns:
+            dict: min, max, mean and count dicts keyed by classname, then by the
+                sensor's params joined with spaces
+        """
+        summary = {}
+        for classname, sensor in self.sensors.items():
+            summary[classname] = {}
+            for params in sensor:
+                params = list(params)
+                epoch = sensor.get_epoch_summary(params, name)
+                if epoch is not None:
+                    summary[classname][" ".join(str(param) for param in params)] = epoch
+        return summary
+
+
+class PeriodicUpdater(Thread):
+    """Daemon thread that calls an update function on its own schedule
+
+    Bound methods are only weakly referenced, so the thread never keeps its sensor
+    alive and exits once the sensor is garbage collected. An exception raised by
+    the update function is logged and the next call is made on schedule.
+    """
+
+    def __init__(self, update_fn, interval: float, immediate: bool = False) -> None:
+        super().__init__(daemon=True)
+        if ismethod(update_fn):
+            self.update_ref = WeakMethod(update_fn)
+        else:
+            self.update_ref = lambda: update_fn
+        self.interval = interval
+        self.immediate = immediate
+        self.stopped = Event()
+
+    def run(self) -> None:
+        if self.immediate and not self.call():
+            return
+        while not self.stopped.wait(self.interval):
+            if not self.call():
+                return
+
+    def call(self) -> bool:
+        """Call the update function once
+
+        Returns:
+            bool: False if the update function's owner no longer exists
+        """
+        update_fn = self.update_ref()
+        if update_fn is None:
+            return False
+        try:
+            update_fn()
+        except Exception:
+            logger.exception("periodic update %r failed", update_fn)
+        return True
+
+    def stop(self) -> None:
+        """Stop calling the update function and wait for the thread to exit
+        """
+        self.stopped.set()
+        if self.is_alive() and current_thread() is not self:
+            self.join()